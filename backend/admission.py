@@ -0,0 +1,323 @@
+# backend/admission.py
+"""Admission control: token-bucket rate limits and queue-latency shedding.
+
+Every request is charged against one bucket keyed by route class and
+caller: the JWT identity when the request carries a valid token, the
+client IP otherwise.  Behind a reverse proxy, set ``PROXY_HOPS`` so
+``ProxyFix`` takes the client IP from ``X-Forwarded-For``; without it,
+every client would share the proxy's address.  A class is a group of endpoints with a shared limit,
+such as login/register (password hashing) or the AI routes (CPU-heavy
+scoring).  An empty bucket gets ``429`` with ``Retry-After``.
+
+Buckets live in process memory by default.  Set ``RATE_LIMIT_REDIS_URL``
+to share them between workers through a local Redis; the ``redis``
+package is optional.  If Redis cannot be reached, the memory buckets are
+used instead.
+
+Shedding: the time requests wait before this layer sees them is tracked
+as a moving average.  By default it is measured in-process, from the WSGI
+server handing the request to the app until the admission check runs,
+which grows when worker threads queue for the CPU.  With
+``TRUST_QUEUE_HEADER=1`` the timestamp a front proxy stamps in
+``X-Request-Start`` (nginx ``t=$msec``) is used instead, which also covers
+time in the listen backlog.  Only enable it when the proxy overwrites any
+client-sent header.  Header values that are negative, in the future or
+more than ``MAX_HEADER_DELAY`` seconds old are ignored, so a forged header
+cannot trigger shedding on its own.  Above ``QUEUE_TARGET_MS``,
+low-priority classes get ``503`` with ``Retry-After`` before doing any
+work.  Above twice the target, normal-priority classes are shed as well.
+Login and the admin routes are never shed.
+
+Configuration comes from the environment:
+    
+    ADMISSION_CONTROL     0 disables the layer (default 1)
+    RATE_LIMITS           overrides, e.g. "auth=10/60,ai=30/60,default=600/60"
+                          (requests / seconds; the count is also the burst)
+    RATE_LIMIT_REDIS_URL  redis://localhost:6379/0 to share buckets
+    QUEUE_TARGET_MS       queue latency target for shedding (default 200)
+    TRUST_QUEUE_HEADER    1 to read queue time from X-Request-Start (default 0)
+    PROXY_HOPS            reverse proxies in front of the app (default 0)
+"""
+import math
+import os
+import threading
+import time
+from collections import Counter
+
+from flask import jsonify, request
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Endpoints grouped into limit classes; anything unlisted is 'default'
+ROUTE_CLASSES = {
+    'auth': {'login', 'register'},
+    'ai': {'analyze_resume', 'get_job_recommendations', 'get_semantic_recommendations'},
+    'bulk': {'export_placement_report', 'refresh_placement_cubes', 'auto_assign_interviews',
+             'create_interview_slots'},
+    'admin': {'get_ml_metrics', 'get_engagement_metrics', 'get_db_routing', 'get_admission_metrics',
+              'get_profiler', 'update_profiler', 'get_profiler_flamegraph'},
+}
+
+# class -> (requests, per seconds)
+DEFAULT_LIMITS = {
+    'auth': (10, 60),
+    'ai': (20, 60),
+    'bulk': (10, 60),
+    'admin': (120, 60),
+    'default': (300, 60),
+}
+
+# Shed first when workers fall behind; None = never shed
+SHED_PRIORITY = {'ai': 'low', 'bulk': 'low', 'default': 'normal', 'auth': None, 'admin': None}
+
+QUEUE_TARGET_MS = float(os.environ.get('QUEUE_TARGET_MS', 200))
+QUEUE_EWMA_ALPHA = 0.2
+# Proxy timestamps claiming a longer wait than this are ignored
+MAX_HEADER_DELAY = 5.0
+# WSGI environ key holding the time the app received the request
+RECEIVED_KEY = 'admission.received'
+
+_endpoint_classes = {endpoint: name for name, endpoints in ROUTE_CLASSES.items() for endpoint in endpoints}
+
+
+def parse_limits(spec):
+    """'auth=10/60,ai=30/60' -> {'auth': (10, 60.0), 'ai': (30, 60.0)}"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, rule = item.partition('=')
+        count, _, seconds = rule.partition('/')
+        limits[name.strip()] = (int(count), float(seconds or 1))
+    return limits
+
+
+class MemoryBuckets:
+    """Token buckets in this process."""
+    
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+    
+    def take(self, key, capacity, rate, cost=1):
+        """Spend ``cost`` tokens; returns (allowed, seconds until allowed)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (cost - tokens) / rate
+            if len(self._buckets) > self.max_keys:
+                self._evict(now)
+        return allowed, retry_after
+    
+    def _evict(self, now):
+        # Buckets idle for an hour have refilled under every configured
+        # limit; recreating one later starts it full, which is the same state
+        for key, (tokens, updated_at) in list(self._buckets.items()):
+            if now - updated_at > 3600:
+                del self._buckets[key]
+
+
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker through Redis (one Lua call each)."""
+    
+    def __init__(self, url, fallback):
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+        self._fallback = fallback
+        self._errors_lock = threading.Lock()
+        self.errors = 0
+    
+    def take(self, key, capacity, rate, cost=1):
+        try:
+            allowed, retry_after = self._script(keys=[f'ratelimit:{key}'], args=[capacity, rate, cost])
+        except Exception:
+            with self._errors_lock:
+                self.errors += 1
+            return self._fallback.take(key, capacity, rate, cost)
+        return bool(allowed), float(retry_after)
+
+
+class AdmissionController:
+    def __init__(self, limits=None, backend=None, queue_target_ms=QUEUE_TARGET_MS,
+                 trust_queue_header=False):
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.backend = backend or MemoryBuckets()
+        self.queue_target = queue_target_ms / 1000
+        self.trust_queue_header = trust_queue_header
+        self.queue_delay = 0.0
+        self._lock = threading.Lock()
+        self._admitted = Counter()
+        self._rejected = Counter()
+        self._shed = Counter()
+        self._ignored_headers = 0
+    
+    @classmethod
+    def from_env(cls):
+        limits = parse_limits(os.environ.get('RATE_LIMITS', ''))
+        backend = MemoryBuckets()
+        if os.environ.get('RATE_LIMIT_REDIS_URL') and redis is not None:
+            backend = RedisBuckets(os.environ['RATE_LIMIT_REDIS_URL'], backend)
+        return cls(limits, backend, trust_queue_header=os.environ.get('TRUST_QUEUE_HEADER') == '1')
+    
+    def route_class(self, endpoint):
+        return _endpoint_classes.get(endpoint, 'default')
+    
+    def observe_queue_delay(self, delay):
+        with self._lock:
+            self.queue_delay += QUEUE_EWMA_ALPHA * (delay - self.queue_delay)
+    
+    def queue_delay_of(self, received, header, now=None):
+        """Seconds this request queued: from ``header`` (the raw proxy
+        timestamp) when trusted and plausible, else since ``received``."""
+        if self.trust_queue_header and header:
+            delay = header_queue_delay(header, time.time() if now is None else now)
+            if delay is not None:
+                return delay
+            with self._lock:
+                self._ignored_headers += 1
+        if received is None:
+            return None
+        return max(0.0, time.monotonic() - received)
+    
+    def should_shed(self, route_class):
+        priority = SHED_PRIORITY.get(route_class, 'normal')
+        if priority is None or self.queue_delay <= self.queue_target:
+            return False
+        return priority == 'low' or self.queue_delay > 2 * self.queue_target
+    
+    def admit(self, route_class, caller):
+        """(allowed, retry_after seconds) for one request of ``caller``."""
+        count, seconds = self.limits.get(route_class, self.limits['default'])
+        allowed, retry_after = self.backend.take(f'{route_class}:{caller}', count, count / seconds)
+        with self._lock:
+            (self._admitted if allowed else self._rejected)[route_class] += 1
+        return allowed, retry_after
+    
+    def record_shed(self, route_class):
+        with self._lock:
+            self._shed[route_class] += 1
+    
+    def metrics(self):
+        with self._lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'backend_errors': getattr(self.backend, 'errors', 0),
+                'queue_delay_ms': round(self.queue_delay * 1000, 1),
+                'queue_target_ms': self.queue_target * 1000,
+                'queue_source': 'header' if self.trust_queue_header else 'in-process',
+                'ignored_queue_headers': self._ignored_headers,
+                'limits': {name: {'requests': count, 'seconds': seconds}
+                           for name, (count, seconds) in self.limits.items()},
+                'admitted': dict(self._admitted),
+                'rejected': dict(self._rejected),
+                'shed': dict(self._shed),
+            }
+
+
+def header_queue_delay(header, now):
+    """Queue time claimed by an X-Request-Start value, or None if implausible."""
+    try:
+        value = float(header.strip().removeprefix('t='))
+    except ValueError:
+        return None
+    if value <= 0:
+        return None
+    # nginx sends seconds.millis; other proxies send ms or us
+    if value > 1e14:
+        value /= 1e6
+    elif value > 1e11:
+        value /= 1e3
+    delay = now - value
+    if delay < 0 or delay > MAX_HEADER_DELAY:
+        return None
+    return delay
+
+
+def _caller():
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        identity = None
+    if identity is not None:
+        return f'user:{identity}'
+    return f'ip:{request.remote_addr}'
+
+
+def _too_busy(message, retry_after, status):
+    response = jsonify({'error': message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def init_app(app, controller, proxy_hops=None):
+    """Install ProxyFix (``PROXY_HOPS``) and the admission check on ``app``."""
+    if proxy_hops is None:
+        proxy_hops = int(os.environ.get('PROXY_HOPS', 0))
+    if proxy_hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops)
+    if os.environ.get('ADMISSION_CONTROL', '1') == '0':
+        return
+    
+    inner = app.wsgi_app
+    
+    def stamp_received(environ, start_response):
+        environ[RECEIVED_KEY] = time.monotonic()
+        return inner(environ, start_response)
+    
+    app.wsgi_app = stamp_received
+    
+    @app.before_request
+    def admission_check():
+        if request.method == 'OPTIONS' or request.endpoint is None:
+            return None
+        
+        header = request.headers.get('X-Request-Start') or request.headers.get('X-Queue-Start')
+        delay = controller.queue_delay_of(request.environ.get(RECEIVED_KEY), header)
+        if delay is not None:
+            controller.observe_queue_delay(delay)
+        
+        route_class = controller.route_class(request.endpoint)
+        if controller.should_shed(route_class):
+            controller.record_shed(route_class)
+            return _too_busy('Server is busy, please retry shortly', 1, 503)
+        
+        allowed, retry_after = controller.admit(route_class, _caller())
+        if not allowed:
+            return _too_busy('Too many requests', retry_after, 429)
+        return None
@@ -0,0 +1,136 @@
+# backend/ai.py
+"""Resume scoring and job recommendation logic used by the AI routes.
+
+scikit-learn and NumPy are heavy to import (seconds of CPU and tens of MB of
+RSS), so they are only loaded the first time a score is actually computed.
+Workers that only ever serve auth and listing routes never import them.
+"""
+import re
+import threading
+
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+_ml = None
+_ml_lock = threading.Lock()
+
+
+def _load_ml():
+    """Import the scikit-learn pieces on first use and cache them."""
+    global _ml
+    if _ml is None:
+        with _ml_lock:
+            if _ml is None:
+                import numpy as np
+                from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+                from sklearn.metrics.pairwise import cosine_similarity
+                _ml = (TfidfVectorizer, cosine_similarity, CountVectorizer, np)
+    return _ml
+
+
+def is_loaded():
+    return _ml is not None
+
+
+def warm_up():
+    """Import scikit-learn and run one tiny fit so the first request is fast."""
+    ats_scores([('python flask postgres', 'python developer')])
+
+
+def ats_score(resume_text, job_description):
+    """TF-IDF cosine similarity of a resume against a job description, 0-100."""
+    TfidfVectorizer, cosine_similarity = _load_ml()[:2]
+    vectorizer = TfidfVectorizer()
+    vectors = vectorizer.fit_transform([resume_text, job_description])
+    similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
+    return round(float(similarity) * 100, 2)
+
+
+def ats_scores(pairs):
+    """Score many (resume, job description) pairs in one sparse matrix pass.
+    
+    Gives the same result as calling ``ats_score`` on each pair: with a
+    two-document corpus the smoothed IDF of a term is 1 when both documents
+    contain it and ``1 + ln(1.5)`` when only one does, so the per-pair TF-IDF
+    cosine can be computed from raw counts of the whole batch at once.
+    """
+    CountVectorizer, np = _load_ml()[2:]
+    counts = CountVectorizer().fit_transform(
+        [doc for pair in pairs for doc in pair]
+    ).tocsr().astype(np.float64)
+    resumes = counts[0::2]
+    jds = counts[1::2]
+    resume_present = (resumes > 0).astype(np.float64)
+    jd_present = (jds > 0).astype(np.float64)
+    
+    single_idf_sq = (1 + np.log(1.5)) ** 2
+    dot = np.asarray(resumes.multiply(jds).sum(axis=1)).ravel()
+    
+    resume_sq = np.asarray(resumes.multiply(resumes).sum(axis=1)).ravel()
+    resume_shared_sq = np.asarray(resumes.multiply(resumes).multiply(jd_present).sum(axis=1)).ravel()
+    jd_sq = np.asarray(jds.multiply(jds).sum(axis=1)).ravel()
+    jd_shared_sq = np.asarray(jds.multiply(jds).multiply(resume_present).sum(axis=1)).ravel()
+    
+    norms = np.sqrt(
+        (resume_shared_sq + single_idf_sq * (resume_sq - resume_shared_sq))
+        * (jd_shared_sq + single_idf_sq * (jd_sq - jd_shared_sq))
+    )
+    similarity = np.divide(dot, norms, out=np.zeros_like(dot), where=norms > 0)
+    return [round(float(s) * 100, 2) for s in similarity]
+
+
+def analyze_resume_text(resume_text, job_description, score=None):
+    """Build the resume analysis payload; ``score`` skips the TF-IDF step."""
+    if score is None:
+        score = ats_score(resume_text, job_description)
+    
+    # Extract keywords from job description
+    jd_words = set(_WORD_RE.findall(job_description.lower()))
+    resume_words = set(_WORD_RE.findall(resume_text.lower()))
+    
+    matched_skills = list(jd_words.intersection(resume_words))
+    missing_skills = list(jd_words.difference(resume_words))
+    
+    suggestions = []
+    if score < 70:
+        suggestions.append("Include more keywords from the job description")
+    if len(missing_skills) > 10:
+        suggestions.append(f"Add missing skills: {', '.join(missing_skills[:5])}")
+    if len(resume_text) < 500:
+        suggestions.append("Expand your resume with more details about your experience")
+    
+    return {
+        'ats_score': score,
+        'matched_skills': matched_skills[:20],
+        'missing_skills': missing_skills[:20],
+        'suggestions': suggestions,
+        'keyword_match_percentage': score
+    }
+
+
+def skill_match_scores(skills, job_skills):
+    """Count how many of the student's skills appear in each job's skill text."""
+    scores = []
+    for required in job_skills:
+        required = required.lower() if required else ''
+        scores.append(sum(1 for skill in skills if skill in required))
+    return scores
+
+
+def recommend_jobs(skills, jobs, limit=10, scores=None):
+    """Rank job rows by skill overlap, dropping jobs with no match at all.
+    
+    Adds ``match_score`` to the matching rows in place. ``scores`` may carry
+    precomputed ``skill_match_scores`` for ``jobs``.
+    """
+    if scores is None:
+        scores = skill_match_scores(skills, [job['required_skills'] for job in jobs])
+    
+    recommendations = []
+    for job, match_count in zip(jobs, scores):
+        if match_count > 0:
+            job['match_score'] = match_count
+            recommendations.append(job)
+    
+    # Sort by match score
+    recommendations.sort(key=lambda x: x['match_score'], reverse=True)
+    return recommendations[:limit]
@@ -1,19 +1,40 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg2.errors
+from psycopg2.extras import DateTimeTZRange, execute_values
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 import os
 from functools import wraps
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import admission
+import ai
+import compression
+import dedupe
+import embeddings
+import job_expiry
+import profiling
+import reports
+import scheduling
+from cache import TTLCache
+from json_provider import FastJSONProvider
+from db import (DB_CONFIG, POOL_MAX, get_db_connection, release_request_connections, request_prefers_replica,
+                routing_stats)
+from engagement import EngagementBuffer
+from ml_pool import MLService, MLTimeout, MLUnavailable
+from partitions import retention_cutoff
 
 app = Flask(__name__)
 CORS(app)
+compression.init_app(app)
+# Handlers pass RealDictCursor rows straight to jsonify; the provider
+# encodes them (and their datetime/Decimal values) without copying
+app.json = FastJSONProvider(app)
 
 # Configuration
 app.config['JWT_SECRET_KEY'] = 'your-secret-key-change-in-production'
@@ -21,17 +42,37 @@ app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=1)
 
 jwt = JWTManager(app)
 
-# Database configuration
-DB_CONFIG = {
-    'host': 'localhost',
-    'database': 'placemate',
-    'user': 'postgres',
-    'password': 'Ichigo_bankai24'
-}
+# scikit-learn is imported lazily by the AI module; set AI_PREWARM=1 to load it
+# in the background at startup instead of on the first AI request.
+if os.environ.get('AI_PREWARM') == '1':
+    threading.Thread(target=ai.warm_up, daemon=True).start()
+
+# CPU-heavy AI scoring runs in a separate process pool, started on first use
+ml_service = MLService.from_env()
+
+# Job views/saves/applies are buffered in memory and written in bulk by a
+# background thread, so recording them adds no query to the request
+engagement = EngagementBuffer.from_env(lambda: get_db_connection(readonly=False))
+
+# LSA model + ANN index over active job vectors, trained offline with
+# embeddings.py.  A background thread loads it on first use, embeds newly
+# posted jobs on the primary and rebuilds the index off the request path.
+semantic = embeddings.SemanticIndex(lambda: get_db_connection(readonly=True),
+                                    connect_primary=lambda: get_db_connection(readonly=False))
+
+# Pooled connections are routed between primary and replica in db.py; this
+# returns any connection a handler did not close back to its pool.
+app.teardown_appcontext(release_request_connections)
+
+# Token-bucket rate limits per caller and route class, plus early 503s for
+# low-priority routes when requests start queueing up.  PROXY_HOPS makes
+# the client IP come from X-Forwarded-For behind a reverse proxy.
+admission_control = admission.AdmissionController.from_env()
+admission.init_app(app, admission_control)
 
-def get_db_connection():
-    conn = psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
-    return conn
+# Sampling profiler, off until an admin enables it at /api/admin/profiler
+profiler = profiling.Profiler.from_env()
+profiling.init_app(app, profiler)
 
 # Role-based access decorator
 def role_required(roles):
@@ -40,7 +81,9 @@ def role_required(roles):
         @jwt_required()
         def wrapper(*args, **kwargs):
             current_user_id = get_jwt_identity()
-            conn = get_db_connection()
+            # Always the primary: a freshly registered user may not have
+            # reached the replica yet
+            conn = get_db_connection(readonly=False)
             cur = conn.cursor()
             cur.execute("SELECT user_type FROM users WHERE id = %s", (current_user_id,))
             user = cur.fetchone()
@@ -53,6 +96,164 @@ def role_required(roles):
         return wrapper
     return decorator
 
+# Application statuses that count a student as placed
+PLACED_STATUSES = ('offered', 'accepted')
+
+def record_application_event(cur, application_id, from_status, to_status, actor_user_id):
+    """Append a status transition to the event log and keep student_placements
+    in step with it. Must run in the same transaction as the status change."""
+    cur.execute("""
+        INSERT INTO application_events
+        (application_id, student_id, job_id, from_status, to_status, actor_user_id)
+        SELECT id, student_id, job_id, %s, %s, %s FROM applications WHERE id = %s
+        RETURNING student_id, created_at
+    """, (from_status, to_status, actor_user_id, application_id))
+    event = cur.fetchone()
+    
+    was_placed = from_status in PLACED_STATUSES
+    is_placed = to_status in PLACED_STATUSES
+    
+    if is_placed and not was_placed:
+        cur.execute("""
+            INSERT INTO student_placements (student_id, placed_at, offer_count)
+            VALUES (%s, %s, 1)
+            ON CONFLICT (student_id) DO UPDATE
+            SET offer_count = student_placements.offer_count + 1
+        """, (event['student_id'], event['created_at']))
+    elif was_placed and not is_placed:
+        cur.execute("""
+            UPDATE student_placements SET offer_count = offer_count - 1
+            WHERE student_id = %s
+        """, (event['student_id'],))
+        cur.execute("DELETE FROM student_placements WHERE student_id = %s AND offer_count <= 0",
+                    (event['student_id'],))
+
+# Job columns a list view may ask for through ?fields=, as SQL expressions
+JOB_FIELDS = {
+    'id': 'j.id',
+    'company_id': 'j.company_id',
+    'job_title': 'j.job_title',
+    'job_type': 'j.job_type',
+    'location': 'j.location',
+    'is_remote': 'j.is_remote',
+    'salary_min': 'j.salary_min',
+    'salary_max': 'j.salary_max',
+    'currency': 'j.currency',
+    'experience_required': 'j.experience_required',
+    'required_skills': 'j.required_skills',
+    'preferred_skills': 'j.preferred_skills',
+    'job_description': 'j.job_description',
+    'qualifications': 'j.qualifications',
+    'responsibilities': 'j.responsibilities',
+    'benefits': 'j.benefits',
+    'application_deadline': 'j.application_deadline',
+    'vacancies': 'j.vacancies',
+    'status': 'j.status',
+    'created_at': 'j.created_at',
+    'company_name': 'c.company_name',
+    'company_logo': 'c.company_logo',
+}
+
+# Default projection for job cards: no long text columns, only a short
+# description excerpt for the preview line
+JOB_LIST_FIELDS = ('id', 'job_title', 'job_type', 'location', 'is_remote', 'salary_min',
+                   'salary_max', 'currency', 'required_skills', 'application_deadline',
+                   'created_at', 'company_name', 'company_logo')
+JOB_EXCERPT_SQL = 'LEFT(j.job_description, 200) as job_description'
+
+def job_list_columns(required=()):
+    """SELECT list for a job listing, honoring a ?fields=a,b,c sparse fieldset.
+    
+    Returns (sql, error); ``required`` columns are always selected because
+    the handler itself needs them.
+    """
+    requested = request.args.get('fields', '')
+    if not requested:
+        names = [n for n in JOB_LIST_FIELDS if n not in required] + list(required)
+        return ', '.join([JOB_FIELDS[n] for n in names] + [JOB_EXCERPT_SQL]), None
+    
+    names = [n.strip() for n in requested.split(',') if n.strip()]
+    unknown = [n for n in names if n not in JOB_FIELDS]
+    if unknown:
+        return None, f"Unknown fields: {', '.join(unknown)}"
+    names += [n for n in required if n not in names]
+    return ', '.join(JOB_FIELDS[n] for n in dict.fromkeys(names)), None
+
+# Per-caller annotations on job rows: whether the student already applied
+# (and the application's status) or saved the job.  Resolved in the listing
+# query itself; the applications lookup hits the unique (job_id, student_id)
+# index.  Callers who are not students simply get false / null.
+STUDENT_JOB_COLUMNS = """my_app.id IS NOT NULL as is_applied,
+        my_app.status as application_status,
+        EXISTS (SELECT 1 FROM saved_jobs sj WHERE sj.job_id = j.id AND sj.student_id = me.id) as is_saved"""
+STUDENT_JOB_JOINS = """LEFT JOIN (SELECT id FROM students WHERE user_id = %s) me ON TRUE
+        LEFT JOIN applications my_app ON my_app.job_id = j.id AND my_app.student_id = me.id"""
+
+# Facet counts for the unfiltered active-job set, keyed by the 'jobs' cache
+# version (migration 011).  Every job write that changes a listed column
+# bumps it, whichever process made the write, so every worker stops serving
+# the old entry at once.
+facet_cache = TTLCache(ttl=int(os.environ.get('FACET_CACHE_TTL', 300)))
+job_expiry.register_hook(semantic.discard)
+
+# Set JOB_EXPIRY_LISTEN=1 in deployments so jobs closed by other processes
+# (job_expiry.py --daemon, other workers) reach the hooks above through
+# NOTIFY job_expired.  Off by default so importing the app (tests, tooling,
+# benchmarks/startup.py) does not open a database connection; without it
+# the semantic index still drops closed jobs on its next rebuild.
+if os.environ.get('JOB_EXPIRY_LISTEN', '0') == '1':
+    job_expiry.start_listener(lambda: psycopg2.connect(**DB_CONFIG))
+
+# Keep the placement cubes current from inside the web process; an advisory
+# lock lets only one worker refresh at a time.  Otherwise run
+# reports.py refresh --daemon.
+if os.environ.get('REPORTS_REFRESH_INTERVAL'):
+    reports.start_scheduler(lambda: psycopg2.connect(**DB_CONFIG),
+                            interval=int(os.environ['REPORTS_REFRESH_INTERVAL']))
+
+# Close past-deadline jobs from inside the web process. Safe to enable on
+# every worker (batches use SKIP LOCKED); otherwise run job_expiry.py --daemon.
+if os.environ.get('JOB_EXPIRY_INTERVAL'):
+    job_expiry.start_scheduler(lambda: get_db_connection(readonly=False),
+                               interval=int(os.environ['JOB_EXPIRY_INTERVAL']))
+
+FACET_LIMIT = 20
+
+def cache_version(cur, name):
+    """Current value of a shared cache counter (migration 011), or None if unset."""
+    cur.execute("SELECT version FROM cache_versions WHERE name = %s", (name,))
+    row = cur.fetchone()
+    return row['version'] if row else None
+
+def compute_job_facets(cur, where, params):
+    """Counts by job_type, location, company and remote flag in one pass."""
+    cur.execute(f"""
+        SELECT j.job_type, j.location, c.company_name, j.is_remote,
+               GROUPING(j.job_type) = 0 as by_job_type,
+               GROUPING(j.location) = 0 as by_location,
+               GROUPING(c.company_name) = 0 as by_company,
+               COUNT(*) as count
+        FROM jobs j
+        JOIN companies c ON j.company_id = c.id
+        {where}
+        GROUP BY GROUPING SETS ((j.job_type), (j.location), (c.company_name), (j.is_remote))
+        ORDER BY count DESC
+    """, params)
+    
+    facets = {'job_type': [], 'location': [], 'company': [], 'is_remote': []}
+    for row in cur.fetchall():
+        if row['by_job_type']:
+            name, value = 'job_type', row['job_type']
+        elif row['by_location']:
+            name, value = 'location', row['location']
+        elif row['by_company']:
+            name, value = 'company', row['company_name']
+        else:
+            name, value = 'is_remote', row['is_remote']
+        if len(facets[name]) < FACET_LIMIT:
+            facets[name].append({'value': value, 'count': row['count']})
+    return facets
+
 # ==================== AUTHENTICATION ROUTES ====================
 
 @app.route('/api/auth/register', methods=['POST'])
@@ -188,12 +389,12 @@ def get_student_profile():
     conn.close()
     
     return jsonify({
-        'profile': dict(profile),
-        'skills': [dict(s) for s in skills],
-        'education': [dict(e) for e in education],
-        'experience': [dict(e) for e in experience],
-        'projects': [dict(p) for p in projects],
-        'certifications': [dict(c) for c in certifications]
+        'profile': profile,
+        'skills': skills,
+        'education': education,
+        'experience': experience,
+        'projects': projects,
+        'certifications': certifications
     }), 200
 
 @app.route('/api/student/profile', methods=['PUT'])
@@ -297,41 +498,65 @@ def search_jobs():
     page = int(request.args.get('page', 1))
     limit = int(request.args.get('limit', 10))
     offset = (page - 1) * limit
+    with_facets = request.args.get('facets', '').lower() in ('1', 'true', 'yes')
+    
+    columns, error = job_list_columns()
+    if error:
+        return jsonify({'error': error}), 400
     
     conn = get_db_connection()
     cur = conn.cursor()
     
-    query = """
-        SELECT j.*, c.company_name, c.company_logo 
-        FROM jobs j 
-        JOIN companies c ON j.company_id = c.id 
-        WHERE j.status = 'active'
-    """
+    where = f"WHERE j.status = 'active' AND {dedupe.VISIBLE_SQL}"
     params = []
     
     if search:
-        query += " AND (j.job_title ILIKE %s OR j.job_description ILIKE %s OR j.required_skills ILIKE %s)"
+        where += " AND (j.job_title ILIKE %s OR j.job_description ILIKE %s OR j.required_skills ILIKE %s)"
         search_pattern = f'%{search}%'
         params.extend([search_pattern, search_pattern, search_pattern])
     
     if job_type:
-        query += " AND j.job_type = %s"
+        where += " AND j.job_type = %s"
         params.append(job_type)
     
     if location:
-        query += " AND j.location ILIKE %s"
+        where += " AND j.location ILIKE %s"
         params.append(f'%{location}%')
     
-    query += " ORDER BY j.created_at DESC LIMIT %s OFFSET %s"
-    params.extend([limit, offset])
+    query = f"""
+        SELECT {columns}, {STUDENT_JOB_COLUMNS}
+        FROM jobs j 
+        JOIN companies c ON j.company_id = c.id 
+        {STUDENT_JOB_JOINS}
+        {where}
+        ORDER BY j.created_at DESC LIMIT %s OFFSET %s
+    """
     
-    cur.execute(query, params)
+    cur.execute(query, [get_jwt_identity()] + params + [limit, offset])
     jobs = cur.fetchall()
     
+    response = {'jobs': jobs}
+    
+    if with_facets:
+        # Counts over the whole active set don't depend on the query, so
+        # they are cached until the next job write.  The version is read on
+        # this same connection before the counts.  On a lagging replica it
+        # therefore trails the primary along with the rows, and an entry is
+        # never stored under a version newer than the data it was built from.
+        version = None if params else cache_version(cur, 'jobs')
+        if version is None:
+            response['facets'] = compute_job_facets(cur, where, params)
+        else:
+            facets = facet_cache.get(('active', version))
+            if facets is None:
+                facets = compute_job_facets(cur, where, params)
+                facet_cache.set(('active', version), facets)
+            response['facets'] = facets
+    
     cur.close()
     conn.close()
     
-    return jsonify({'jobs': [dict(j) for j in jobs]}), 200
+    return jsonify(response), 200
 
 @app.route('/api/jobs/<int:job_id>', methods=['GET'])
 @jwt_required()
@@ -339,12 +564,14 @@ def get_job_detail(job_id):
     conn = get_db_connection()
     cur = conn.cursor()
     
-    cur.execute("""
-        SELECT j.*, c.company_name, c.company_logo, c.website, c.description as company_description
+    cur.execute(f"""
+        SELECT j.*, c.company_name, c.company_logo, c.website, c.description as company_description,
+               {STUDENT_JOB_COLUMNS}
         FROM jobs j 
         JOIN companies c ON j.company_id = c.id 
+        {STUDENT_JOB_JOINS}
         WHERE j.id = %s
-    """, (job_id,))
+    """, (get_jwt_identity(), job_id))
     job = cur.fetchone()
     
     cur.close()
@@ -353,7 +580,8 @@ def get_job_detail(job_id):
     if not job:
         return jsonify({'error': 'Job not found'}), 404
     
-    return jsonify({'job': dict(job)}), 200
+    engagement.record('view', job_id, get_jwt_identity())
+    return jsonify({'job': job}), 200
 
 @app.route('/api/applications/apply', methods=['POST'])
 @role_required(['student'])
@@ -361,44 +589,66 @@ def apply_for_job():
     user_id = get_jwt_identity()
     data = request.json
     job_id = data.get('job_id')
+    # Retries carrying the same key get the original application back
+    idempotency_key = request.headers.get('Idempotency-Key') or data.get('idempotency_key')
+    
+    if not job_id:
+        return jsonify({'error': 'job_id is required'}), 400
+    if idempotency_key and len(idempotency_key) > 64:
+        return jsonify({'error': 'Idempotency key too long'}), 400
     
     conn = get_db_connection()
     cur = conn.cursor()
     
     try:
-        # Get student id
-        cur.execute("SELECT id, resume_url FROM students WHERE user_id = %s", (user_id,))
-        student = cur.fetchone()
-        
-        # Check if already applied
-        cur.execute("SELECT id FROM applications WHERE job_id = %s AND student_id = %s", (job_id, student['id']))
-        if cur.fetchone():
-            return jsonify({'error': 'Already applied to this job'}), 400
-        
+        # Duplicate detection is set-based: the unique index on
+        # (job_id, student_id) decides, so concurrent applies cannot race
         cur.execute("""
-            INSERT INTO applications (job_id, student_id, cover_letter, resume_url, status)
-            VALUES (%s, %s, %s, %s, 'applied') RETURNING id
-        """, (job_id, student['id'], data.get('cover_letter', ''), data.get('resume_url', student['resume_url'])))
-        
-        application_id = cur.fetchone()['id']
-        conn.commit()
+            INSERT INTO applications (job_id, student_id, cover_letter, resume_url, status, idempotency_key)
+            SELECT j.id, s.id, %s, COALESCE(%s, s.resume_url), 'applied', %s
+            FROM students s, jobs j
+            WHERE s.user_id = %s AND j.id = %s
+            ON CONFLICT DO NOTHING
+            RETURNING id, student_id
+        """, (data.get('cover_letter', ''), data.get('resume_url'), idempotency_key, user_id, job_id))
         
-        # Create notification for recruiter
-        cur.execute("SELECT company_id FROM jobs WHERE id = %s", (job_id,))
-        job = cur.fetchone()
-        
-        cur.execute("SELECT user_id FROM companies WHERE id = %s", (job['company_id'],))
-        company = cur.fetchone()
+        application = cur.fetchone()
+        if not application:
+            conn.rollback()
+            return _explain_rejected_apply(cur, user_id, job_id, idempotency_key)
         
+        # Deadline and cap are checked on the job row itself; the row lock
+        # serializes concurrent applies to this job only, never the table
         cur.execute("""
-            INSERT INTO notifications (user_id, title, message, notification_type)
-            VALUES (%s, %s, %s, %s)
-        """, (company['user_id'], 'New Application Received', 
-              f'New application for your job posting', 'application'))
+            WITH job AS (
+                UPDATE jobs j SET application_count = j.application_count + 1
+                FROM companies c
+                WHERE j.id = %s AND c.id = j.company_id
+                  AND j.status = 'active'
+                  AND (j.application_deadline IS NULL OR j.application_deadline >= CURRENT_DATE)
+                  AND (j.max_applications IS NULL OR j.application_count < j.max_applications)
+                RETURNING j.id, c.user_id as recruiter_user_id
+            ), notification AS (
+                INSERT INTO notifications (user_id, title, message, notification_type)
+                SELECT recruiter_user_id, 'New Application Received',
+                       'New application for your job posting', 'application'
+                FROM job
+            ), student AS (
+                UPDATE students SET application_count = application_count + 1
+                WHERE id = %s AND EXISTS (SELECT 1 FROM job)
+            )
+            SELECT id FROM job
+        """, (job_id, application['student_id']))
+        
+        if not cur.fetchone():
+            conn.rollback()
+            return jsonify({'error': 'Applications are closed for this job'}), 409
         
+        record_application_event(cur, application['id'], None, 'applied', user_id)
         conn.commit()
+        engagement.record('apply', int(job_id), user_id)
         
-        return jsonify({'message': 'Application submitted successfully', 'application_id': application_id}), 201
+        return jsonify({'message': 'Application submitted successfully', 'application_id': application['id']}), 201
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
@@ -406,6 +656,30 @@ def apply_for_job():
         cur.close()
         conn.close()
 
+def _explain_rejected_apply(cur, user_id, job_id, idempotency_key):
+    """Work out why an apply inserted nothing (only runs on the slow path)."""
+    cur.execute("""
+        SELECT a.id, a.job_id, a.idempotency_key
+        FROM applications a
+        JOIN students s ON a.student_id = s.id
+        WHERE s.user_id = %s AND (a.job_id = %s OR (%s IS NOT NULL AND a.idempotency_key = %s))
+    """, (user_id, job_id, idempotency_key, idempotency_key))
+    existing = cur.fetchall()
+    
+    for application in existing:
+        if idempotency_key and application['idempotency_key'] == idempotency_key:
+            if application['job_id'] != int(job_id):
+                return jsonify({'error': 'Idempotency key already used for another job'}), 422
+            return jsonify({'message': 'Application submitted successfully',
+                            'application_id': application['id']}), 200
+    if existing:
+        return jsonify({'error': 'Already applied to this job'}), 400
+    
+    cur.execute("SELECT id FROM jobs WHERE id = %s", (job_id,))
+    if not cur.fetchone():
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'error': 'Student profile not found'}), 404
+
 @app.route('/api/applications/my-applications', methods=['GET'])
 @role_required(['student'])
 def get_my_applications():
@@ -431,7 +705,51 @@ def get_my_applications():
     cur.close()
     conn.close()
     
-    return jsonify({'applications': [dict(a) for a in applications]}), 200
+    return jsonify({'applications': applications}), 200
+
+@app.route('/api/applications/<int:application_id>/accept', methods=['PUT'])
+@role_required(['student'])
+def accept_offer(application_id):
+    user_id = get_jwt_identity()
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    try:
+        cur.execute("""
+            SELECT a.id, a.status, c.user_id as recruiter_user_id, j.job_title
+            FROM applications a
+            JOIN students s ON a.student_id = s.id
+            JOIN jobs j ON a.job_id = j.id
+            JOIN companies c ON j.company_id = c.id
+            WHERE a.id = %s AND s.user_id = %s
+            FOR UPDATE OF a
+        """, (application_id, user_id))
+        
+        application = cur.fetchone()
+        if not application:
+            return jsonify({'error': 'Application not found'}), 404
+        
+        if application['status'] != 'offered':
+            return jsonify({'error': 'Only offered applications can be accepted'}), 400
+        
+        cur.execute("UPDATE applications SET status = 'accepted' WHERE id = %s", (application_id,))
+        record_application_event(cur, application_id, 'offered', 'accepted', user_id)
+        
+        cur.execute("""
+            INSERT INTO notifications (user_id, title, message, notification_type)
+            VALUES (%s, %s, %s, %s)
+        """, (application['recruiter_user_id'], 'Offer Accepted',
+              f"A candidate accepted your offer for {application['job_title']}", 'application_status'))
+        
+        conn.commit()
+        return jsonify({'message': 'Offer accepted'}), 200
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        cur.close()
+        conn.close()
 
 # ==================== AI/ML ROUTES ====================
 
@@ -446,27 +764,20 @@ def analyze_resume():
     
     if not resume_text or not job_description:
         return jsonify({'error': 'Resume text and job description required'}), 400
+    # Scores are batched across callers; bad input must not reach the batch
+    if not isinstance(resume_text, str) or not isinstance(job_description, str):
+        return jsonify({'error': 'Resume text and job description must be strings'}), 400
     
-    # Simple ATS score calculation using TF-IDF
-    vectorizer = TfidfVectorizer()
-    vectors = vectorizer.fit_transform([resume_text, job_description])
-    similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-    ats_score = round(similarity * 100, 2)
-    
-    # Extract keywords from job description
-    jd_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', job_description.lower()))
-    resume_words = set(re.findall(r'\b[a-zA-Z]{3,}\b', resume_text.lower()))
-    
-    matched_skills = list(jd_words.intersection(resume_words))
-    missing_skills = list(jd_words.difference(resume_words))
+    try:
+        score = ml_service.score(resume_text, job_description)
+    except (MLTimeout, MLUnavailable):
+        return jsonify({'error': 'Resume analysis is busy, please retry shortly'}), 503
     
-    suggestions = []
-    if ats_score < 70:
-        suggestions.append("Include more keywords from the job description")
-    if len(missing_skills) > 10:
-        suggestions.append(f"Add missing skills: {', '.join(missing_skills[:5])}")
-    if len(resume_text) < 500:
-        suggestions.append("Expand your resume with more details about your experience")
+    result = ai.analyze_resume_text(resume_text, job_description, score=score)
+    ats_score = result['ats_score']
+    matched_skills = result['matched_skills']
+    missing_skills = result['missing_skills']
+    suggestions = result['suggestions']
     
     conn = get_db_connection()
     cur = conn.cursor()
@@ -490,18 +801,17 @@ def analyze_resume():
         cur.close()
         conn.close()
     
-    return jsonify({
-        'ats_score': ats_score,
-        'matched_skills': matched_skills[:20],
-        'missing_skills': missing_skills[:20],
-        'suggestions': suggestions,
-        'keyword_match_percentage': ats_score
-    }), 200
+    return jsonify(result), 200
 
 @app.route('/api/ai/job-recommendations', methods=['GET'])
 @role_required(['student'])
 def get_job_recommendations():
     user_id = get_jwt_identity()
+    
+    columns, error = job_list_columns(required=('id', 'required_skills'))
+    if error:
+        return jsonify({'error': error}), 400
+    
     conn = get_db_connection()
     cur = conn.cursor()
     
@@ -513,32 +823,299 @@ def get_job_recommendations():
     skills = [s['skill_name'].lower() for s in cur.fetchall()]
     
     # Get all active jobs
-    cur.execute("""
-        SELECT j.*, c.company_name, c.company_logo
+    cur.execute(f"""
+        SELECT {columns}, {STUDENT_JOB_COLUMNS}
         FROM jobs j
         JOIN companies c ON j.company_id = c.id
-        WHERE j.status = 'active'
-    """)
+        {STUDENT_JOB_JOINS}
+        WHERE j.status = 'active' AND {dedupe.VISIBLE_SQL}
+    """, (user_id,))
     jobs = cur.fetchall()
     
+    cur.close()
+    conn.close()
+    
     # Simple recommendation: match skills with required skills
-    recommendations = []
+    try:
+        scores = ml_service.match_scores(skills, [job['required_skills'] for job in jobs])
+    except (MLTimeout, MLUnavailable):
+        return jsonify({'error': 'Recommendations are busy, please retry shortly'}), 503
+    recommendations = ai.recommend_jobs(skills, jobs, scores=scores)
+    
+    return jsonify({'recommendations': recommendations}), 200
+
+@app.route('/api/ai/semantic-recommendations', methods=['GET'])
+@role_required(['student'])
+def get_semantic_recommendations():
+    user_id = get_jwt_identity()
+    limit = min(int(request.args.get('limit', 10)), 50)
+    
+    columns, error = job_list_columns(required=('id',))
+    if error:
+        return jsonify({'error': error}), 400
+    if not semantic.ready():
+        return jsonify({'error': 'Semantic matching is not available yet'}), 503
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    cur.execute(f"SELECT {embeddings.STUDENT_TEXT_SQL} as text FROM students s WHERE s.user_id = %s",
+                (user_id,))
+    student = cur.fetchone()
+    if not student:
+        cur.close()
+        conn.close()
+        return jsonify({'error': 'Student profile not found'}), 404
+    
+    similarities = dict(semantic.search(student['text'] or '', limit))
+    
+    cur.execute(f"""
+        SELECT {columns}, {STUDENT_JOB_COLUMNS}
+        FROM jobs j
+        JOIN companies c ON j.company_id = c.id
+        {STUDENT_JOB_JOINS}
+        WHERE j.id = ANY(%s) AND j.status = 'active'
+    """, (user_id, list(similarities)))
+    jobs = cur.fetchall()
+    
+    cur.close()
+    conn.close()
+    
     for job in jobs:
-        job_skills = job['required_skills'].lower() if job['required_skills'] else ''
-        match_count = sum(1 for skill in skills if skill in job_skills)
-        
-        if match_count > 0:
-            job_dict = dict(job)
-            job_dict['match_score'] = match_count
-            recommendations.append(job_dict)
+        job['similarity'] = round(similarities[job['id']] * 100, 2)
+    jobs.sort(key=lambda job: job['similarity'], reverse=True)
     
-    # Sort by match score
-    recommendations.sort(key=lambda x: x['match_score'], reverse=True)
+    return jsonify({'recommendations': jobs}), 200
+
+@app.route('/api/admin/ml-metrics', methods=['GET'])
+@role_required(['admin'])
+def get_ml_metrics():
+    return jsonify(ml_service.metrics()), 200
+
+@app.route('/api/admin/engagement-metrics', methods=['GET'])
+@role_required(['admin'])
+def get_engagement_metrics():
+    return jsonify(engagement.metrics()), 200
+
+@app.route('/api/admin/db-routing', methods=['GET'])
+@role_required(['admin'])
+def get_db_routing():
+    return jsonify(routing_stats()), 200
+
+@app.route('/api/admin/admission-metrics', methods=['GET'])
+@role_required(['admin'])
+def get_admission_metrics():
+    return jsonify(admission_control.metrics()), 200
+
+@app.route('/api/admin/profiler', methods=['GET'])
+@role_required(['admin'])
+def get_profiler():
+    return jsonify(profiler.summary()), 200
+
+@app.route('/api/admin/profiler', methods=['PUT'])
+@role_required(['admin'])
+def update_profiler():
+    data = request.get_json() or {}
+    routes = data.get('routes')
+    if routes is not None and not isinstance(routes, dict):
+        return jsonify({'error': 'routes must map endpoint names to sample rates'}), 400
+    try:
+        profiler.configure(enabled=data.get('enabled'), sample_rate=data.get('sample_rate'),
+                           routes=routes, interval_ms=data.get('interval_ms'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'sample rates and interval_ms must be numbers'}), 400
+    if data.get('reset'):
+        profiler.reset()
+    return jsonify(profiler.summary()), 200
+
+@app.route('/api/admin/profiler/flamegraph', methods=['GET'])
+@role_required(['admin'])
+def get_profiler_flamegraph():
+    # Folded stacks for flamegraph.pl / speedscope
+    return Response(profiler.folded(request.args.get('endpoint')), mimetype='text/plain')
+
+# ==================== STUDENT DASHBOARD ====================
+
+DASHBOARD_SECTION_TIMEOUT = float(os.environ.get('DASHBOARD_SECTION_TIMEOUT', 2))
+DASHBOARD_LIST_LIMIT = 5
+
+def _dashboard_section(fn, readonly, student_id, user_id):
+    conn = get_db_connection(readonly=readonly)
+    cur = conn.cursor()
+    try:
+        # Bound the query even if the request has already given up on it
+        cur.execute("SET LOCAL statement_timeout = %s", (int(DASHBOARD_SECTION_TIMEOUT * 1000),))
+        return fn(cur, student_id, user_id)
+    finally:
+        cur.close()
+        conn.close()
+
+def _dashboard_applications(cur, student_id, user_id):
+    cur.execute("""
+        SELECT status, COUNT(*) as count
+        FROM applications
+        WHERE student_id = %s
+        GROUP BY status
+    """, (student_id,))
+    by_status = {row['status']: row['count'] for row in cur.fetchall()}
+    
+    cur.execute("""
+        SELECT a.id, a.job_id, a.status, a.applied_at, j.job_title, c.company_name, c.company_logo
+        FROM applications a
+        JOIN jobs j ON a.job_id = j.id
+        JOIN companies c ON j.company_id = c.id
+        WHERE a.student_id = %s
+        ORDER BY a.applied_at DESC
+        LIMIT %s
+    """, (student_id, DASHBOARD_LIST_LIMIT))
+    
+    return {'total': sum(by_status.values()), 'by_status': by_status, 'recent': cur.fetchall()}
+
+def _dashboard_saved_jobs(cur, student_id, user_id):
+    cur.execute("""
+        SELECT j.id, j.job_title, j.job_type, j.location, c.company_name, c.company_logo,
+               sj.saved_at, COUNT(*) OVER () as total
+        FROM saved_jobs sj
+        JOIN jobs j ON sj.job_id = j.id
+        JOIN companies c ON j.company_id = c.id
+        WHERE sj.student_id = %s
+        ORDER BY sj.saved_at DESC
+        LIMIT %s
+    """, (student_id, DASHBOARD_LIST_LIMIT))
+    recent = cur.fetchall()
+    total = recent[0]['total'] if recent else 0
+    for row in recent:
+        del row['total']
+    return {'total': total, 'recent': recent}
+
+def _dashboard_notifications(cur, student_id, user_id):
+    cutoff = retention_cutoff()
+    cur.execute("""
+        SELECT id, title, message, notification_type, is_read, created_at
+        FROM notifications
+        WHERE user_id = %s AND created_at >= %s
+        ORDER BY created_at DESC
+        LIMIT %s
+    """, (user_id, cutoff, DASHBOARD_LIST_LIMIT))
+    recent = cur.fetchall()
+    
+    cur.execute("""
+        SELECT COUNT(*) as count FROM notifications
+        WHERE user_id = %s AND is_read = false AND created_at >= %s
+    """, (user_id, cutoff))
+    
+    return {'unread_count': cur.fetchone()['count'], 'recent': recent}
+
+def _dashboard_recommendations(cur, student_id, user_id):
+    cur.execute("SELECT skill_name FROM student_skills WHERE student_id = %s", (student_id,))
+    skills = [s['skill_name'].lower() for s in cur.fetchall()]
+    if not skills:
+        return []
+    
+    cur.execute(f"""
+        SELECT j.id, j.job_title, j.job_type, j.location, j.required_skills,
+               c.company_name, c.company_logo
+        FROM jobs j
+        JOIN companies c ON j.company_id = c.id
+        WHERE j.status = 'active' AND {dedupe.VISIBLE_SQL}
+    """)
+    jobs = cur.fetchall()
+    
+    scores = ml_service.match_scores(skills, [job['required_skills'] for job in jobs],
+                                     timeout=DASHBOARD_SECTION_TIMEOUT)
+    return ai.recommend_jobs(skills, jobs, limit=DASHBOARD_LIST_LIMIT, scores=scores)
+
+DASHBOARD_SECTIONS = {
+    'applications': _dashboard_applications,
+    'saved_jobs': _dashboard_saved_jobs,
+    'notifications': _dashboard_notifications,
+    'recommendations': _dashboard_recommendations,
+}
+
+# Sections run concurrently, each on its own pooled connection.  The pool
+# gets at most half of DB_POOL_MAX, and only as many dashboards fan out at
+# once as it has threads for.  A dashboard's slot is released when all of
+# its sections have finished, including ones the request stopped waiting
+# for, so slow queries cannot leave later dashboards queued behind them.
+# A dashboard that finds every slot busy runs its sections inline.
+DASHBOARD_WORKERS = int(os.environ.get('DASHBOARD_WORKERS', max(len(DASHBOARD_SECTIONS), POOL_MAX // 2)))
+dashboard_executor = ThreadPoolExecutor(max_workers=DASHBOARD_WORKERS, thread_name_prefix='dashboard')
+dashboard_slots = threading.BoundedSemaphore(max(1, DASHBOARD_WORKERS // len(DASHBOARD_SECTIONS)))
+
+def _dashboard_sections(student_id, user_id, readonly):
+    """(results, errors) for every section, each bounded by the section timeout."""
+    results, errors = {}, {}
+    if not dashboard_slots.acquire(blocking=False):
+        for name, fn in DASHBOARD_SECTIONS.items():
+            try:
+                results[name] = _dashboard_section(fn, readonly, student_id, user_id)
+            except Exception as e:
+                app.logger.warning('dashboard section %s failed: %s', name, e)
+                errors[name] = 'unavailable'
+        return results, errors
+    
+    # Sections count towards this request when it is being profiled
+    section = profiling.propagate(_dashboard_section)
+    futures = {
+        name: dashboard_executor.submit(section, fn, readonly, student_id, user_id)
+        for name, fn in DASHBOARD_SECTIONS.items()
+    }
+    pending = set(futures.values())
+    pending_lock = threading.Lock()
+    
+    def release_slot(future):
+        with pending_lock:
+            pending.discard(future)
+            if pending:
+                return
+        dashboard_slots.release()
+    
+    for future in futures.values():
+        future.add_done_callback(release_slot)
+    wait(futures.values(), timeout=DASHBOARD_SECTION_TIMEOUT)
+    
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            errors[name] = 'timeout'
+        elif future.exception() is not None:
+            app.logger.warning('dashboard section %s failed: %s', name, future.exception())
+            errors[name] = 'unavailable'
+        else:
+            results[name] = future.result()
+    return results, errors
+
+@app.route('/api/student/dashboard', methods=['GET'])
+@role_required(['student'])
+def get_student_dashboard():
+    user_id = get_jwt_identity()
+    readonly = request_prefers_replica()
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    cur.execute("""
+        SELECT s.id, s.first_name, s.last_name, s.department, s.graduation_year,
+               s.current_cgpa, s.resume_url,
+               (SELECT COUNT(*) FROM student_skills sk WHERE sk.student_id = s.id) as skills_count
+        FROM students s
+        WHERE s.user_id = %s
+    """, (user_id,))
+    profile = cur.fetchone()
     
     cur.close()
     conn.close()
     
-    return jsonify({'recommendations': recommendations[:10]}), 200
+    if not profile:
+        return jsonify({'error': 'Student profile not found'}), 404
+    
+    results, errors = _dashboard_sections(profile['id'], user_id, readonly)
+    response = {'profile': profile, **results}
+    
+    # Sections that failed are left out; the client can fall back to the
+    # individual endpoint for just those
+    response['errors'] = errors
+    return jsonify(response), 200
 
 # ==================== RECRUITER ROUTES ====================
 
@@ -560,7 +1137,7 @@ def get_recruiter_profile():
     cur.close()
     conn.close()
     
-    return jsonify({'profile': dict(profile)}), 200
+    return jsonify({'profile': profile}), 200
 
 @app.route('/api/recruiter/profile', methods=['PUT'])
 @role_required(['recruiter'])
@@ -607,6 +1184,13 @@ def create_job():
     user_id = get_jwt_identity()
     data = request.json
     
+    # Optional cap on applications, enforced by apply_for_job; null = no cap
+    max_applications = data.get('max_applications')
+    if max_applications is not None and (
+            isinstance(max_applications, bool) or not isinstance(max_applications, int)
+            or max_applications < 1):
+        return jsonify({'error': 'max_applications must be a positive integer or null'}), 400
+    
     conn = get_db_connection()
     cur = conn.cursor()
     
@@ -614,13 +1198,36 @@ def create_job():
         cur.execute("SELECT id FROM companies WHERE user_id = %s", (user_id,))
         company = cur.fetchone()
         
+        # Reposts of an active posting by the same company are flagged with
+        # duplicate_of (kept out of search while the original is active),
+        # or refused on request.  The signature is computed in the ML pool;
+        # if that is unavailable the posting is saved unchecked and picked
+        # up by the next dedupe.py backfill.
+        try:
+            signature = ml_service.signature(data['job_title'], data['job_description'])
+        except (MLTimeout, MLUnavailable):
+            app.logger.warning('duplicate check skipped for new posting: ML pool unavailable')
+            signature = None
+        if signature is not None:
+            signature = dedupe.from_bytes(signature)
+        duplicates = dedupe.find_duplicates(cur, signature, company['id']) if signature is not None else []
+        duplicate_of, duplicate_similarity = duplicates[0] if duplicates else (None, None)
+        
+        if duplicate_of and data.get('on_duplicate') == 'reject':
+            return jsonify({
+                'error': 'This posting duplicates one of your active jobs',
+                'duplicate_of': duplicate_of,
+                'similarity': duplicate_similarity
+            }), 409
+        
         cur.execute("""
             INSERT INTO jobs (
                 company_id, job_title, job_description, job_type, location, 
                 is_remote, salary_min, salary_max, experience_required,
                 required_skills, preferred_skills, qualifications, 
-                responsibilities, benefits, application_deadline, vacancies, status
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                responsibilities, benefits, application_deadline, vacancies, status,
+                duplicate_of, max_applications
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             RETURNING id
         """, (
             company['id'], data['job_title'], data['job_description'],
@@ -630,13 +1237,22 @@ def create_job():
             data.get('preferred_skills', ''), data.get('qualifications', ''),
             data.get('responsibilities', ''), data.get('benefits', ''),
             data.get('application_deadline'), data.get('vacancies', 1),
-            data.get('status', 'active')
+            data.get('status', 'active'), duplicate_of, max_applications
         ))
         
         job_id = cur.fetchone()['id']
+        if signature is not None:
+            dedupe.store_signatures(cur, [(job_id, signature)])
         conn.commit()
         
-        return jsonify({'message': 'Job posted successfully', 'job_id': job_id}), 201
+        # The semantic index refresher embeds the new posting in the
+        # background; this only wakes it if this worker is running one
+        semantic.refresh_soon()
+        
+        response = {'message': 'Job posted successfully', 'job_id': job_id}
+        if duplicate_of:
+            response.update(duplicate_of=duplicate_of, similarity=duplicate_similarity)
+        return jsonify(response), 201
     except Exception as e:
         conn.rollback()
         return jsonify({'error': str(e)}), 500
@@ -654,45 +1270,68 @@ def get_recruiter_jobs():
     cur.execute("SELECT id FROM companies WHERE user_id = %s", (user_id,))
     company = cur.fetchone()
     
+    # application_count is the lifetime counter kept on the job row by
+    # apply_for_job.  Views, saves and tracked applies come from the
+    # engagement daily roll-up.  Conversion divides applies by views from
+    # that same roll-up, so applications made before view tracking began
+    # cannot push it past 100%.
     cur.execute("""
-        SELECT j.*, COUNT(a.id) as application_count
+        SELECT j.*,
+               COALESCE(e.views, 0) as views,
+               COALESCE(e.saves, 0) as saves,
+               CASE WHEN COALESCE(e.views, 0) > 0
+                    THEN ROUND(e.applies::numeric / e.views, 4)
+               END as conversion_rate
         FROM jobs j
-        LEFT JOIN applications a ON j.id = a.job_id
+        LEFT JOIN (
+            SELECT d.job_id, SUM(d.views) as views, SUM(d.saves) as saves, SUM(d.applies) as applies
+            FROM job_engagement_daily d
+            JOIN jobs dj ON dj.id = d.job_id
+            WHERE dj.company_id = %s
+            GROUP BY d.job_id
+        ) e ON e.job_id = j.id
         WHERE j.company_id = %s
-        GROUP BY j.id
         ORDER BY j.created_at DESC
-    """, (company['id'],))
+    """, (company['id'], company['id']))
     
     jobs = cur.fetchall()
     
     cur.close()
     conn.close()
     
-    return jsonify({'jobs': [dict(j) for j in jobs]}), 200
+    return jsonify({'jobs': jobs}), 200
 
 @app.route('/api/recruiter/jobs/<int:job_id>/applications', methods=['GET'])
 @role_required(['recruiter'])
 def get_job_applications(job_id):
     user_id = get_jwt_identity()
     status_filter = request.args.get('status', '')
+    # ?sort=relevance ranks applicants by profile / job embedding similarity
+    by_relevance = request.args.get('sort') == 'relevance'
+    if by_relevance and not embeddings.model_available():
+        return jsonify({'error': 'Semantic matching is not available yet'}), 503
     
     conn = get_db_connection()
     cur = conn.cursor()
     
     # Verify job belongs to recruiter
-    cur.execute("""
-        SELECT j.id FROM jobs j
+    cur.execute(f"""
+        SELECT j.id, {embeddings.JOB_TEXT_SQL} as text FROM jobs j
         JOIN companies c ON j.company_id = c.id
         WHERE j.id = %s AND c.user_id = %s
     """, (job_id, user_id))
+    job = cur.fetchone()
     
-    if not cur.fetchone():
+    if not job:
+        cur.close()
+        conn.close()
         return jsonify({'error': 'Unauthorized'}), 403
     
-    query = """
+    profile_text = f", {embeddings.STUDENT_TEXT_SQL} as profile_text" if by_relevance else ''
+    query = f"""
         SELECT a.*, s.first_name, s.last_name, s.email as student_email,
                s.phone, s.department, s.current_cgpa, s.graduation_year,
-               s.resume_url, s.linkedin_url
+               s.resume_url, s.linkedin_url{profile_text}
         FROM applications a
         JOIN students s ON a.student_id = s.id
         WHERE a.job_id = %s
@@ -711,7 +1350,16 @@ def get_job_applications(job_id):
     cur.close()
     conn.close()
     
-    return jsonify({'applications': [dict(a) for a in applications]}), 200
+    if by_relevance and applications:
+        try:
+            scores = ml_service.relevance(job['text'], [a.pop('profile_text') for a in applications])
+        except (MLTimeout, MLUnavailable):
+            return jsonify({'error': 'Relevance ranking is busy, please retry shortly'}), 503
+        for application, relevance in zip(applications, scores):
+            application['relevance'] = relevance
+        applications.sort(key=lambda a: a['relevance'], reverse=True)
+    
+    return jsonify({'applications': applications}), 200
 
 @app.route('/api/recruiter/applications/<int:application_id>/status', methods=['PUT'])
 @role_required(['recruiter'])
@@ -729,17 +1377,23 @@ def update_application_status(application_id):
     try:
         # Verify application belongs to recruiter's job
         cur.execute("""
-            SELECT a.id, a.student_id FROM applications a
+            SELECT a.id, a.student_id, a.status FROM applications a
             JOIN jobs j ON a.job_id = j.id
             JOIN companies c ON j.company_id = c.id
             WHERE a.id = %s AND c.user_id = %s
+            FOR UPDATE OF a
         """, (application_id, user_id))
         
         application = cur.fetchone()
         if not application:
             return jsonify({'error': 'Unauthorized'}), 403
         
+        if application['status'] == 'accepted':
+            return jsonify({'error': 'Offer already accepted by the student'}), 400
+        
         cur.execute("UPDATE applications SET status = %s WHERE id = %s", (new_status, application_id))
+        if application['status'] != new_status:
+            record_application_event(cur, application_id, application['status'], new_status, user_id)
         
         # Create notification for student
         cur.execute("SELECT user_id FROM students WHERE id = %s", (application['student_id'],))
@@ -760,8 +1414,345 @@ def update_application_status(application_id):
         cur.close()
         conn.close()
 
+# ==================== INTERVIEW SCHEDULING ====================
+
+MAX_SLOTS_PER_REQUEST = 2000
+
+def _recruiter_owns_job(cur, job_id, user_id):
+    cur.execute("""
+        SELECT j.id FROM jobs j
+        JOIN companies c ON j.company_id = c.id
+        WHERE j.id = %s AND c.user_id = %s
+    """, (job_id, user_id))
+    return cur.fetchone() is not None
+
+@app.route('/api/recruiter/jobs/<int:job_id>/interview-slots', methods=['POST'])
+@role_required(['recruiter'])
+def create_interview_slots(job_id):
+    user_id = get_jwt_identity()
+    data = request.json
+    
+    try:
+        start = scheduling.parse_time(data['start'])
+        end = scheduling.parse_time(data['end'])
+        duration = int(data.get('duration_minutes', 30))
+        break_minutes = int(data.get('break_minutes', 0))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'start and end (ISO 8601) are required'}), 400
+    if duration <= 0 or break_minutes < 0 or end <= start:
+        return jsonify({'error': 'Invalid slot window'}), 400
+    
+    slots = scheduling.generate_slots(start, end, duration, break_minutes,
+                                      data.get('panels') or ['Panel 1'])
+    if not slots:
+        return jsonify({'error': 'No slot fits between start and end'}), 400
+    if len(slots) > MAX_SLOTS_PER_REQUEST:
+        return jsonify({'error': f'At most {MAX_SLOTS_PER_REQUEST} slots per request'}), 400
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    try:
+        if not _recruiter_owns_job(cur, job_id, user_id):
+            return jsonify({'error': 'Unauthorized'}), 403
+        
+        rows = execute_values(cur, """
+            INSERT INTO interview_slots (job_id, panel, during, location)
+            VALUES %s
+            RETURNING id
+        """, [(job_id, panel, DateTimeTZRange(slot_start, slot_end, '[)'), data.get('location'))
+              for panel, slot_start, slot_end in slots], fetch=True)
+        conn.commit()
+        
+        return jsonify({'message': f'{len(rows)} slots created',
+                        'slot_ids': [row['id'] for row in rows]}), 201
+    except psycopg2.errors.ExclusionViolation:
+        conn.rollback()
+        return jsonify({'error': 'Slots overlap existing slots on the same panel'}), 409
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        cur.close()
+        conn.close()
+
+@app.route('/api/recruiter/jobs/<int:job_id>/interview-slots', methods=['GET'])
+@role_required(['recruiter'])
+def get_interview_slots(job_id):
+    user_id = get_jwt_identity()
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    if not _recruiter_owns_job(cur, job_id, user_id):
+        cur.close()
+        conn.close()
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    cur.execute("""
+        SELECT s.id, s.panel, lower(s.during) as starts_at, upper(s.during) as ends_at, s.location,
+               i.id as interview_id, i.application_id, st.first_name, st.last_name
+        FROM interview_slots s
+        LEFT JOIN interviews i ON i.slot_id = s.id AND i.status = 'scheduled'
+        LEFT JOIN students st ON st.id = i.student_id
+        WHERE s.job_id = %s
+        ORDER BY lower(s.during), s.panel
+    """, (job_id,))
+    slots = cur.fetchall()
+    
+    cur.close()
+    conn.close()
+    
+    return jsonify({'slots': slots}), 200
+
+@app.route('/api/recruiter/jobs/<int:job_id>/interviews/auto-assign', methods=['POST'])
+@role_required(['recruiter'])
+def auto_assign_interviews(job_id):
+    user_id = get_jwt_identity()
+    data = request.json or {}
+    # Default to every shortlisted applicant without an interview
+    application_ids = data.get('application_ids')
+    started = time.perf_counter()
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    try:
+        if not _recruiter_owns_job(cur, job_id, user_id):
+            return jsonify({'error': 'Unauthorized'}), 403
+        
+        cur.execute("""
+            SELECT s.id, lower(s.during) as starts_at, upper(s.during) as ends_at
+            FROM interview_slots s
+            WHERE s.job_id = %s AND lower(s.during) > now()
+              AND NOT EXISTS (SELECT 1 FROM interviews i WHERE i.slot_id = s.id AND i.status = 'scheduled')
+        """, (job_id,))
+        slots = [(row['id'], row['starts_at'], row['ends_at']) for row in cur.fetchall()]
+        
+        cur.execute("""
+            SELECT a.id, a.student_id
+            FROM applications a
+            WHERE a.job_id = %s
+              AND (CASE WHEN %s::int[] IS NULL THEN a.status = 'shortlisted'
+                        ELSE a.id = ANY(%s::int[]) AND a.status IN ('applied', 'shortlisted') END)
+              AND NOT EXISTS (SELECT 1 FROM interviews i
+                              WHERE i.application_id = a.id AND i.status = 'scheduled')
+        """, (job_id, application_ids, application_ids))
+        applications = cur.fetchall()
+        student_ids = [a['student_id'] for a in applications]
+        
+        # Everything the in-memory conflict check needs, in two queries
+        availability, busy = {}, {}
+        cur.execute("""
+            SELECT student_id, lower(during) as starts_at, upper(during) as ends_at
+            FROM student_availability
+            WHERE student_id = ANY(%s) AND upper(during) > now()
+        """, (student_ids,))
+        for row in cur.fetchall():
+            availability.setdefault(row['student_id'], []).append((row['starts_at'], row['ends_at']))
+        cur.execute("""
+            SELECT student_id, lower(during) as starts_at, upper(during) as ends_at
+            FROM interviews
+            WHERE student_id = ANY(%s) AND status = 'scheduled' AND upper(during) > now()
+        """, (student_ids,))
+        for row in cur.fetchall():
+            busy.setdefault(row['student_id'], []).append((row['starts_at'], row['ends_at']))
+        
+        candidates = [{
+            'application_id': a['id'],
+            'availability': scheduling.IntervalSet(availability.get(a['student_id'], ())),
+            'busy': scheduling.IntervalSet(busy.get(a['student_id'], ())),
+        } for a in applications]
+        assignments, unassigned = scheduling.auto_assign(slots, candidates)
+        
+        booked = []
+        if assignments:
+            # One statement books every pair; ON CONFLICT DO NOTHING skips
+            # any pair the exclusion constraints reject because of a
+            # concurrent booking. None of these transitions touch placement
+            # statuses, so student_placements needs no update.
+            application_col, slot_col = zip(*assignments)
+            cur.execute("""
+                WITH pairs AS (
+                    SELECT * FROM unnest(%s::int[], %s::int[]) AS v(application_id, slot_id)
+                ), old AS (
+                    SELECT a.id, a.status, a.student_id, a.job_id
+                    FROM applications a
+                    JOIN pairs p ON p.application_id = a.id
+                    FOR UPDATE OF a
+                ), booked AS (
+                    INSERT INTO interviews (slot_id, application_id, student_id, during)
+                    SELECT p.slot_id, o.id, o.student_id, s.during
+                    FROM pairs p
+                    JOIN old o ON o.id = p.application_id
+                    JOIN interview_slots s ON s.id = p.slot_id
+                    ON CONFLICT DO NOTHING
+                    RETURNING application_id, during
+                ), moved AS (
+                    UPDATE applications a SET status = 'interview_scheduled'
+                    FROM booked b
+                    WHERE a.id = b.application_id
+                ), events AS (
+                    INSERT INTO application_events
+                    (application_id, student_id, job_id, from_status, to_status, actor_user_id)
+                    SELECT o.id, o.student_id, o.job_id, o.status, 'interview_scheduled', %s
+                    FROM old o
+                    JOIN booked b ON b.application_id = o.id
+                ), notified AS (
+                    INSERT INTO notifications (user_id, title, message, notification_type)
+                    SELECT st.user_id, 'Interview Scheduled',
+                           'Your interview is scheduled for '
+                           || to_char(lower(b.during) AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI') || ' UTC',
+                           'interview'
+                    FROM booked b
+                    JOIN old o ON o.id = b.application_id
+                    JOIN students st ON st.id = o.student_id
+                )
+                SELECT application_id FROM booked
+            """, (list(application_col), list(slot_col), user_id))
+            booked = {row['application_id'] for row in cur.fetchall()}
+            conn.commit()
+        
+        unassigned += [application_id for application_id, _ in assignments if application_id not in booked]
+        
+        return jsonify({
+            'assigned': len(booked),
+            'unassigned': unassigned,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        }), 200
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        cur.close()
+        conn.close()
+
+@app.route('/api/recruiter/interviews/<int:interview_id>', methods=['DELETE'])
+@role_required(['recruiter'])
+def cancel_interview(interview_id):
+    user_id = get_jwt_identity()
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    try:
+        # Frees the slot; the application keeps its status for the recruiter to change
+        cur.execute("""
+            UPDATE interviews i SET status = 'cancelled'
+            FROM interview_slots s, jobs j, companies c
+            WHERE i.id = %s AND i.status = 'scheduled'
+              AND s.id = i.slot_id AND j.id = s.job_id AND c.id = j.company_id AND c.user_id = %s
+            RETURNING i.id
+        """, (interview_id, user_id))
+        if not cur.fetchone():
+            return jsonify({'error': 'Interview not found'}), 404
+        
+        conn.commit()
+        return jsonify({'message': 'Interview cancelled'}), 200
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        cur.close()
+        conn.close()
+
+@app.route('/api/student/availability', methods=['GET'])
+@role_required(['student'])
+def get_student_availability():
+    user_id = get_jwt_identity()
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    cur.execute("""
+        SELECT sa.id, lower(sa.during) as starts_at, upper(sa.during) as ends_at
+        FROM student_availability sa
+        JOIN students s ON s.id = sa.student_id
+        WHERE s.user_id = %s AND upper(sa.during) > now()
+        ORDER BY lower(sa.during)
+    """, (user_id,))
+    windows = cur.fetchall()
+    
+    cur.close()
+    conn.close()
+    
+    return jsonify({'availability': windows}), 200
+
+@app.route('/api/student/availability', methods=['PUT'])
+@role_required(['student'])
+def update_student_availability():
+    user_id = get_jwt_identity()
+    data = request.json
+    
+    try:
+        windows = [(scheduling.parse_time(w['start']), scheduling.parse_time(w['end']))
+                   for w in data.get('windows', [])]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'windows must be a list of {start, end} ISO 8601 times'}), 400
+    if any(end <= start for start, end in windows):
+        return jsonify({'error': 'Each window must end after it starts'}), 400
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    try:
+        cur.execute("SELECT id FROM students WHERE user_id = %s", (user_id,))
+        student = cur.fetchone()
+        
+        # Replace the whole set; overlapping windows are merged first
+        cur.execute("DELETE FROM student_availability WHERE student_id = %s", (student['id'],))
+        if windows:
+            execute_values(cur, """
+                INSERT INTO student_availability (student_id, during) VALUES %s
+            """, [(student['id'], DateTimeTZRange(start, end, '[)'))
+                  for start, end in scheduling.IntervalSet(windows)])
+        conn.commit()
+        
+        return jsonify({'message': 'Availability updated'}), 200
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        cur.close()
+        conn.close()
+
+@app.route('/api/student/interviews', methods=['GET'])
+@role_required(['student'])
+def get_student_interviews():
+    user_id = get_jwt_identity()
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    cur.execute("""
+        SELECT i.id, i.application_id, lower(i.during) as starts_at, upper(i.during) as ends_at,
+               sl.panel, sl.location, j.job_title, c.company_name
+        FROM interviews i
+        JOIN students s ON s.id = i.student_id
+        JOIN interview_slots sl ON sl.id = i.slot_id
+        JOIN jobs j ON j.id = sl.job_id
+        JOIN companies c ON c.id = j.company_id
+        WHERE s.user_id = %s AND i.status = 'scheduled' AND upper(i.during) > now()
+        ORDER BY lower(i.during)
+    """, (user_id,))
+    interviews = cur.fetchall()
+    
+    cur.close()
+    conn.close()
+    
+    return jsonify({'interviews': interviews}), 200
+
 # ==================== ADMIN & PLACEMENT OFFICER ROUTES ====================
 
+# Sort keys accepted by the student directory, mapped to SQL
+STUDENT_DIRECTORY_SORTS = {
+    'id': 's.id',
+    'name': 's.last_name',
+    'roll_number': 's.roll_number',
+    'department': 's.department',
+    'graduation_year': 's.graduation_year',
+    'cgpa': 's.current_cgpa',
+    'applications': 's.application_count',
+    'offers': 'offers_received',
+}
+STUDENT_DIRECTORY_MAX_LIMIT = 200
+
 @app.route('/api/admin/dashboard-stats', methods=['GET'])
 @role_required(['admin', 'placement_officer'])
 def get_dashboard_stats():
@@ -781,7 +1772,7 @@ def get_dashboard_stats():
     cur.execute("SELECT COUNT(*) as count FROM applications")
     total_applications = cur.fetchone()['count']
     
-    cur.execute("SELECT COUNT(DISTINCT student_id) as count FROM applications WHERE status IN ('offered', 'accepted')")
+    cur.execute("SELECT COUNT(*) as count FROM student_placements")
     placed_students = cur.fetchone()['count']
     
     # Recent applications
@@ -798,10 +1789,9 @@ def get_dashboard_stats():
     
     # Placement by department
     cur.execute("""
-        SELECT s.department, COUNT(DISTINCT a.student_id) as placed_count
-        FROM applications a
-        JOIN students s ON a.student_id = s.id
-        WHERE a.status IN ('offered', 'accepted')
+        SELECT s.department, COUNT(*) as placed_count
+        FROM student_placements p
+        JOIN students s ON p.student_id = s.id
         GROUP BY s.department
     """)
     placement_by_dept = cur.fetchall()
@@ -816,48 +1806,87 @@ def get_dashboard_stats():
         'total_applications': total_applications,
         'placed_students': placed_students,
         'placement_percentage': round((placed_students / total_students * 100) if total_students > 0 else 0, 2),
-        'recent_applications': [dict(a) for a in recent_applications],
-        'placement_by_department': [dict(p) for p in placement_by_dept]
+        'recent_applications': recent_applications,
+        'placement_by_department': placement_by_dept
     }), 200
 
 @app.route('/api/admin/students', methods=['GET'])
 @role_required(['admin', 'placement_officer'])
 def get_all_students():
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
     search = request.args.get('search', '')
     department = request.args.get('department', '')
-    
-    query = """
-        SELECT s.*, u.email,
-               COUNT(DISTINCT a.id) as total_applications,
-               COUNT(DISTINCT CASE WHEN a.status IN ('offered', 'accepted') THEN a.id END) as offers_received
-        FROM students s
-        JOIN users u ON s.user_id = u.id
-        LEFT JOIN applications a ON s.id = a.student_id
-        WHERE 1=1
-    """
+    sort = request.args.get('sort', 'id')
+    order = request.args.get('order', 'desc').lower()
+    try:
+        graduation_year = int(request.args['graduation_year']) if request.args.get('graduation_year') else None
+        min_cgpa = float(request.args['min_cgpa']) if request.args.get('min_cgpa') else None
+        max_cgpa = float(request.args['max_cgpa']) if request.args.get('max_cgpa') else None
+        page = max(int(request.args.get('page', 1)), 1)
+        limit = min(max(int(request.args.get('limit', 50)), 1), STUDENT_DIRECTORY_MAX_LIMIT)
+    except ValueError:
+        return jsonify({'error': 'page, limit and graduation_year must be integers; '
+                                 'min_cgpa and max_cgpa must be numbers'}), 400
+    
+    if sort not in STUDENT_DIRECTORY_SORTS or order not in ('asc', 'desc'):
+        return jsonify({'error': 'Invalid sort'}), 400
+    
+    where = "WHERE 1=1"
     params = []
     
     if search:
-        query += " AND (s.first_name ILIKE %s OR s.last_name ILIKE %s OR s.roll_number ILIKE %s)"
+        # Both expressions are backed by trigram GIN indexes
+        where += """ AND ((COALESCE(s.first_name, '') || ' ' || COALESCE(s.last_name, '')) ILIKE %s
+                          OR s.roll_number ILIKE %s)"""
         search_pattern = f'%{search}%'
-        params.extend([search_pattern, search_pattern, search_pattern])
+        params.extend([search_pattern, search_pattern])
     
     if department:
-        query += " AND s.department = %s"
+        where += " AND s.department = %s"
         params.append(department)
     
-    query += " GROUP BY s.id, u.email ORDER BY s.id DESC"
+    if graduation_year is not None:
+        where += " AND s.graduation_year = %s"
+        params.append(graduation_year)
+    
+    if min_cgpa is not None:
+        where += " AND s.current_cgpa >= %s"
+        params.append(min_cgpa)
+    
+    if max_cgpa is not None:
+        where += " AND s.current_cgpa <= %s"
+        params.append(max_cgpa)
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    cur.execute(f"SELECT COUNT(*) as count FROM students s {where}", params)
+    total = cur.fetchone()['count']
+    
+    # Counts come from maintained counters, not a join over applications
+    cur.execute(f"""
+        SELECT s.id, s.user_id, s.first_name, s.last_name, s.roll_number, s.department,
+               s.graduation_year, s.current_cgpa, u.email,
+               s.application_count as total_applications,
+               COALESCE(p.offer_count, 0) as offers_received
+        FROM students s
+        JOIN users u ON s.user_id = u.id
+        LEFT JOIN student_placements p ON p.student_id = s.id
+        {where}
+        ORDER BY {STUDENT_DIRECTORY_SORTS[sort]} {order} NULLS LAST, s.id {order}
+        LIMIT %s OFFSET %s
+    """, params + [limit, (page - 1) * limit])
     
-    cur.execute(query, params)
     students = cur.fetchall()
     
     cur.close()
     conn.close()
     
-    return jsonify({'students': [dict(s) for s in students]}), 200
+    return jsonify({
+        'students': students,
+        'total': total,
+        'page': page,
+        'limit': limit
+    }), 200
 
 @app.route('/api/admin/companies', methods=['GET'])
 @role_required(['admin', 'placement_officer'])
@@ -882,7 +1911,7 @@ def get_all_companies():
     cur.close()
     conn.close()
     
-    return jsonify({'companies': [dict(c) for c in companies]}), 200
+    return jsonify({'companies': companies}), 200
 
 @app.route('/api/admin/companies/<int:company_id>/verify', methods=['PUT'])
 @role_required(['admin'])
@@ -913,50 +1942,61 @@ def get_placement_report():
     conn = get_db_connection()
     cur = conn.cursor()
     
-    # Overall stats
+    # Overall stats; placed counts come from the maintained placement table
     cur.execute("""
-        SELECT 
-            COUNT(DISTINCT s.id) as total_students,
-            COUNT(DISTINCT CASE WHEN a.status IN ('offered', 'accepted') THEN s.id END) as placed_students,
-            AVG(CASE WHEN a.status IN ('offered', 'accepted') AND j.salary_min IS NOT NULL 
-                THEN (j.salary_min + COALESCE(j.salary_max, j.salary_min)) / 2 END) as avg_package,
-            MAX(CASE WHEN a.status IN ('offered', 'accepted') THEN j.salary_max END) as highest_package,
-            MIN(CASE WHEN a.status IN ('offered', 'accepted') THEN j.salary_min END) as lowest_package
+        SELECT
+            COUNT(*) as total_students,
+            COUNT(p.student_id) as placed_students
         FROM students s
-        LEFT JOIN applications a ON s.id = a.student_id
-        LEFT JOIN jobs j ON a.job_id = j.id
+        LEFT JOIN student_placements p ON s.id = p.student_id
         WHERE s.graduation_year = %s
     """, (year,))
     
     stats = cur.fetchone()
     
+    # Packages only need the offered/accepted applications (partial index)
+    cur.execute("""
+        SELECT
+            AVG(CASE WHEN j.salary_min IS NOT NULL
+                THEN (j.salary_min + COALESCE(j.salary_max, j.salary_min)) / 2 END) as avg_package,
+            MAX(j.salary_max) as highest_package,
+            MIN(j.salary_min) as lowest_package
+        FROM applications a
+        JOIN students s ON a.student_id = s.id
+        JOIN jobs j ON a.job_id = j.id
+        WHERE a.status IN ('offered', 'accepted') AND s.graduation_year = %s
+    """, (year,))
+    
+    stats.update(cur.fetchone())
+    
     # Department-wise placement
     cur.execute("""
-        SELECT 
+        SELECT
             s.department,
-            COUNT(DISTINCT s.id) as total_students,
-            COUNT(DISTINCT CASE WHEN a.status IN ('offered', 'accepted') THEN s.id END) as placed_students
+            COUNT(*) as total_students,
+            COUNT(p.student_id) as placed_students
         FROM students s
-        LEFT JOIN applications a ON s.id = a.student_id
+        LEFT JOIN student_placements p ON s.id = p.student_id
         WHERE s.graduation_year = %s
         GROUP BY s.department
     """, (year,))
     
     dept_stats = cur.fetchall()
     
-    # Top recruiting companies
+    # Top recruiting companies for the same graduating year
     cur.execute("""
         SELECT 
             c.company_name,
             COUNT(DISTINCT a.id) as total_offers
         FROM applications a
+        JOIN students s ON a.student_id = s.id
         JOIN jobs j ON a.job_id = j.id
         JOIN companies c ON j.company_id = c.id
-        WHERE a.status IN ('offered', 'accepted')
+        WHERE a.status IN ('offered', 'accepted') AND s.graduation_year = %s
         GROUP BY c.company_name
         ORDER BY total_offers DESC
         LIMIT 10
-    """)
+    """, (year,))
     
     top_companies = cur.fetchall()
     
@@ -964,11 +2004,132 @@ def get_placement_report():
     conn.close()
     
     return jsonify({
-        'stats': dict(stats) if stats else {},
-        'department_wise': [dict(d) for d in dept_stats],
-        'top_companies': [dict(c) for c in top_companies]
+        'stats': stats,
+        'department_wise': dept_stats,
+        'top_companies': top_companies
     }), 200
 
+@app.route('/api/admin/reports/placement-trend', methods=['GET'])
+@role_required(['admin', 'placement_officer'])
+def get_placement_trend():
+    interval = request.args.get('interval', 'week')
+    if interval not in ('day', 'week', 'month', 'year'):
+        return jsonify({'error': 'Invalid interval'}), 400
+    
+    end = request.args.get('to') or (datetime.now() + timedelta(days=1)).date().isoformat()
+    start = request.args.get('from') or (datetime.now() - timedelta(days=365)).date().isoformat()
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    # Newly placed students per period (index range on placed_at)
+    cur.execute("""
+        SELECT date_trunc(%s, placed_at) as period, COUNT(*) as placed_students
+        FROM student_placements
+        WHERE placed_at >= %s AND placed_at < %s
+        GROUP BY 1
+        ORDER BY 1
+    """, (interval, start, end))
+    
+    placements = cur.fetchall()
+    
+    # Offer and accept events per period (partial index on offer events)
+    cur.execute("""
+        SELECT date_trunc(%s, created_at) as period,
+               COUNT(*) FILTER (WHERE to_status = 'offered') as offers,
+               COUNT(*) FILTER (WHERE to_status = 'accepted') as acceptances
+        FROM application_events
+        WHERE to_status IN ('offered', 'accepted')
+          AND created_at >= %s AND created_at < %s
+        GROUP BY 1
+        ORDER BY 1
+    """, (interval, start, end))
+    
+    offers = cur.fetchall()
+    
+    cur.close()
+    conn.close()
+    
+    return jsonify({
+        'interval': interval,
+        'from': start,
+        'to': end,
+        'placements': placements,
+        'offers': offers
+    }), 200
+
+@app.route('/api/admin/reports/placement-cube', methods=['GET'])
+@role_required(['admin', 'placement_officer'])
+def get_placement_cube():
+    try:
+        group_by, filters = reports.parse_slice(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    conn = get_db_connection()
+    cur = conn.cursor()
+    
+    rows = reports.slice_cube(cur, group_by, filters)
+    
+    cur.close()
+    conn.close()
+    
+    return jsonify({'group_by': group_by, 'filters': filters, 'rows': rows}), 200
+
+@app.route('/api/admin/reports/refresh', methods=['POST'])
+@role_required(['admin'])
+def refresh_placement_cubes():
+    # Dedicated connection: the refresh needs autocommit and can run for a
+    # while, so it should not hold a pool slot
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        refreshed = reports.refresh_if_idle(conn)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        conn.close()
+    
+    if not refreshed:
+        return jsonify({'error': 'A refresh is already running'}), 409
+    return jsonify({'message': 'Placement cubes refreshed'}), 200
+
+@app.route('/api/admin/reports/placement-export', methods=['GET'])
+@role_required(['admin', 'placement_officer'])
+def export_placement_report():
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'parquet'):
+        return jsonify({'error': 'format must be csv or parquet'}), 400
+    if export_format == 'parquet' and not reports.parquet_available():
+        return jsonify({'error': 'Parquet export requires pyarrow'}), 501
+    try:
+        _, filters = reports.parse_slice(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    query, params = reports.export_query(filters)
+    
+    def generate():
+        conn = get_db_connection()
+        # Server-side cursor: rows arrive in chunks, never all at once
+        cur = conn.cursor(name='placement_export')
+        try:
+            cur.execute(query, params)
+            if export_format == 'csv':
+                yield from reports.stream_csv(cur)
+            else:
+                yield from reports.stream_parquet(cur)
+        finally:
+            cur.close()
+            conn.close()
+    
+    if export_format == 'csv':
+        mimetype, filename = 'text/csv', 'placements.csv'
+    else:
+        mimetype, filename = 'application/vnd.apache.parquet', 'placements.parquet'
+    
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
 # ==================== NOTIFICATIONS ROUTES ====================
 
 @app.route('/api/notifications', methods=['GET'])
@@ -976,27 +2137,32 @@ def get_placement_report():
 def get_notifications():
     user_id = get_jwt_identity()
     limit = int(request.args.get('limit', 20))
+    # Bounding created_at lets Postgres prune partitions past retention
+    cutoff = retention_cutoff()
     
     conn = get_db_connection()
     cur = conn.cursor()
     
     cur.execute("""
         SELECT * FROM notifications 
-        WHERE user_id = %s 
+        WHERE user_id = %s AND created_at >= %s
         ORDER BY created_at DESC 
         LIMIT %s
-    """, (user_id, limit))
+    """, (user_id, cutoff, limit))
     
     notifications = cur.fetchall()
     
-    cur.execute("SELECT COUNT(*) as count FROM notifications WHERE user_id = %s AND is_read = false", (user_id,))
+    cur.execute("""
+        SELECT COUNT(*) as count FROM notifications
+        WHERE user_id = %s AND is_read = false AND created_at >= %s
+    """, (user_id, cutoff))
     unread_count = cur.fetchone()['count']
     
     cur.close()
     conn.close()
     
     return jsonify({
-        'notifications': [dict(n) for n in notifications],
+        'notifications': notifications,
         'unread_count': unread_count
     }), 200
 
@@ -1009,8 +2175,8 @@ def mark_notification_read(notification_id):
     cur = conn.cursor()
     
     try:
-        cur.execute("UPDATE notifications SET is_read = true WHERE id = %s AND user_id = %s", 
-                   (notification_id, user_id))
+        cur.execute("UPDATE notifications SET is_read = true WHERE id = %s AND user_id = %s AND created_at >= %s", 
+                   (notification_id, user_id, retention_cutoff()))
         conn.commit()
         
         return jsonify({'message': 'Notification marked as read'}), 200
@@ -1030,7 +2196,8 @@ def mark_all_notifications_read():
     cur = conn.cursor()
     
     try:
-        cur.execute("UPDATE notifications SET is_read = true WHERE user_id = %s", (user_id,))
+        cur.execute("UPDATE notifications SET is_read = true WHERE user_id = %s AND is_read = false AND created_at >= %s",
+                   (user_id, retention_cutoff()))
         conn.commit()
         
         return jsonify({'message': 'All notifications marked as read'}), 200
@@ -1058,6 +2225,7 @@ def save_job(job_id):
         cur.execute("INSERT INTO saved_jobs (student_id, job_id) VALUES (%s, %s)", 
                    (student['id'], job_id))
         conn.commit()
+        engagement.record('save', job_id, user_id)
         
         return jsonify({'message': 'Job saved successfully'}), 201
     except Exception as e:
@@ -1072,14 +2240,18 @@ def save_job(job_id):
 def get_saved_jobs():
     user_id = get_jwt_identity()
     
+    columns, error = job_list_columns()
+    if error:
+        return jsonify({'error': error}), 400
+    
     conn = get_db_connection()
     cur = conn.cursor()
     
     cur.execute("SELECT id FROM students WHERE user_id = %s", (user_id,))
     student = cur.fetchone()
     
-    cur.execute("""
-        SELECT j.*, c.company_name, c.company_logo, sj.saved_at
+    cur.execute(f"""
+        SELECT {columns}, sj.saved_at
         FROM saved_jobs sj
         JOIN jobs j ON sj.job_id = j.id
         JOIN companies c ON j.company_id = c.id
@@ -1092,7 +2264,7 @@ def get_saved_jobs():
     cur.close()
     conn.close()
     
-    return jsonify({'saved_jobs': [dict(j) for j in saved_jobs]}), 200
+    return jsonify({'saved_jobs': saved_jobs}), 200
 
 @app.route('/api/jobs/<int:job_id>/unsave', methods=['DELETE'])
 @role_required(['student'])
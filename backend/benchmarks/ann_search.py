@@ -0,0 +1,66 @@
+# backend/benchmarks/ann_search.py
+"""Latency and recall of the job vector index against an exact scan.
+
+Generates clustered unit vectors shaped like LSA job embeddings, builds an
+IVFIndex and compares its top-k with brute force for a set of queries.
+
+    python benchmarks/ann_search.py --jobs 100000 --dimensions 128 --nprobe 8
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from embeddings import IVFIndex, normalize_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ANN index benchmark')
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--dimensions', type=int, default=128)
+    parser.add_argument('--topics', type=int, default=500)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--nprobe', type=int, default=8)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    topics = normalize_rows(rng.normal(size=(args.topics, args.dimensions)).astype(np.float32))
+    
+    def sample(count):
+        noise = 0.1 * rng.normal(size=(count, args.dimensions)).astype(np.float32)
+        return normalize_rows(topics[rng.integers(0, args.topics, count)] + noise)
+    
+    vectors = sample(args.jobs)
+    queries = sample(args.queries)
+    
+    start = time.perf_counter()
+    index = IVFIndex(np.arange(args.jobs), vectors, nprobe=args.nprobe)
+    build = time.perf_counter() - start
+    
+    ann_ms, exact_ms, recall = [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        found = {item_id for item_id, _ in index.search(query, args.k)}
+        ann_ms.append((time.perf_counter() - start) * 1000)
+        
+        start = time.perf_counter()
+        scores = vectors @ query
+        exact = set(np.argpartition(-scores, args.k)[:args.k].tolist())
+        exact_ms.append((time.perf_counter() - start) * 1000)
+        
+        recall.append(len(found & exact) / args.k)
+    
+    print(f"index build:    {build:.2f}s for {args.jobs} x {args.dimensions} float32")
+    print(f"ann search:     median {statistics.median(ann_ms):.3f}ms  p99 {np.percentile(ann_ms, 99):.3f}ms")
+    print(f"exact scan:     median {statistics.median(exact_ms):.3f}ms")
+    print(f"recall@{args.k}:      {statistics.mean(recall):.3f}")
+
+
+if __name__ == '__main__':
+    main()
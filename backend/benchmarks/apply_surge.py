@@ -0,0 +1,146 @@
+# backend/benchmarks/apply_surge.py
+"""Fire thousands of simultaneous applies at one job and check the invariants.
+
+Runs against the local Postgres configured in db.py (with migrations
+applied).  It creates throwaway students, a company and a capped job, sends
+every student's apply (plus retries with the same idempotency key and
+plain duplicate applies) through the Flask app from many threads at once,
+then verifies:
+
+* exactly ``min(cap, students)`` applications exist for the job,
+* ``jobs.application_count`` matches the real row count,
+* no student has more than one application,
+* every idempotent retry got back its original application id.
+
+The test data is deleted afterwards.
+
+    python benchmarks/apply_surge.py --students 2000 --cap 500 --threads 200
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psycopg2
+from flask_jwt_extended import create_access_token
+
+from app import app
+from db import DB_CONFIG
+
+
+def setup(cur, marker, students, cap):
+    cur.execute("""
+        INSERT INTO users (email, password_hash, user_type)
+        VALUES (%s, 'x', 'recruiter') RETURNING id
+    """, (f'{marker}-recruiter@example.com',))
+    recruiter_id = cur.fetchone()[0]
+    cur.execute("INSERT INTO companies (user_id, company_name) VALUES (%s, %s) RETURNING id",
+                (recruiter_id, marker))
+    company_id = cur.fetchone()[0]
+    cur.execute("""
+        INSERT INTO jobs (company_id, job_title, job_description, status, max_applications)
+        VALUES (%s, %s, 'surge test', 'active', %s) RETURNING id
+    """, (company_id, marker, cap))
+    job_id = cur.fetchone()[0]
+    
+    cur.execute("""
+        INSERT INTO users (email, password_hash, user_type)
+        SELECT %s || '-' || n || '@example.com', 'x', 'student'
+        FROM generate_series(1, %s) n
+        RETURNING id
+    """, (marker, students))
+    user_ids = [row[0] for row in cur.fetchall()]
+    cur.execute("""
+        INSERT INTO students (user_id, first_name, last_name)
+        SELECT unnest(%s::int[]), 'Surge', 'Student'
+    """, (user_ids,))
+    return recruiter_id, job_id, user_ids
+
+
+def teardown(cur, marker, recruiter_id, job_id, user_ids):
+    cur.execute("DELETE FROM notifications WHERE user_id = %s", (recruiter_id,))
+    cur.execute("DELETE FROM applications WHERE job_id = %s", (job_id,))
+    cur.execute("DELETE FROM jobs WHERE id = %s", (job_id,))
+    cur.execute("DELETE FROM companies WHERE company_name = %s", (marker,))
+    cur.execute("DELETE FROM students WHERE user_id = ANY(%s)", (user_ids,))
+    cur.execute("DELETE FROM users WHERE id = ANY(%s) OR id = %s", (user_ids, recruiter_id))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent apply surge test')
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--cap', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=200)
+    args = parser.parse_args()
+    
+    marker = f'surge-{uuid.uuid4().hex[:8]}'
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = True
+    cur = conn.cursor()
+    recruiter_id, job_id, user_ids = setup(cur, marker, args.students, args.cap)
+    
+    with app.app_context():
+        tokens = {uid: create_access_token(identity=str(uid)) for uid in user_ids}
+    
+    # Every student applies once with a key, retries with the same key,
+    # and half of them also send a duplicate without a key
+    calls = []
+    for uid in user_ids:
+        key = uuid.uuid4().hex
+        calls.append((uid, key))
+        calls.append((uid, key))
+        if uid % 2:
+            calls.append((uid, None))
+    
+    def apply(call):
+        uid, key = call
+        headers = {'Authorization': f'Bearer {tokens[uid]}'}
+        if key:
+            headers['Idempotency-Key'] = key
+        with app.test_client() as client:
+            response = client.post('/api/applications/apply', json={'job_id': job_id}, headers=headers)
+        return uid, key, response.status_code, (response.get_json() or {}).get('application_id')
+    
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(apply, calls))
+        elapsed = time.perf_counter() - start
+        
+        statuses = Counter(status for _, _, status, _ in results)
+        keyed_ids = {}
+        replay_mismatches = 0
+        for uid, key, status, application_id in results:
+            if key and application_id is not None:
+                if keyed_ids.setdefault((uid, key), application_id) != application_id:
+                    replay_mismatches += 1
+        
+        cur.execute("SELECT COUNT(*), COUNT(DISTINCT student_id) FROM applications WHERE job_id = %s", (job_id,))
+        rows, distinct_students = cur.fetchone()
+        cur.execute("SELECT application_count FROM jobs WHERE id = %s", (job_id,))
+        counter = cur.fetchone()[0]
+        
+        expected = min(args.cap, args.students)
+        print(f"requests:            {len(calls)} in {elapsed:.2f}s ({len(calls) / elapsed:.0f} req/s)")
+        print(f"status codes:        {dict(sorted(statuses.items()))}")
+        print(f"applications:        {rows} (expected {expected})")
+        print(f"job counter:         {counter}")
+        print(f"replay mismatches:   {replay_mismatches}")
+        
+        ok = (rows == expected and distinct_students == rows and counter == rows
+              and replay_mismatches == 0 and 500 not in statuses)
+        print('PASS' if ok else 'FAIL')
+        return 0 if ok else 1
+    finally:
+        teardown(cur, marker, recruiter_id, job_id, user_ids)
+        cur.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
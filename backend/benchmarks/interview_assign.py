@@ -0,0 +1,73 @@
+# backend/benchmarks/interview_assign.py
+"""Time scheduling.auto_assign on a synthetic interview drive.
+
+Builds a day of slots across several panels and candidates with random
+availability windows and existing interviews, runs the assignment and
+checks that no candidate got a slot outside their availability or
+overlapping another interview.
+
+    python benchmarks/interview_assign.py --candidates 500 --panels 12
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scheduling
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Interview auto-assignment benchmark')
+    parser.add_argument('--candidates', type=int, default=500)
+    parser.add_argument('--panels', type=int, default=12)
+    parser.add_argument('--duration', type=int, default=20, help='slot length in minutes')
+    parser.add_argument('--hours', type=int, default=8)
+    args = parser.parse_args()
+    
+    random.seed(0)
+    day = datetime(2030, 1, 7, 9, tzinfo=timezone.utc)
+    generated = scheduling.generate_slots(day, day + timedelta(hours=args.hours), args.duration,
+                                          panels=[f'Panel {n}' for n in range(1, args.panels + 1)])
+    slots = [(slot_id, start, end) for slot_id, (_, start, end) in enumerate(generated)]
+    
+    candidates = []
+    for application_id in range(args.candidates):
+        windows = []
+        # A third of the candidates set no availability at all
+        if application_id % 3:
+            for _ in range(random.randint(1, 3)):
+                start = day + timedelta(minutes=30 * random.randint(0, args.hours * 2 - 2))
+                windows.append((start, start + timedelta(hours=random.randint(1, 3))))
+        busy_start = day + timedelta(minutes=30 * random.randint(0, args.hours * 2))
+        candidates.append({
+            'application_id': application_id,
+            'availability': scheduling.IntervalSet(windows),
+            'busy': scheduling.IntervalSet([(busy_start, busy_start + timedelta(minutes=45))]),
+        })
+    
+    start = time.perf_counter()
+    assignments, unassigned = scheduling.auto_assign(slots, candidates)
+    elapsed = time.perf_counter() - start
+    
+    slot_times = {slot_id: (s, e) for slot_id, s, e in slots}
+    by_id = {c['application_id']: c for c in candidates}
+    ok = len({slot_id for _, slot_id in assignments}) == len(assignments)
+    for application_id, slot_id in assignments:
+        s, e = slot_times[slot_id]
+        candidate = by_id[application_id]
+        ok = ok and not candidate['busy'].overlaps(s, e)
+        ok = ok and (not candidate['availability'] or candidate['availability'].covers(s, e))
+    
+    print(f"slots:        {len(slots)}")
+    print(f"assigned:     {len(assignments)} / {args.candidates} ({len(unassigned)} unassigned)")
+    print(f"elapsed:      {elapsed * 1000:.1f}ms")
+    print('PASS' if ok else 'FAIL')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# backend/benchmarks/json_encoding.py
+"""Compare JSON encoding of a 10k-row applicant list.
+
+Builds rows shaped like get_job_applications output (RealDictRow with
+datetime and Decimal columns) and times:
+
+* the old path: ``[dict(r) for r in rows]`` + Flask's default provider
+* the new path: rows passed straight to FastJSONProvider
+
+    python benchmarks/json_encoding.py --rows 10000 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from psycopg2.extras import RealDictRow
+
+import json_provider
+
+
+def make_rows(count):
+    base = datetime(2025, 1, 1, 9, 30)
+    rows = []
+    for i in range(count):
+        row = RealDictRow()
+        row.update({
+            'id': i,
+            'job_id': 42,
+            'student_id': 1000 + i,
+            'status': 'applied',
+            'cover_letter': 'I am excited to apply for this role. ' * 4,
+            'resume_url': f'https://example.com/resumes/{i}.pdf',
+            'applied_at': base + timedelta(minutes=i),
+            'first_name': 'Student',
+            'last_name': f'Number{i}',
+            'student_email': f'student{i}@example.com',
+            'phone': '9999999999',
+            'department': 'Computer Science',
+            'current_cgpa': Decimal('8.25'),
+            'graduation_year': 2026,
+            'linkedin_url': f'https://linkedin.com/in/student{i}',
+        })
+        rows.append(row)
+    return rows
+
+
+def timed(fn, repeat):
+    samples = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON encoding benchmark')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    fast = json_provider.FastJSONProvider(app)
+    rows = make_rows(args.rows)
+    
+    with app.app_context():
+        old_ms, old_size = timed(
+            lambda: default.response({'applications': [dict(r) for r in rows]}).get_data(), args.repeat)
+        new_ms, new_size = timed(
+            lambda: fast.response({'applications': rows}).get_data(), args.repeat)
+    
+    backend = 'orjson' if json_provider.orjson is not None else 'stdlib'
+    print(f"rows:                 {args.rows}")
+    print(f"default provider:     {old_ms:8.1f} ms  {old_size / 1024:8.0f} KiB")
+    print(f"fast provider ({backend}): {new_ms:6.1f} ms  {new_size / 1024:8.0f} KiB")
+    print(f"speedup:              {old_ms / new_ms:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# backend/benchmarks/startup.py
+"""Measure the cost of spawning a worker: import time and resident memory.
+
+Each measurement runs in a fresh interpreter so module caches do not leak
+between runs.
+
+    python benchmarks/startup.py            # app import only
+    python benchmarks/startup.py --warm     # app import + AI warm-up
+    python benchmarks/startup.py --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import resource, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+if {warm}:
+    start = time.perf_counter()
+    import ai
+    ai.warm_up()
+    warm = time.perf_counter() - start
+else:
+    warm = 0.0
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+sklearn_loaded = 'sklearn' in sys.modules
+print(elapsed, warm, rss_kb, int(sklearn_loaded))
+"""
+
+
+def run_once(warm):
+    out = subprocess.check_output(
+        [sys.executable, '-c', PROBE.format(warm=warm)],
+        cwd=BACKEND_DIR,
+        env={**os.environ, 'AI_PREWARM': '0'},
+    )
+    elapsed, warm_time, rss_kb, sklearn_loaded = out.split()
+    return float(elapsed), float(warm_time), int(rss_kb), sklearn_loaded == b'1'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--warm', action='store_true', help='also time ai.warm_up()')
+    args = parser.parse_args()
+    
+    results = [run_once(args.warm) for _ in range(args.runs)]
+    imports = [r[0] * 1000 for r in results]
+    warms = [r[1] * 1000 for r in results]
+    rss = [r[2] / 1024 for r in results]
+    
+    print(f"runs:              {args.runs}")
+    print(f"import app (ms):   median {statistics.median(imports):.1f}  max {max(imports):.1f}")
+    if args.warm:
+        print(f"ai.warm_up (ms):   median {statistics.median(warms):.1f}  max {max(warms):.1f}")
+    print(f"max RSS (MB):      median {statistics.median(rss):.1f}")
+    print(f"sklearn imported:  {results[-1][3]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# backend/cache.py
+"""Small in-process TTL cache for derived read data (facet counts etc.).
+
+The cache lives in each worker process, so ``invalidate()`` only clears
+this worker's entries.  Data written elsewhere should be keyed by a shared
+version, e.g. the ``cache_versions`` counters (migration 011).  A write then
+changes the key in every worker, and old entries simply age out after
+``ttl``.
+"""
+import threading
+import time
+
+
+class TTLCache:
+    def __init__(self, ttl=60, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        return value
+    
+    def set(self, key, value):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+    
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,57 @@
+# backend/compression.py
+"""gzip / brotli compression for large API responses.
+
+Responses above ``COMPRESS_MIN_BYTES`` are compressed when the client
+advertises support.  Brotli is used when the optional ``brotli`` package is
+installed, gzip otherwise.  Small payloads are left alone: compressing a
+few hundred bytes costs more CPU than it saves on the wire.
+"""
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+_COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+
+def _accepts(encoding):
+    # Werkzeug parses the q-values, so "gzip;q=0" counts as a refusal
+    return request.accept_encodings.quality(encoding) > 0
+
+
+def compress_response(response):
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code >= 300
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(_COMPRESSIBLE_TYPES)):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    
+    if brotli is not None and _accepts('br'):
+        body, encoding = brotli.compress(data, quality=BROTLI_QUALITY), 'br'
+    elif _accepts('gzip'):
+        body, encoding = gzip.compress(data, compresslevel=GZIP_LEVEL), 'gzip'
+    else:
+        return response
+    
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    response.headers['Content-Length'] = len(body)
+    return response
+
+
+def init_app(app):
+    app.after_request(compress_response)
@@ -0,0 +1,326 @@
+# backend/db.py
+"""Pooled database connections with primary / read-replica routing.
+
+``get_db_connection()`` hands out a pooled connection.  Handlers keep their
+usual ``conn.close()`` at the end; for pooled connections that returns the
+connection to its pool instead of closing the socket.
+
+Routing rules:
+
+* Endpoints in ``REPLICA_ROUTES`` read from the replica when one is
+  configured (``REPLICA_DB_HOST``); everything else goes to the primary.
+* Read-your-writes: after a user commits on the primary, that user's reads
+  stay on the primary for ``REPLICA_STICKY_SECONDS``.  The window is kept
+  per process, so deployments with several workers should either route a
+  user to the same worker or keep the window above the expected lag.
+* When the replica reports more than ``REPLICA_MAX_LAG_SECONDS`` of replay
+  lag, or cannot be reached, reads fall back to the primary.  The lag is
+  probed on a background thread, so an unreachable replica never blocks a
+  request; replica connections also use short connect and statement
+  timeouts (``REPLICA_CONNECT_TIMEOUT``, ``REPLICA_STATEMENT_TIMEOUT_MS``).
+"""
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from flask import g, has_app_context, has_request_context, request
+
+import profiling
+
+# Database configuration
+DB_CONFIG = {
+    'host': 'localhost',
+    'database': 'placemate',
+    'user': 'postgres',
+    'password': 'Ichigo_bankai24'
+}
+
+REPLICA_DB_CONFIG = {
+    **DB_CONFIG,
+    'host': os.environ.get('REPLICA_DB_HOST'),
+    'port': int(os.environ.get('REPLICA_DB_PORT', 5432)),
+    'connect_timeout': int(os.environ.get('REPLICA_CONNECT_TIMEOUT', 2)),
+    'options': f"-c statement_timeout={int(os.environ.get('REPLICA_STATEMENT_TIMEOUT_MS', 30000))}",
+} if os.environ.get('REPLICA_DB_HOST') else None
+
+POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+POOL_MAX = int(os.environ.get('DB_POOL_MAX', 20))
+POOL_TIMEOUT_SECONDS = float(os.environ.get('DB_POOL_TIMEOUT_SECONDS', 5))
+REPLICA_STICKY_SECONDS = float(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 2))
+REPLICA_LAG_CHECK_SECONDS = float(os.environ.get('REPLICA_LAG_CHECK_SECONDS', 1))
+
+# Read-only endpoints whose queries may be served by the replica
+REPLICA_ROUTES = {
+    'get_dashboard_stats',
+    'get_all_students',
+    'get_all_companies',
+    'get_placement_report',
+    'get_placement_trend',
+    'get_placement_cube',
+    'export_placement_report',
+    'search_jobs',
+    'get_job_detail',
+    'get_my_applications',
+    'get_saved_jobs',
+    'get_notifications',
+    'get_recruiter_jobs',
+    'get_job_applications',
+    'get_student_dashboard',
+    'get_semantic_recommendations',
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+_last_write = {}
+_replica_state = {'lag': None, 'checked_at': 0.0, 'healthy': True, 'probing': False}
+_replica_lock = threading.Lock()
+
+
+class BlockingPool:
+    """ThreadedConnectionPool that waits for a free connection.
+    
+    psycopg2's pool raises as soon as ``maxconn`` connections are out; under
+    a burst of requests callers should queue briefly instead.
+    """
+    
+    def __init__(self, minconn, maxconn, **kwargs):
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **kwargs)
+        self._slots = threading.BoundedSemaphore(maxconn)
+    
+    def getconn(self, timeout=POOL_TIMEOUT_SECONDS):
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolError('connection pool exhausted')
+        try:
+            return self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+    
+    def putconn(self, conn, close=False):
+        try:
+            self._pool.putconn(conn, close=close)
+        finally:
+            self._slots.release()
+
+
+class ProfiledCursor(RealDictCursor):
+    """RealDictCursor whose query and fetch calls count as DB time when the
+    request is being profiled (see profiling.py)."""
+    
+    def execute(self, query, vars=None):
+        with profiling.phase('db'):
+            return super().execute(query, vars)
+    
+    def executemany(self, query, vars_list):
+        with profiling.phase('db'):
+            return super().executemany(query, vars_list)
+    
+    def fetchone(self):
+        with profiling.phase('db'):
+            return super().fetchone()
+    
+    def fetchmany(self, size=None):
+        with profiling.phase('db'):
+            return super().fetchmany(size)
+    
+    def fetchall(self):
+        with profiling.phase('db'):
+            return super().fetchall()
+
+
+class PooledConnection:
+    """Proxy over a pooled psycopg2 connection.
+    
+    ``close()`` rolls back anything uncommitted and returns the connection
+    to its pool; ``commit()`` on the primary starts the read-your-writes
+    window for the current user.
+    """
+    
+    def __init__(self, pool, raw, role):
+        self._pool = pool
+        self._raw = raw
+        self.role = role
+        self.closed_by_caller = False
+    
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+    
+    def commit(self):
+        self._raw.commit()
+        if self.role == 'primary':
+            _mark_write()
+    
+    def close(self):
+        if self.closed_by_caller:
+            return
+        self.closed_by_caller = True
+        broken = self._raw.closed != 0
+        if not broken:
+            try:
+                self._raw.rollback()
+            except psycopg2.Error:
+                broken = True
+        self._pool.putconn(self._raw, close=broken)
+
+
+def _get_pool(role):
+    pool = _pools.get(role)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(role)
+            if pool is None:
+                config = DB_CONFIG if role == 'primary' else REPLICA_DB_CONFIG
+                pool = BlockingPool(POOL_MIN, POOL_MAX, cursor_factory=ProfiledCursor, **config)
+                _pools[role] = pool
+    return pool
+
+
+def _current_user():
+    if not has_request_context():
+        return None
+    try:
+        from flask_jwt_extended import get_jwt_identity
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def _mark_write():
+    user_id = _current_user()
+    if user_id is not None:
+        now = time.monotonic()
+        if len(_last_write) > 10000:
+            for key, written_at in list(_last_write.items()):
+                if now - written_at > REPLICA_STICKY_SECONDS:
+                    _last_write.pop(key, None)
+        _last_write[user_id] = now
+
+
+def _recently_wrote(user_id):
+    written_at = _last_write.get(user_id)
+    if written_at is None:
+        return False
+    if time.monotonic() - written_at > REPLICA_STICKY_SECONDS:
+        _last_write.pop(user_id, None)
+        return False
+    return True
+
+
+def replica_lag():
+    """Replica replay lag in seconds, or None when unreachable or not yet known.
+    
+    Returns the cached value at once.  When it is older than
+    ``REPLICA_LAG_CHECK_SECONDS`` a probe is started on a background thread
+    (at most one at a time) and the next callers see its result.
+    """
+    now = time.monotonic()
+    with _replica_lock:
+        stale = (now - _replica_state['checked_at'] >= REPLICA_LAG_CHECK_SECONDS
+                 and not _replica_state['probing'])
+        if stale:
+            _replica_state['probing'] = True
+            _replica_state['checked_at'] = now
+        lag = _replica_state['lag']
+    if stale:
+        threading.Thread(target=_probe_replica, name='replica-lag', daemon=True).start()
+    return lag
+
+
+def _probe_replica():
+    lag = None
+    try:
+        pool = _get_pool('replica')
+        raw = pool.getconn()
+        try:
+            cur = raw.cursor()
+            cur.execute("""
+                SELECT CASE
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                END AS lag
+            """)
+            lag = float(cur.fetchone()['lag'] or 0)
+            cur.close()
+            raw.rollback()
+            pool.putconn(raw)
+        except psycopg2.Error:
+            pool.putconn(raw, close=True)
+            raise
+    except Exception:
+        # Unreachable or broken replica: reads go to the primary
+        lag = None
+    
+    with _replica_lock:
+        _replica_state['lag'] = lag
+        _replica_state['healthy'] = lag is not None
+        _replica_state['probing'] = False
+        _replica_state['checked_at'] = time.monotonic()
+    return lag
+
+
+def _use_replica():
+    if REPLICA_DB_CONFIG is None or not has_request_context():
+        return False
+    if request.endpoint not in REPLICA_ROUTES:
+        return False
+    user_id = _current_user()
+    if user_id is not None and _recently_wrote(user_id):
+        return False
+    return _replica_fresh()
+
+
+def request_prefers_replica():
+    """Routing decision for the current request, to pass as ``readonly``
+    when its queries are handed to worker threads (which have no request
+    context of their own)."""
+    return _use_replica()
+
+
+def _replica_fresh():
+    lag = replica_lag()
+    return lag is not None and lag <= REPLICA_MAX_LAG_SECONDS
+
+
+def get_db_connection(readonly=None):
+    """Check out a pooled connection.
+    
+    ``readonly=None`` applies the per-route rules, ``False`` forces the
+    primary and ``True`` prefers the replica when it is healthy.
+    """
+    if readonly is None:
+        use_replica = _use_replica()
+    elif readonly:
+        use_replica = REPLICA_DB_CONFIG is not None and _replica_fresh()
+    else:
+        use_replica = False
+    
+    role = 'replica' if use_replica else 'primary'
+    pool = _get_pool(role)
+    with profiling.phase('db'):
+        raw = pool.getconn()
+    if role == 'replica':
+        raw.readonly = True
+    conn = PooledConnection(pool, raw, role)
+    
+    if has_app_context():
+        g.setdefault('db_connections', []).append(conn)
+    return conn
+
+
+def release_request_connections(exc=None):
+    """Return any connection a handler forgot to close (teardown hook)."""
+    for conn in g.pop('db_connections', []):
+        conn.close()
+
+
+def routing_stats():
+    return {
+        'replica_configured': REPLICA_DB_CONFIG is not None,
+        'replica_lag_seconds': _replica_state['lag'],
+        'replica_healthy': _replica_state['healthy'],
+        'sticky_users': len(_last_write),
+    }
@@ -0,0 +1,293 @@
+# backend/dedupe.py
+"""Near-duplicate job detection with MinHash signatures and LSH banding.
+
+Each job's title + description is reduced to word 3-gram shingles and a
+128-value MinHash signature; the fraction of equal signature values
+estimates the Jaccard similarity of two postings.  The signature is split
+into 16 bands of 8 values, and each band is hashed into
+``job_lsh_bands``.  Two postings land in the same bucket of at least one
+band with high probability once their similarity passes ~0.7, so looking up
+the new job's 16 (band, bucket) keys finds the candidates through the
+primary key index, without comparing against the whole catalog.
+
+A flagged posting stays hidden from listings only while the posting it
+repeats is still active (``VISIBLE_SQL``); once that one closes, the
+repost shows up again.
+
+Signatures are computed with NumPy, so the web app computes them for new
+postings in the ML process pool (``MLService.signature``) and gets plain
+bytes back; comparing and banding signatures needs only the standard
+library.  Signatures for existing jobs are computed in bulk across a
+process pool:
+    
+    python dedupe.py backfill --workers 4
+    python dedupe.py backfill --workers 4 --flag   # also mark duplicates
+"""
+import argparse
+import hashlib
+import os
+import re
+import zlib
+from array import array
+
+NUM_PERM = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = float(os.environ.get('DUPLICATE_THRESHOLD', 0.8))
+# flag_existing skips buckets shared by more postings than this (boilerplate
+# text); real duplicates still meet in one of their other bands
+MAX_BUCKET_SIZE = 50
+
+# Filter for jobs aliased as ``j``: not a repost of a still-active posting
+VISIBLE_SQL = "NOT EXISTS (SELECT 1 FROM jobs o WHERE o.id = j.duplicate_of AND o.status = 'active')"
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WORD_RE = re.compile(r'\w+')
+
+_permutations = None
+
+
+def _hash_params():
+    """Fixed (a, b) pairs so every process computes the same signatures."""
+    global _permutations
+    if _permutations is None:
+        import numpy as np
+        rng = np.random.default_rng(20240601)
+        _permutations = (rng.integers(1, _MERSENNE_PRIME, NUM_PERM, dtype=np.uint64),
+                         rng.integers(0, _MERSENNE_PRIME, NUM_PERM, dtype=np.uint64))
+    return _permutations
+
+
+def shingles(title, description):
+    words = _WORD_RE.findall(f"{title or ''} {description or ''}".lower())
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(title, description):
+    """MinHash signature as a uint32 array, or None for an empty posting."""
+    import numpy as np
+    grams = shingles(title, description)
+    if not grams:
+        return None
+    a, b = _hash_params()
+    x = np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+    x %= _MERSENNE_PRIME
+    # (a*x + b) mod p stays below 2**62, so uint64 never overflows
+    hashed = (a[:, None] * x[None, :] + b[:, None]) % _MERSENNE_PRIME
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def signature_bytes(title, description):
+    """``signature`` as raw bytes (picklable, no NumPy needed to read it)."""
+    sig = signature(title, description)
+    return None if sig is None else sig.tobytes()
+
+
+def band_keys(sig):
+    """(band, bucket) pairs for a signature; bucket is a signed 64-bit hash."""
+    keys = []
+    for band in range(BANDS):
+        chunk = sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        bucket = int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), 'big', signed=True)
+        keys.append((band, bucket))
+    return keys
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def from_bytes(data):
+    """A stored signature as an ``array('I')`` of uint32 values."""
+    values = array('I')
+    values.frombytes(bytes(data))
+    return values
+
+
+def find_duplicates(cur, sig, company_id, exclude_id=None):
+    """Active postings by the same company whose estimated similarity to
+    ``sig`` reaches DUPLICATE_THRESHOLD, best first, as (job_id, similarity).
+    
+    A match that is itself a repost of an active posting is reported as
+    that original, so new duplicates never point at another duplicate.
+    """
+    bands, buckets = zip(*band_keys(sig))
+    cur.execute("""
+        SELECT COALESCE(o.id, j.id) as id, s.signature
+        FROM (
+            SELECT DISTINCT b.job_id
+            FROM job_lsh_bands b
+            JOIN unnest(%s::smallint[], %s::bigint[]) k(band, bucket)
+              ON b.band = k.band AND b.bucket = k.bucket
+        ) candidates
+        JOIN jobs j ON j.id = candidates.job_id
+        JOIN job_signatures s ON s.job_id = j.id
+        LEFT JOIN jobs o ON o.id = j.duplicate_of AND o.status = 'active'
+        WHERE j.company_id = %s AND j.status = 'active'
+          AND j.id IS DISTINCT FROM %s
+    """, (list(bands), list(buckets), company_id, exclude_id))
+    
+    best = {}
+    for row in cur.fetchall():
+        score = similarity(sig, from_bytes(row['signature']))
+        if score >= DUPLICATE_THRESHOLD and row['id'] != exclude_id:
+            best[row['id']] = max(best.get(row['id'], 0), round(score, 3))
+    return sorted(best.items(), key=lambda m: m[1], reverse=True)
+
+
+def store_signatures(cur, rows):
+    """Write signatures and band keys for ``(job_id, signature)`` rows."""
+    from psycopg2.extras import execute_values
+    job_ids = [job_id for job_id, _ in rows]
+    cur.execute("DELETE FROM job_lsh_bands WHERE job_id = ANY(%s)", (job_ids,))
+    execute_values(cur, """
+        INSERT INTO job_signatures (job_id, signature) VALUES %s
+        ON CONFLICT (job_id) DO UPDATE SET signature = EXCLUDED.signature
+    """, [(job_id, sig.tobytes()) for job_id, sig in rows])
+    execute_values(cur, """
+        INSERT INTO job_lsh_bands (band, bucket, job_id) VALUES %s
+        ON CONFLICT DO NOTHING
+    """, [(band, bucket, job_id) for job_id, sig in rows for band, bucket in band_keys(sig)],
+        page_size=2000)
+
+
+def _signature_chunk(rows):
+    """Process pool worker: signatures for (job_id, title, description) rows."""
+    results = []
+    for job_id, title, description in rows:
+        sig = signature(title, description)
+        if sig is not None:
+            results.append((job_id, sig))
+    return results
+
+
+def backfill(conn, workers=None, chunk_size=1000):
+    """Compute signatures for every job; returns the number stored.
+    
+    At most ``2 * workers`` chunks are in flight, so memory stays bounded
+    however large the jobs table is.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 1
+    
+    def chunks():
+        # WITH HOLD keeps the server-side cursor open across the commits
+        # made for each chunk below
+        read = conn.cursor(name='dedupe_backfill', withhold=True)
+        read.itersize = chunk_size
+        read.execute("SELECT id, job_title, job_description FROM jobs ORDER BY id")
+        while True:
+            rows = read.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+        read.close()
+    
+    cur = conn.cursor()
+    stored = 0
+    pending = deque()
+    
+    def store_oldest():
+        results = pending.popleft().result()
+        if results:
+            store_signatures(cur, results)
+            conn.commit()
+        return len(results)
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks():
+            pending.append(pool.submit(_signature_chunk, chunk))
+            if len(pending) >= workers * 2:
+                stored += store_oldest()
+        while pending:
+            stored += store_oldest()
+    cur.close()
+    return stored
+
+
+def flag_existing(conn):
+    """Mark older-first duplicates among stored signatures; returns pairs flagged.
+    
+    Candidate pairs come from shared LSH buckets within the same company,
+    skipping buckets with more than MAX_BUCKET_SIZE postings so the
+    self-join stays linear.  Each later posting points at the root of the
+    earliest posting it duplicates, following links already stored in
+    ``duplicate_of``.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT id, duplicate_of FROM jobs WHERE duplicate_of IS NOT NULL")
+    existing = dict(cur.fetchall())
+    
+    cur.execute("""
+        SELECT p.later, p.earlier, sa.signature, sb.signature
+        FROM (
+            SELECT DISTINCT a.job_id as later, b.job_id as earlier
+            FROM (
+                SELECT band, bucket FROM job_lsh_bands
+                GROUP BY band, bucket
+                HAVING COUNT(*) BETWEEN 2 AND %s
+            ) k
+            JOIN job_lsh_bands a ON a.band = k.band AND a.bucket = k.bucket
+            JOIN job_lsh_bands b
+              ON b.band = k.band AND b.bucket = k.bucket AND a.job_id > b.job_id
+        ) p
+        JOIN jobs ja ON ja.id = p.later
+        JOIN jobs jb ON jb.id = p.earlier
+        JOIN job_signatures sa ON sa.job_id = p.later
+        JOIN job_signatures sb ON sb.job_id = p.earlier
+        WHERE ja.company_id = jb.company_id AND ja.duplicate_of IS NULL
+    """, (MAX_BUCKET_SIZE,))
+    originals = {}
+    for later, earlier, sig_later, sig_earlier in cur.fetchall():
+        if similarity(from_bytes(sig_later), from_bytes(sig_earlier)) >= DUPLICATE_THRESHOLD:
+            originals[later] = min(originals.get(later, earlier), earlier)
+    
+    links = {**existing, **originals}
+    
+    # Point at the root posting, never at another duplicate
+    def root(job_id):
+        seen = {job_id}
+        while job_id in links and links[job_id] not in seen:
+            job_id = links[job_id]
+            seen.add(job_id)
+        return job_id
+    
+    pairs = [(root(job_id), job_id) for job_id in originals]
+    if pairs:
+        from psycopg2.extras import execute_values
+        execute_values(cur, """
+            UPDATE jobs j SET duplicate_of = v.original
+            FROM (VALUES %s) v(original, job_id)
+            WHERE j.id = v.job_id
+        """, pairs)
+    conn.commit()
+    cur.close()
+    return len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Near-duplicate job detection')
+    sub = parser.add_subparsers(dest='command', required=True)
+    backfill_cmd = sub.add_parser('backfill', help='compute signatures for all jobs')
+    backfill_cmd.add_argument('--workers', type=int, default=None)
+    backfill_cmd.add_argument('--chunk-size', type=int, default=1000)
+    backfill_cmd.add_argument('--flag', action='store_true', help='mark existing duplicates afterwards')
+    args = parser.parse_args()
+    
+    import psycopg2
+    from db import DB_CONFIG
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        print(f"stored {backfill(conn, args.workers, args.chunk_size)} signatures")
+        if args.flag:
+            print(f"flagged {flag_existing(conn)} duplicate postings")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,441 @@
+# backend/embeddings.py
+"""LSA embeddings for semantic job matching.
+
+An offline job fits TF-IDF + TruncatedSVD over the job and student profile
+corpus and saves the result as plain float32 arrays (no pickled estimators):
+    
+    python embeddings.py train --dimensions 128    # fit, save, re-embed jobs
+    python embeddings.py index                     # re-embed jobs only
+
+Related skills ("django" / "flask") load on the same latent dimensions, so
+cosine similarity between embeddings matches documents that share no exact
+words.  Job vectors are stored in ``job_embeddings`` and served from an
+in-memory IVF index (spherical k-means buckets, a few probed per query), so
+a lookup scores a few hundred vectors instead of the whole catalog.
+Everything runs locally on CPU.
+
+NumPy and scikit-learn are imported on first use, as in ai.py.
+"""
+import argparse
+import logging
+import os
+import threading
+from datetime import datetime
+
+from dedupe import VISIBLE_SQL
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = os.environ.get('EMBEDDING_MODEL_PATH',
+                            os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'lsa.npz'))
+INDEX_TTL_SECONDS = float(os.environ.get('EMBEDDING_INDEX_TTL', 300))
+DEFAULT_DIMENSIONS = 128
+
+# Below this many vectors an exact scan is faster than probing buckets
+EXACT_SEARCH_MAX = 4096
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+
+# Tokenisation shared by training and inference; keeps tokens like c++ / c#
+_TOKEN_PATTERN = r'(?u)\b\w[\w+#.]*'
+
+# Text a job is embedded from
+JOB_TEXT_SQL = """CONCAT_WS(' ', j.job_title, j.required_skills, j.preferred_skills,
+                            j.job_description, j.qualifications, j.responsibilities)"""
+
+# Text a student is embedded from: skills, department and about_me
+STUDENT_TEXT_SQL = """CONCAT_WS(' ', s.department,
+            (SELECT string_agg(sk.skill_name, ' ') FROM student_skills sk WHERE sk.student_id = s.id),
+            s.about_me)"""
+
+
+class EmbeddingModel:
+    """TF-IDF vocabulary + IDF weights and the SVD projection, all float32."""
+    
+    def __init__(self, terms, idf, components, version):
+        from sklearn.feature_extraction.text import CountVectorizer
+        self.terms = list(terms)
+        self.idf = idf
+        self.components = components
+        self.version = str(version)
+        self._counter = CountVectorizer(vocabulary={t: i for i, t in enumerate(self.terms)},
+                                        token_pattern=_TOKEN_PATTERN, lowercase=True)
+    
+    @property
+    def dimensions(self):
+        return self.components.shape[0]
+    
+    def embed(self, texts):
+        """Unit-length float32 vectors, one row per text."""
+        import numpy as np
+        counts = self._counter.transform([t or '' for t in texts]).astype(np.float32)
+        # Same weighting as training: sublinear tf, idf, l2 normalise
+        counts.data = 1 + np.log(counts.data)
+        tfidf = counts.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        tfidf = tfidf.multiply((1 / np.maximum(norms, 1e-12)).reshape(-1, 1)).tocsr()
+        vectors = np.asarray(tfidf @ self.components.T, dtype=np.float32)
+        return normalize_rows(vectors)
+    
+    def save(self, path=MODEL_PATH):
+        import numpy as np
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp.npz'
+        np.savez_compressed(tmp, terms=np.array(self.terms), idf=self.idf,
+                            components=self.components, version=np.array(self.version))
+        os.replace(tmp, path)
+    
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        import numpy as np
+        with np.load(path) as data:
+            return cls(data['terms'].tolist(), data['idf'], data['components'], data['version'].item())
+
+
+def normalize_rows(vectors):
+    import numpy as np
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def train(documents, dimensions=DEFAULT_DIMENSIONS, max_features=50000):
+    """Fit the TF-IDF + TruncatedSVD model on a list of texts."""
+    import numpy as np
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    
+    vectorizer = TfidfVectorizer(token_pattern=_TOKEN_PATTERN, stop_words='english',
+                                 sublinear_tf=True, min_df=2, max_features=max_features)
+    tfidf = vectorizer.fit_transform(documents)
+    dimensions = min(dimensions, tfidf.shape[1] - 1)
+    svd = TruncatedSVD(n_components=dimensions, algorithm='randomized', random_state=0)
+    svd.fit(tfidf)
+    
+    return EmbeddingModel(vectorizer.get_feature_names_out(),
+                          vectorizer.idf_.astype(np.float32),
+                          svd.components_.astype(np.float32),
+                          datetime.now().strftime('%Y%m%d%H%M%S'))
+
+
+class IVFIndex:
+    """Approximate nearest neighbours over unit vectors (inner product).
+    
+    Vectors are bucketed by spherical k-means; a query scores only the
+    members of its ``nprobe`` closest buckets.  Small indexes skip the
+    clustering and scan everything.  Removed ids are masked until the next
+    rebuild; added vectors go to a small side list that is always scanned.
+    """
+    
+    def __init__(self, ids, vectors, nprobe=DEFAULT_NPROBE, seed=0):
+        import numpy as np
+        self.nprobe = nprobe
+        self._removed = set()
+        self._extra_ids = []
+        self._extra_vectors = []
+        
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(ids) <= EXACT_SEARCH_MAX:
+            self.ids, self.vectors = ids, vectors
+            self.centroids, self.offsets = None, None
+            return
+        
+        nlist = int(np.sqrt(len(ids)))
+        rng = np.random.default_rng(seed)
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            filled = np.linalg.norm(sums, axis=1) > 0
+            centroids[filled] = normalize_rows(sums[filled])
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        
+        # Store each bucket contiguously so a probe is a slice, not a gather
+        order = np.argsort(assignment, kind='stable')
+        self.ids, self.vectors = ids[order], vectors[order]
+        self.centroids = centroids
+        self.offsets = np.searchsorted(assignment[order], np.arange(nlist + 1))
+    
+    def __len__(self):
+        return len(self.ids) + len(self._extra_ids) - len(self._removed)
+    
+    def add(self, item_id, vector):
+        self._removed.discard(item_id)
+        self._extra_ids.append(item_id)
+        self._extra_vectors.append(vector)
+    
+    def remove(self, item_ids):
+        self._removed.update(item_ids)
+    
+    def search(self, query, k=10):
+        """Top ``k`` (id, score) pairs by inner product with ``query``."""
+        import numpy as np
+        if self.centroids is None:
+            ids, vectors = self.ids, self.vectors
+        else:
+            probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+            slices = [slice(self.offsets[p], self.offsets[p + 1]) for p in probes]
+            ids = np.concatenate([self.ids[s] for s in slices])
+            vectors = np.concatenate([self.vectors[s] for s in slices])
+        if self._extra_ids:
+            ids = np.concatenate([ids, np.asarray(self._extra_ids, dtype=np.int64)])
+            vectors = np.concatenate([vectors, np.asarray(self._extra_vectors, dtype=np.float32)])
+        if not len(ids):
+            return []
+        
+        scores = vectors @ query
+        # Over-fetch so masked ids can be dropped without a second pass
+        take = min(len(scores), k + len(self._removed))
+        top = np.argpartition(-scores, take - 1)[:take]
+        top = top[np.argsort(-scores[top])]
+        results = []
+        for i in top:
+            item_id = int(ids[i])
+            if item_id not in self._removed:
+                results.append((item_id, float(scores[i])))
+                if len(results) == k:
+                    break
+        return results
+
+
+class SemanticIndex:
+    """The current model plus an ANN index over active job vectors.
+    
+    The first ``ready()`` call starts a background refresher; until it has
+    loaded a model, ``ready()`` returns False.  Every ``INDEX_TTL_SECONDS``
+    (or sooner after ``refresh_soon()``) the refresher embeds active jobs
+    that have no vector for the current model, using ``connect_primary``,
+    then rebuilds the index from ``job_embeddings`` and reloads the model
+    when its file changed.  The new (model, index) pair replaces the old one
+    in one assignment, so requests keep searching the old index meanwhile
+    and never wait for a rebuild.
+    """
+    
+    def __init__(self, connect, model_path=MODEL_PATH, ttl=INDEX_TTL_SECONDS, connect_primary=None):
+        self.connect = connect
+        self.connect_primary = connect_primary
+        self.model_path = model_path
+        self.ttl = ttl
+        self._state = None
+        self._model_mtime = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._wake = threading.Event()
+        # Ids discarded while a rebuild is running, re-applied to its result
+        self._discarded = set()
+        self._discard_lock = threading.Lock()
+    
+    @property
+    def model(self):
+        return self._state[0] if self._state else None
+    
+    @property
+    def index(self):
+        return self._state[1] if self._state else None
+    
+    def ready(self):
+        """True once a model and index are loaded; starts the refresher."""
+        self.start()
+        return self._state is not None
+    
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='semantic-index', daemon=True)
+                self._thread.start()
+    
+    def refresh_soon(self):
+        """Wake the refresher early, e.g. after a job is posted."""
+        self._wake.set()
+    
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('semantic index refresh failed')
+            self._wake.wait(self.ttl)
+            self._wake.clear()
+    
+    def refresh(self):
+        """Embed missing jobs and rebuild the index; False when no model exists."""
+        try:
+            mtime = os.path.getmtime(self.model_path)
+        except OSError:
+            return False
+        state = self._state
+        if state is not None and mtime == self._model_mtime:
+            model = state[0]
+        else:
+            model = EmbeddingModel.load(self.model_path)
+        
+        with self._discard_lock:
+            self._discarded = set()
+        if self.connect_primary is not None:
+            self._embed_missing(model)
+        index = self._load_index(model)
+        with self._discard_lock:
+            index.remove(self._discarded)
+            self._state = (model, index)
+            self._model_mtime = mtime
+        return True
+    
+    def _embed_missing(self, model, batch_size=1000):
+        """Store vectors for active jobs the model has not embedded yet."""
+        conn = self.connect_primary()
+        cur = conn.cursor()
+        try:
+            cur.execute(f"""
+                SELECT j.id, {JOB_TEXT_SQL} as text
+                FROM jobs j
+                LEFT JOIN job_embeddings e ON e.job_id = j.id AND e.model_version = %s
+                WHERE j.status = 'active' AND e.job_id IS NULL
+            """, (model.version,))
+            rows = cur.fetchall()
+            for i in range(0, len(rows), batch_size):
+                batch = rows[i:i + batch_size]
+                vectors = model.embed([row['text'] for row in batch])
+                store_job_vectors(cur, model.version, [row['id'] for row in batch], vectors)
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            conn.close()
+    
+    def _load_index(self, model):
+        import numpy as np
+        conn = self.connect()
+        cur = conn.cursor()
+        try:
+            cur.execute(f"""
+                SELECT e.job_id, e.vector
+                FROM job_embeddings e
+                JOIN jobs j ON j.id = e.job_id
+                WHERE j.status = 'active' AND {VISIBLE_SQL} AND e.model_version = %s
+            """, (model.version,))
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+        
+        ids = [row['job_id'] for row in rows]
+        vectors = np.frombuffer(b''.join(bytes(row['vector']) for row in rows), dtype=np.float32)
+        return IVFIndex(ids, vectors.reshape(len(ids), model.dimensions))
+    
+    def search(self, text, k=10):
+        """(job_id, similarity) for the ``k`` jobs closest to ``text``."""
+        model, index = self._state
+        return index.search(model.embed([text])[0], k)
+    
+    def discard(self, job_ids):
+        with self._discard_lock:
+            self._discarded.update(job_ids)
+            if self._state is not None:
+                self._state[1].remove(job_ids)
+        # Reposts of the closed jobs are visible again after a rebuild
+        self.refresh_soon()
+
+
+_worker_model = None
+
+
+def relevance_scores(texts, model_path=MODEL_PATH):
+    """Similarity (0-100) of ``texts[1:]`` to ``texts[0]``.
+    
+    Runs in the ML pool workers, each of which keeps its own copy of the
+    model and reloads it when the file changes.
+    """
+    global _worker_model
+    mtime = os.path.getmtime(model_path)
+    if _worker_model is None or _worker_model[0] != mtime:
+        _worker_model = (mtime, EmbeddingModel.load(model_path))
+    vectors = _worker_model[1].embed(texts)
+    return [round(float(similarity) * 100, 2) for similarity in vectors[1:] @ vectors[0]]
+
+
+def model_available(model_path=MODEL_PATH):
+    return os.path.exists(model_path)
+
+
+def store_job_vectors(cur, version, job_ids, vectors):
+    from psycopg2.extras import execute_values
+    execute_values(cur, """
+        INSERT INTO job_embeddings (job_id, model_version, vector)
+        VALUES %s
+        ON CONFLICT (job_id) DO UPDATE SET
+            model_version = EXCLUDED.model_version,
+            vector = EXCLUDED.vector,
+            updated_at = CURRENT_TIMESTAMP
+    """, [(job_id, version, vector.tobytes()) for job_id, vector in zip(job_ids, vectors)])
+
+
+def index_jobs(conn, model, batch_size=1000):
+    """Embed every job with ``model`` and store the vectors; returns the count."""
+    read = conn.cursor(name='embedding_jobs')
+    read.itersize = batch_size
+    read.execute(f"SELECT j.id, {JOB_TEXT_SQL} as text FROM jobs j")
+    write = conn.cursor()
+    total = 0
+    while True:
+        rows = read.fetchmany(batch_size)
+        if not rows:
+            break
+        vectors = model.embed([row[1] for row in rows])
+        store_job_vectors(write, model.version, [row[0] for row in rows], vectors)
+        total += len(rows)
+    read.close()
+    write.execute("DELETE FROM job_embeddings WHERE model_version <> %s", (model.version,))
+    write.close()
+    conn.commit()
+    return total
+
+
+def training_corpus(conn):
+    cur = conn.cursor()
+    cur.execute(f"SELECT {JOB_TEXT_SQL} FROM jobs j")
+    documents = [row[0] for row in cur.fetchall()]
+    cur.execute(f"SELECT {STUDENT_TEXT_SQL} FROM students s")
+    documents += [row[0] for row in cur.fetchall() if row[0]]
+    cur.close()
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train and apply the job embedding model')
+    sub = parser.add_subparsers(dest='command', required=True)
+    train_cmd = sub.add_parser('train', help='fit the model on jobs and profiles, then index jobs')
+    train_cmd.add_argument('--dimensions', type=int, default=DEFAULT_DIMENSIONS)
+    train_cmd.add_argument('--max-features', type=int, default=50000)
+    sub.add_parser('index', help='re-embed all jobs with the saved model')
+    parser.add_argument('--model-path', default=MODEL_PATH)
+    args = parser.parse_args()
+    
+    import psycopg2
+    from db import DB_CONFIG
+    conn = psycopg2.connect(**DB_CONFIG)
+    
+    try:
+        if args.command == 'train':
+            documents = training_corpus(conn)
+            model = train(documents, args.dimensions, args.max_features)
+            print(f"trained {model.dimensions}-d model on {len(documents)} documents "
+                  f"({len(model.terms)} terms), version {model.version}")
+        else:
+            model = EmbeddingModel.load(args.model_path)
+        # Store the vectors before publishing a new model file, so workers
+        # that reload it find matching vectors
+        print(f"embedded {index_jobs(conn, model)} jobs")
+        if args.command == 'train':
+            model.save(args.model_path)
+            print(f"saved {args.model_path}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# backend/engagement.py
+"""Buffered job engagement events (views, saves, applies).
+
+Handlers call ``record()``, which only appends to an in-process ring buffer;
+nothing touches the database on the request path.  A background thread
+drains the buffer every ``flush_interval`` seconds and, in one transaction,
+bulk-inserts the raw events into ``job_engagement_events`` and adds them to
+the per-job daily counters in ``job_engagement_daily``.
+
+The buffer is bounded: when the flusher cannot keep up (or the database is
+down) the oldest events are dropped and counted rather than letting memory
+grow.  Events still buffered when a process is killed are lost; the
+counters are engagement analytics, not an audit log.
+
+Configuration comes from the environment:
+    
+    ENGAGEMENT_BUFFER_SIZE      events held in memory (default 50000)
+    ENGAGEMENT_FLUSH_SECONDS    interval between flushes (default 5)
+    ENGAGEMENT_FLUSH_BATCH      most events written per statement (default 5000)
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime
+
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ('view', 'save', 'apply')
+
+# job_engagement_daily column incremented by each event type
+_COUNTER_COLUMNS = {'view': 'views', 'save': 'saves', 'apply': 'applies'}
+
+
+class EngagementBuffer:
+    def __init__(self, connect, capacity=50000, flush_interval=5.0, flush_batch=5000):
+        self.connect = connect
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        
+        self._events = deque(maxlen=capacity)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # Guards the buffer and the recorded count; held only for in-memory
+        # work, never across a database write
+        self._buffer_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._recorded = 0
+        self._flushed = 0
+        self._failed_flushes = 0
+        self._last_flush_at = None
+    
+    @classmethod
+    def from_env(cls, connect):
+        return cls(
+            connect,
+            capacity=int(os.environ.get('ENGAGEMENT_BUFFER_SIZE', 50000)),
+            flush_interval=float(os.environ.get('ENGAGEMENT_FLUSH_SECONDS', 5)),
+            flush_batch=int(os.environ.get('ENGAGEMENT_FLUSH_BATCH', 5000)),
+        )
+    
+    def start(self):
+        """Start the flush thread (idempotent)."""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='engagement-flush', daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+    
+    def stop(self):
+        """Stop the flush thread and write out what is still buffered."""
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('final engagement flush failed')
+    
+    def record(self, event_type, job_id, user_id=None):
+        if event_type not in _COUNTER_COLUMNS:
+            raise ValueError(f"Unknown engagement event: {event_type}")
+        self.start()
+        with self._buffer_lock:
+            # With maxlen set the oldest event falls off
+            self._events.append((job_id, user_id, event_type, datetime.now()))
+            self._recorded += 1
+    
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('engagement flush failed')
+    
+    def _drain(self):
+        with self._buffer_lock:
+            count = min(self.flush_batch, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+    
+    def _requeue(self, batch):
+        """Put a failed batch back ahead of newer events.
+        
+        The buffer is rebuilt oldest-first with the same maxlen, so when it
+        is over capacity the oldest events are dropped, as documented.
+        (``extendleft`` on a full deque would drop the newest instead.)
+        """
+        with self._buffer_lock:
+            self._events = deque(batch + list(self._events), maxlen=self.capacity)
+    
+    def flush(self):
+        """Write everything buffered so far; returns the number of events."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                try:
+                    self._write(batch)
+                except Exception:
+                    self._failed_flushes += 1
+                    self._requeue(batch)
+                    raise
+                written += len(batch)
+                self._flushed += len(batch)
+            self._last_flush_at = datetime.now()
+        return written
+    
+    def _write(self, batch):
+        daily = Counter((job_id, created_at.date(), event_type)
+                        for job_id, _, event_type, created_at in batch)
+        rollup = {}
+        for (job_id, day, event_type), count in daily.items():
+            row = rollup.setdefault((job_id, day), {'views': 0, 'saves': 0, 'applies': 0})
+            row[_COUNTER_COLUMNS[event_type]] += count
+        
+        conn = self.connect()
+        cur = conn.cursor()
+        try:
+            execute_values(cur, """
+                INSERT INTO job_engagement_events (job_id, user_id, event_type, created_at)
+                VALUES %s
+            """, batch, page_size=1000)
+            execute_values(cur, """
+                INSERT INTO job_engagement_daily AS d (job_id, day, views, saves, applies)
+                VALUES %s
+                ON CONFLICT (job_id, day) DO UPDATE SET
+                    views = d.views + EXCLUDED.views,
+                    saves = d.saves + EXCLUDED.saves,
+                    applies = d.applies + EXCLUDED.applies
+            """, [(job_id, day, c['views'], c['saves'], c['applies'])
+                  for (job_id, day), c in sorted(rollup.items())], page_size=1000)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            conn.close()
+    
+    def metrics(self):
+        return {
+            'buffered': len(self._events),
+            'capacity': self.capacity,
+            'recorded': self._recorded,
+            'flushed': self._flushed,
+            'dropped': max(self._recorded - self._flushed - len(self._events), 0),
+            'failed_flushes': self._failed_flushes,
+            'last_flush_at': self._last_flush_at,
+        }
@@ -0,0 +1,207 @@
+# backend/job_expiry.py
+"""Close job postings whose application deadline has passed.
+
+    python job_expiry.py --once
+    python job_expiry.py --daemon --interval 300
+
+Jobs are closed in batches of ``--batch-size``; each batch claims its rows
+with ``FOR UPDATE SKIP LOCKED``, so several schedulers (or web workers
+running the in-process scheduler) can run at the same time without
+blocking each other or closing a job twice.  The recruiter gets a
+notification for every closed posting, written in the same statement.
+
+Code that keeps derived data about active jobs (caches, indexes) registers
+a hook with ``register_hook``.  Hooks receive the list of closed job ids.
+Every batch also sends ``NOTIFY job_expired``, carrying the ids, in the
+same transaction as the closes.  A process that calls ``start_listener``
+therefore runs its hooks for jobs closed anywhere: this daemon, another
+web worker, or its own scheduler.  The scheduler also calls local hooks
+directly, so hooks must be idempotent.
+"""
+import argparse
+import logging
+import select
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_INTERVAL = 300
+NOTIFY_CHANNEL = 'job_expired'
+# Keeps each payload well under Postgres' 8000 byte NOTIFY limit
+NOTIFY_CHUNK = 500
+
+_hooks = []
+
+
+def register_hook(fn):
+    """Call ``fn(job_ids)`` after every committed batch of closed jobs."""
+    _hooks.append(fn)
+    return fn
+
+
+def _run_hooks(job_ids):
+    for hook in _hooks:
+        try:
+            hook(job_ids)
+        except Exception:
+            logger.exception('job expiry hook %r failed', hook)
+
+
+def _notify(cur, job_ids):
+    for i in range(0, len(job_ids), NOTIFY_CHUNK):
+        payload = ','.join(str(job_id) for job_id in job_ids[i:i + NOTIFY_CHUNK])
+        cur.execute("SELECT pg_notify(%s, %s)", (NOTIFY_CHANNEL, payload))
+
+
+def expire_jobs(conn, batch_size=DEFAULT_BATCH_SIZE):
+    """Close every past-deadline active job; returns the closed job ids."""
+    closed_ids = []
+    cur = conn.cursor()
+    
+    while True:
+        cur.execute("""
+            WITH expired AS (
+                SELECT id FROM jobs
+                WHERE status = 'active' AND application_deadline < CURRENT_DATE
+                ORDER BY application_deadline
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ), closed AS (
+                UPDATE jobs j SET status = 'closed'
+                FROM expired e
+                WHERE j.id = e.id
+                RETURNING j.id, j.company_id, j.job_title
+            ), notified AS (
+                INSERT INTO notifications (user_id, title, message, notification_type)
+                SELECT c.user_id, 'Job Posting Closed',
+                       'Your posting "' || closed.job_title || '" passed its application deadline and was closed',
+                       'job_closed'
+                FROM closed
+                JOIN companies c ON c.id = closed.company_id
+            )
+            SELECT id FROM closed
+        """, (batch_size,))
+        batch = [row['id'] for row in cur.fetchall()]
+        if batch:
+            _notify(cur, batch)
+        conn.commit()
+        
+        if batch:
+            closed_ids.extend(batch)
+            _run_hooks(batch)
+        
+        if len(batch) < batch_size:
+            break
+    
+    cur.close()
+    return closed_ids
+
+
+def run_forever(connect, interval=DEFAULT_INTERVAL, batch_size=DEFAULT_BATCH_SIZE, stop=None):
+    """Run ``expire_jobs`` every ``interval`` seconds until ``stop`` is set.
+    
+    ``connect`` returns a connection whose ``close()`` releases it.
+    """
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        conn = None
+        try:
+            conn = connect()
+            closed = expire_jobs(conn, batch_size)
+            if closed:
+                logger.info('closed %d expired jobs', len(closed))
+        except Exception:
+            logger.exception('job expiry run failed')
+        finally:
+            if conn is not None:
+                conn.close()
+        stop.wait(interval)
+
+
+def start_scheduler(connect, interval=DEFAULT_INTERVAL, batch_size=DEFAULT_BATCH_SIZE):
+    """Run the scheduler on a daemon thread; returns the stop event."""
+    stop = threading.Event()
+    threading.Thread(target=run_forever, args=(connect, interval, batch_size, stop),
+                     name='job-expiry', daemon=True).start()
+    return stop
+
+
+def listen(connect, stop=None, poll_seconds=5):
+    """Run local hooks for ``job_expired`` notifications until ``stop`` is set.
+    
+    ``connect`` must return a dedicated (unpooled) connection.  It is
+    reopened with backoff if it drops.  Closes made while it was down are
+    missed, so hook owners should also rebuild periodically.
+    """
+    stop = stop or threading.Event()
+    backoff = 1
+    while not stop.is_set():
+        conn = None
+        try:
+            conn = connect()
+            conn.autocommit = True
+            conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+            backoff = 1
+            while not stop.is_set():
+                if select.select([conn], [], [], poll_seconds) == ([], [], []):
+                    continue
+                conn.poll()
+                job_ids = []
+                while conn.notifies:
+                    payload = conn.notifies.pop(0).payload
+                    job_ids.extend(int(job_id) for job_id in payload.split(',') if job_id)
+                if job_ids:
+                    _run_hooks(job_ids)
+        except Exception as e:
+            logger.warning('job expiry listener disconnected (%s); retrying in %ds', e, backoff)
+            stop.wait(backoff)
+            backoff = min(backoff * 2, 60)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_listener(connect, poll_seconds=5):
+    """Run ``listen`` on a daemon thread; returns the stop event."""
+    stop = threading.Event()
+    threading.Thread(target=listen, args=(connect, stop, poll_seconds),
+                     name='job-expiry-listener', daemon=True).start()
+    return stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Close job postings past their deadline')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--once', action='store_true', help='run one pass and exit')
+    mode.add_argument('--daemon', action='store_true', help='keep running every --interval seconds')
+    parser.add_argument('--interval', type=int, default=DEFAULT_INTERVAL)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+    from db import DB_CONFIG
+    
+    def connect():
+        return psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
+    
+    if args.once:
+        conn = connect()
+        try:
+            closed = expire_jobs(conn, args.batch_size)
+        finally:
+            conn.close()
+        print(f"closed {len(closed)} expired jobs")
+    else:
+        try:
+            run_forever(connect, args.interval, args.batch_size)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
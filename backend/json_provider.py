@@ -0,0 +1,68 @@
+# backend/json_provider.py
+"""Fast JSON provider for the Flask app.
+
+Handlers return cursor rows straight from ``RealDictCursor``; those rows are
+dict subclasses, so they can be encoded without copying each one into a
+plain ``dict`` first.  ``orjson`` is used when installed (it encodes dict
+subclasses, datetimes and dates natively, in C); otherwise the stdlib
+encoder is used with the same type handling.
+
+Type mapping:
+
+* ``datetime`` / ``date`` / ``time`` -> ISO 8601 strings
+* ``Decimal`` (NUMERIC columns: CGPA, salaries) -> JSON numbers
+* ``memoryview`` / ``bytes`` -> UTF-8 text
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from flask.json.provider import JSONProvider
+
+import profiling
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, (bytes, memoryview)):
+        return bytes(obj).decode('utf-8', 'replace')
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(JSONProvider):
+    """orjson-backed provider with a stdlib fallback."""
+    
+    mimetype = 'application/json'
+    
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj).decode('utf-8')
+    
+    def dumps_bytes(self, obj):
+        if orjson is not None:
+            return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, default=_default, separators=(',', ':'),
+                          ensure_ascii=False).encode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        with profiling.phase('serialize'):
+            body = self.dumps_bytes(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
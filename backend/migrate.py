@@ -0,0 +1,65 @@
+# backend/migrate.py
+"""Apply the SQL files in migrations/ in filename order.
+
+Each file runs in its own transaction and is recorded in schema_migrations,
+so running the script again only applies new files.
+
+    python migrate.py            # apply pending migrations
+    python migrate.py --list     # show applied / pending
+"""
+import argparse
+import os
+
+import psycopg2
+
+from db import DB_CONFIG
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+
+def migration_files():
+    return sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith('.sql'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply database migrations')
+    parser.add_argument('--list', action='store_true', help='list migrations and exit')
+    args = parser.parse_args()
+    
+    conn = psycopg2.connect(**DB_CONFIG)
+    cur = conn.cursor()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            filename VARCHAR(255) PRIMARY KEY,
+            applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
+    
+    cur.execute("SELECT filename FROM schema_migrations")
+    applied = {row[0] for row in cur.fetchall()}
+    
+    for filename in migration_files():
+        if args.list:
+            print(f"{'applied' if filename in applied else 'pending'}  {filename}")
+            continue
+        if filename in applied:
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, filename)) as f:
+            sql = f.read()
+        try:
+            cur.execute(sql)
+            cur.execute("INSERT INTO schema_migrations (filename) VALUES (%s)", (filename,))
+            conn.commit()
+            print(f"applied  {filename}")
+        except Exception:
+            conn.rollback()
+            print(f"failed   {filename}")
+            raise
+    
+    cur.close()
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
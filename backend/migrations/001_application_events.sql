@@ -0,0 +1,51 @@
+-- Append-only history of application status transitions, plus the
+-- per-student placement aggregate maintained from it.
+
+CREATE TABLE IF NOT EXISTS application_events (
+    id BIGSERIAL PRIMARY KEY,
+    application_id INTEGER NOT NULL REFERENCES applications(id) ON DELETE CASCADE,
+    student_id INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    from_status VARCHAR(50),
+    to_status VARCHAR(50) NOT NULL,
+    actor_user_id INTEGER,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_application_events_application
+    ON application_events (application_id, created_at);
+
+-- Offer/accept events only: backs the per-week / per-year offer counts
+CREATE INDEX IF NOT EXISTS idx_application_events_offers
+    ON application_events (created_at)
+    WHERE to_status IN ('offered', 'accepted');
+
+-- One row per currently placed student. offer_count is the number of that
+-- student's applications sitting in 'offered' or 'accepted'; the row is
+-- removed when it drops to zero.
+CREATE TABLE IF NOT EXISTS student_placements (
+    student_id INTEGER PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    placed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    offer_count INTEGER NOT NULL DEFAULT 1
+);
+
+CREATE INDEX IF NOT EXISTS idx_student_placements_placed_at
+    ON student_placements (placed_at);
+
+CREATE INDEX IF NOT EXISTS idx_applications_placed
+    ON applications (student_id)
+    WHERE status IN ('offered', 'accepted');
+
+-- Backfill. Historic transition times are unknown, so existing applications
+-- get a single event at their applied_at carrying the current status.
+INSERT INTO application_events (application_id, student_id, job_id, from_status, to_status, created_at)
+SELECT a.id, a.student_id, a.job_id, NULL, a.status, a.applied_at
+FROM applications a
+WHERE NOT EXISTS (SELECT 1 FROM application_events e WHERE e.application_id = a.id);
+
+INSERT INTO student_placements (student_id, placed_at, offer_count)
+SELECT a.student_id, MIN(a.applied_at), COUNT(*)
+FROM applications a
+WHERE a.status IN ('offered', 'accepted')
+GROUP BY a.student_id
+ON CONFLICT (student_id) DO NOTHING;
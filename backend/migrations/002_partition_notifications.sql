@@ -0,0 +1,53 @@
+-- Range-partition notifications by month on created_at.
+--
+-- applications is deliberately left unpartitioned: Postgres requires every
+-- unique constraint on a partitioned table to include the partition key, so
+-- partitioning by applied_at would drop the (job_id, student_id) uniqueness
+-- and the foreign keys that point at applications(id). It gets indexes that
+-- match its listing queries instead.
+
+ALTER TABLE notifications RENAME TO notifications_legacy;
+ALTER TABLE notifications_legacy RENAME CONSTRAINT notifications_pkey TO notifications_legacy_pkey;
+
+CREATE TABLE notifications (LIKE notifications_legacy INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+    PARTITION BY RANGE (created_at);
+
+ALTER TABLE notifications ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE notifications ADD PRIMARY KEY (id, created_at);
+-- LIKE does not copy foreign keys; partitions inherit this one
+ALTER TABLE notifications ADD FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+ALTER SEQUENCE notifications_id_seq OWNED BY notifications.id;
+
+CREATE INDEX idx_notifications_user_created ON notifications (user_id, created_at DESC);
+CREATE INDEX idx_notifications_user_unread ON notifications (user_id) WHERE is_read = false;
+
+-- Catches rows outside every monthly partition; partitions.py keeps
+-- partitions created ahead of time so this normally stays empty.
+CREATE TABLE notifications_default PARTITION OF notifications DEFAULT;
+
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE((SELECT MIN(created_at) FROM notifications_legacy), now())),
+            date_trunc('month', now()) + interval '3 months',
+            interval '1 month'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE notifications_p%s PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+            to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date
+        );
+    END LOOP;
+END $$;
+
+UPDATE notifications_legacy SET created_at = now() WHERE created_at IS NULL;
+INSERT INTO notifications SELECT * FROM notifications_legacy;
+
+DROP TABLE notifications_legacy;
+
+CREATE INDEX IF NOT EXISTS idx_applications_student_applied ON applications (student_id, applied_at DESC);
+CREATE INDEX IF NOT EXISTS idx_applications_job_applied ON applications (job_id, applied_at DESC);
+CREATE INDEX IF NOT EXISTS idx_applications_applied ON applications (applied_at DESC);
@@ -0,0 +1,29 @@
+-- Contention-safe applies: set-based duplicate detection, idempotency keys
+-- and an optional per-job application cap enforced on the job row.
+
+-- The old check-then-insert apply could race, so existing data may hold
+-- several applications per (job, student).  Keep the earliest (lowest id)
+-- before the unique index is built and the counters are backfilled.
+DELETE FROM applications a
+USING applications keep
+WHERE keep.job_id = a.job_id
+  AND keep.student_id = a.student_id
+  AND keep.id < a.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_job_student
+    ON applications (job_id, student_id);
+
+ALTER TABLE applications ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(64);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_applications_idempotency
+    ON applications (student_id, idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
+
+-- NULL means no cap
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS max_applications INTEGER;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS application_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE jobs j
+SET application_count = counts.total
+FROM (SELECT job_id, COUNT(*) AS total FROM applications GROUP BY job_id) counts
+WHERE counts.job_id = j.id;
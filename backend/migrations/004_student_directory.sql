@@ -0,0 +1,22 @@
+-- Admin student directory: trigram search, range-filter indexes and a
+-- maintained per-student application counter. Offer counts already live in
+-- student_placements.offer_count.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE students ADD COLUMN IF NOT EXISTS application_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE students s
+SET application_count = counts.total
+FROM (SELECT student_id, COUNT(*) AS total FROM applications GROUP BY student_id) counts
+WHERE counts.student_id = s.id;
+
+-- Must match the expression used by the directory query in app.py
+CREATE INDEX IF NOT EXISTS idx_students_full_name_trgm
+    ON students USING gin ((COALESCE(first_name, '') || ' ' || COALESCE(last_name, '')) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_students_roll_number_trgm
+    ON students USING gin (roll_number gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_students_department ON students (department);
+CREATE INDEX IF NOT EXISTS idx_students_graduation_year ON students (graduation_year);
+CREATE INDEX IF NOT EXISTS idx_students_cgpa ON students (current_cgpa);
@@ -0,0 +1,10 @@
+-- Hot listing queries only ever look at active jobs; index just those.
+
+CREATE INDEX IF NOT EXISTS idx_jobs_active_created
+    ON jobs (created_at DESC)
+    WHERE status = 'active';
+
+-- Lets the expiry scheduler find past-deadline jobs without a scan
+CREATE INDEX IF NOT EXISTS idx_jobs_active_deadline
+    ON jobs (application_deadline)
+    WHERE status = 'active' AND application_deadline IS NOT NULL;
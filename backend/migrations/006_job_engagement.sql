@@ -0,0 +1,25 @@
+-- Job engagement analytics: raw events written in bulk by engagement.py,
+-- plus per-job daily counters that recruiter listings read.  No foreign
+-- keys: a job deleted while its events sit in the buffer must not make the
+-- whole flush fail.
+
+CREATE TABLE IF NOT EXISTS job_engagement_events (
+    id BIGSERIAL PRIMARY KEY,
+    job_id INTEGER NOT NULL,
+    user_id INTEGER,
+    event_type VARCHAR(20) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- BRIN keeps the index tiny on an append-only, time-ordered table
+CREATE INDEX IF NOT EXISTS idx_job_engagement_events_created
+    ON job_engagement_events USING BRIN (created_at);
+
+CREATE TABLE IF NOT EXISTS job_engagement_daily (
+    job_id INTEGER NOT NULL,
+    day DATE NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    saves INTEGER NOT NULL DEFAULT 0,
+    applies INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, day)
+);
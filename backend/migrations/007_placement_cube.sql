@@ -0,0 +1,69 @@
+-- Precomputed placement cubes for trend reports, refreshed by
+-- `python reports.py refresh` (cron) or POST /api/admin/reports/refresh.
+--
+-- grouping_id is GROUPING() over the cube dimensions in declaration order:
+-- a set bit means that dimension is rolled up (its column is NULL), so
+-- 0 is the finest level and all bits set is the grand total.
+
+-- Offers: one fact per offered/accepted application
+CREATE MATERIALIZED VIEW IF NOT EXISTS placement_cube AS
+WITH offers AS (
+    SELECT
+        s.graduation_year,
+        COALESCE(NULLIF(s.department, ''), 'Unknown') as department,
+        j.company_id,
+        a.student_id,
+        CASE WHEN j.salary_min IS NOT NULL
+             THEN (j.salary_min + COALESCE(j.salary_max, j.salary_min)) / 2 END as package
+    FROM applications a
+    JOIN students s ON a.student_id = s.id
+    JOIN jobs j ON a.job_id = j.id
+    WHERE a.status IN ('offered', 'accepted') AND s.graduation_year IS NOT NULL
+), banded AS (
+    SELECT *,
+        CASE
+            WHEN package IS NULL THEN 'Undisclosed'
+            WHEN package < 500000 THEN '0-5L'
+            WHEN package < 1000000 THEN '5-10L'
+            WHEN package < 2000000 THEN '10-20L'
+            ELSE '20L+'
+        END as package_band
+    FROM offers
+)
+SELECT
+    GROUPING(graduation_year, department, company_id, package_band) as grouping_id,
+    graduation_year,
+    department,
+    company_id,
+    package_band,
+    COUNT(*) as offers,
+    COUNT(DISTINCT student_id) as placed_students,
+    AVG(package) as avg_package,
+    MAX(package) as highest_package,
+    MIN(package) as lowest_package
+FROM banded
+GROUP BY CUBE (graduation_year, department, company_id, package_band)
+WITH NO DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_placement_cube_cell
+    ON placement_cube (grouping_id, graduation_year, department, company_id, package_band);
+
+-- Cohort sizes, the denominator for placement rates
+CREATE MATERIALIZED VIEW IF NOT EXISTS placement_cohort_cube AS
+SELECT
+    GROUPING(s.graduation_year, COALESCE(NULLIF(s.department, ''), 'Unknown')) as grouping_id,
+    s.graduation_year,
+    COALESCE(NULLIF(s.department, ''), 'Unknown') as department,
+    COUNT(*) as total_students,
+    COUNT(p.student_id) as placed_students
+FROM students s
+LEFT JOIN student_placements p ON s.id = p.student_id
+WHERE s.graduation_year IS NOT NULL
+GROUP BY CUBE (s.graduation_year, COALESCE(NULLIF(s.department, ''), 'Unknown'))
+WITH NO DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_placement_cohort_cube_cell
+    ON placement_cohort_cube (grouping_id, graduation_year, department);
+
+REFRESH MATERIALIZED VIEW placement_cube;
+REFRESH MATERIALIZED VIEW placement_cohort_cube;
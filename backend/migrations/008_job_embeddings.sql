@@ -0,0 +1,9 @@
+-- LSA job vectors (float32 bytes) written by embeddings.py; rows from an
+-- older model_version are ignored by the app and removed on re-index.
+
+CREATE TABLE IF NOT EXISTS job_embeddings (
+    job_id INTEGER PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,
+    model_version VARCHAR(32) NOT NULL,
+    vector BYTEA NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,19 @@
+-- Near-duplicate job detection (dedupe.py): MinHash signatures, their LSH
+-- band buckets, and the posting a flagged duplicate repeats.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS duplicate_of INTEGER REFERENCES jobs(id) ON DELETE SET NULL;
+
+CREATE TABLE IF NOT EXISTS job_signatures (
+    job_id INTEGER PRIMARY KEY REFERENCES jobs(id) ON DELETE CASCADE,
+    signature BYTEA NOT NULL
+);
+
+-- Lookups go (band, bucket) -> job_id through the primary key
+CREATE TABLE IF NOT EXISTS job_lsh_bands (
+    band SMALLINT NOT NULL,
+    bucket BIGINT NOT NULL,
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    PRIMARY KEY (band, bucket, job_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_lsh_bands_job ON job_lsh_bands (job_id);
@@ -0,0 +1,45 @@
+-- Interview scheduling. Overlaps are rejected by exclusion constraints on
+-- tstzrange columns (btree_gist provides = for the integer / text keys).
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- Recruiter slots; one panel cannot hold two overlapping slots for a job
+CREATE TABLE IF NOT EXISTS interview_slots (
+    id SERIAL PRIMARY KEY,
+    job_id INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    panel VARCHAR(100) NOT NULL DEFAULT 'Panel 1',
+    during TSTZRANGE NOT NULL CHECK (NOT isempty(during)),
+    location VARCHAR(255),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    EXCLUDE USING gist (job_id WITH =, panel WITH =, during WITH &&)
+);
+
+-- Windows in which a student can be interviewed (none = any time)
+CREATE TABLE IF NOT EXISTS student_availability (
+    id SERIAL PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    during TSTZRANGE NOT NULL CHECK (NOT isempty(during))
+);
+
+CREATE INDEX IF NOT EXISTS idx_student_availability_student
+    ON student_availability USING gist (student_id, during);
+
+-- Booked interviews. during is copied from the slot so the student-level
+-- constraint can see it: a student is never in two interviews at once,
+-- across every company's drive.
+CREATE TABLE IF NOT EXISTS interviews (
+    id SERIAL PRIMARY KEY,
+    slot_id INTEGER NOT NULL REFERENCES interview_slots(id) ON DELETE CASCADE,
+    application_id INTEGER NOT NULL REFERENCES applications(id) ON DELETE CASCADE,
+    student_id INTEGER NOT NULL REFERENCES students(id) ON DELETE CASCADE,
+    during TSTZRANGE NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'scheduled',
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    EXCLUDE USING gist (student_id WITH =, during WITH &&) WHERE (status = 'scheduled')
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_interviews_slot_scheduled
+    ON interviews (slot_id) WHERE status = 'scheduled';
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_interviews_application_scheduled
+    ON interviews (application_id) WHERE status = 'scheduled';
@@ -0,0 +1,76 @@
+-- Version counters for caches kept inside each web worker. Statement-level
+-- triggers bump 'jobs' on every write that changes the active-job set, no
+-- matter which process wrote it (web worker, job_expiry.py --daemon, psql).
+-- They read the statement's transition tables, so a statement that changed
+-- no rows (or only columns no cache uses) leaves the version alone.
+-- Readers key their cache entries by the version they see, so all workers
+-- drop stale entries together. A replica replays the bump together with the
+-- rows it covers.
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO cache_versions (name) VALUES ('jobs') ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_jobs_cache_version() RETURNS trigger AS $$
+DECLARE
+    changed BOOLEAN;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed := EXISTS (SELECT 1 FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        changed := EXISTS (SELECT 1 FROM old_rows);
+    ELSIF TG_TABLE_NAME = 'companies' THEN
+        changed := EXISTS (
+            SELECT 1 FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE n.company_name IS DISTINCT FROM o.company_name
+        );
+    ELSE
+        -- application_count is deliberately not compared: the apply path
+        -- updates it on every application and no cache depends on it
+        changed := EXISTS (
+            SELECT 1 FROM old_rows o JOIN new_rows n ON n.id = o.id
+            WHERE (n.status, n.job_type, n.location, n.is_remote, n.company_id, n.duplicate_of,
+                   n.job_title, n.job_description, n.required_skills)
+                IS DISTINCT FROM
+                  (o.status, o.job_type, o.location, o.is_remote, o.company_id, o.duplicate_of,
+                   o.job_title, o.job_description, o.required_skills)
+        );
+    END IF;
+    
+    IF changed THEN
+        UPDATE cache_versions SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+        WHERE name = 'jobs';
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event and no column list
+DROP TRIGGER IF EXISTS jobs_cache_version ON jobs;
+DROP TRIGGER IF EXISTS jobs_cache_version_insert ON jobs;
+CREATE TRIGGER jobs_cache_version_insert
+    AFTER INSERT ON jobs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_jobs_cache_version();
+
+DROP TRIGGER IF EXISTS jobs_cache_version_update ON jobs;
+CREATE TRIGGER jobs_cache_version_update
+    AFTER UPDATE ON jobs
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_jobs_cache_version();
+
+DROP TRIGGER IF EXISTS jobs_cache_version_delete ON jobs;
+CREATE TRIGGER jobs_cache_version_delete
+    AFTER DELETE ON jobs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_jobs_cache_version();
+
+DROP TRIGGER IF EXISTS companies_cache_version ON companies;
+CREATE TRIGGER companies_cache_version
+    AFTER UPDATE ON companies
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_jobs_cache_version();
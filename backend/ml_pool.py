@@ -0,0 +1,301 @@
+# backend/ml_pool.py
+"""Process pool that runs the AI scoring work outside the web workers.
+
+Resume scoring and skill matching are CPU bound and would otherwise hold the
+GIL inside the request thread.  Requests are handed to a pool of warm worker
+processes (scikit-learn already imported and exercised by ``ai.warm_up``).
+Concurrent resume scores are coalesced into one ``ai.ats_scores`` call so a
+burst of N requests costs one sparse matrix pass instead of N vectorizer
+fits.  Applicant relevance ranking embeds profiles in the workers too,
+each worker holding its own copy of the LSA model (``embeddings``), and
+new postings get their MinHash signatures there (``dedupe``), so NumPy is
+never imported by the web process for them.
+
+Configuration comes from the environment:
+    
+    ML_WORKERS          worker processes, 0 computes inline (default 2)
+    ML_BATCH_WINDOW_MS  how long to wait for more scores to batch (default 5)
+    ML_MAX_BATCH        largest batch handed to one worker (default 64)
+    ML_TIMEOUT_S        per-request deadline before giving up (default 10)
+
+Workers are started from a forkserver (spawn where that is unavailable),
+never forked from the web process: by the time the pool starts lazily, the
+web process runs several background threads, and a forked child could
+inherit a lock one of them held.  A batch that fails as a whole is retried
+one pair at a time, so a bad input only fails its own caller.
+
+If a worker process dies, the pool is marked broken.  The pool is then
+replaced, and requests that were caught in it are computed inline.  Any
+other worker error is raised as ``MLUnavailable``.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, TimeoutError
+
+import ai
+import dedupe
+import embeddings
+
+
+class MLTimeout(Exception):
+    """Raised when the pool does not answer within the request deadline."""
+
+
+class MLUnavailable(Exception):
+    """Raised when a worker fails for any reason other than a timeout."""
+
+
+def _mp_context():
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    context = multiprocessing.get_context(method)
+    if method == 'forkserver':
+        # Preload only the scoring module, not the web app's __main__
+        context.set_forkserver_preload(['ai'])
+    return context
+
+
+class _InlineExecutor:
+    """Executor stand-in used when ML_WORKERS=0 (development, tests)."""
+    
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def shutdown(self, wait=True):
+        pass
+
+
+class MLService:
+    def __init__(self, workers=2, batch_window=0.005, max_batch=64, timeout=10.0):
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        
+        self._executor = None
+        self._start_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._in_flight = 0
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self._completed = 0
+        self._timeouts = 0
+        self._errors = 0
+        self._batches = 0
+        self._batched_items = 0
+        self._restarts = 0
+        self._batcher_started = False
+    
+    @classmethod
+    def from_env(cls):
+        return cls(
+            workers=int(os.environ.get('ML_WORKERS', 2)),
+            batch_window=int(os.environ.get('ML_BATCH_WINDOW_MS', 5)) / 1000,
+            max_batch=int(os.environ.get('ML_MAX_BATCH', 64)),
+            timeout=float(os.environ.get('ML_TIMEOUT_S', 10)),
+        )
+    
+    def start(self):
+        """Start the worker processes and the batching thread (idempotent)."""
+        if self._executor is not None:
+            return self._executor
+        with self._start_lock:
+            if self._executor is not None:
+                return self._executor
+            if self.workers > 0:
+                executor = ProcessPoolExecutor(max_workers=self.workers, initializer=ai.warm_up,
+                                               mp_context=_mp_context())
+                # Spawn every worker now so none is cold when traffic arrives
+                for _ in range(self.workers):
+                    executor.submit(ai.is_loaded)
+            else:
+                executor = _InlineExecutor()
+            if not self._batcher_started:
+                threading.Thread(target=self._batch_loop, name='ml-batcher', daemon=True).start()
+                self._batcher_started = True
+            self._executor = executor
+            return executor
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    # ---------------------------------------------------------------- public
+    
+    def score(self, resume_text, job_description, timeout=None):
+        """ATS score for one pair, batched with any concurrent callers."""
+        self.start()
+        future = Future()
+        with self._stats_lock:
+            self._in_flight += 1
+        self._queue.put(((resume_text, job_description), future, time.perf_counter()))
+        try:
+            return self._wait(future, timeout)
+        except BrokenExecutor:
+            return ai.ats_scores([(resume_text, job_description)])[0]
+    
+    def match_scores(self, skills, job_skills, timeout=None):
+        """Skill overlap counts for every job, computed in a worker process."""
+        executor = self.start()
+        with self._stats_lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        future = self._submit(executor, ai.skill_match_scores, skills, job_skills)
+        future.add_done_callback(lambda f: self._record(started, f))
+        try:
+            return self._wait(future, timeout)
+        except BrokenExecutor:
+            return ai.skill_match_scores(skills, job_skills)
+    
+    def signature(self, title, description, timeout=None):
+        """MinHash signature bytes of a posting, or None when it is empty."""
+        executor = self.start()
+        with self._stats_lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        future = self._submit(executor, dedupe.signature_bytes, title, description)
+        future.add_done_callback(lambda f: self._record(started, f))
+        try:
+            return self._wait(future, timeout)
+        except BrokenExecutor:
+            return dedupe.signature_bytes(title, description)
+    
+    def relevance(self, job_text, profile_texts, timeout=None):
+        """Embedding similarity (0-100) of each profile to the job."""
+        executor = self.start()
+        texts = [job_text] + list(profile_texts)
+        with self._stats_lock:
+            self._in_flight += 1
+        started = time.perf_counter()
+        future = self._submit(executor, embeddings.relevance_scores, texts)
+        future.add_done_callback(lambda f: self._record(started, f))
+        try:
+            return self._wait(future, timeout)
+        except BrokenExecutor:
+            return embeddings.relevance_scores(texts)
+    
+    def metrics(self):
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'workers': self.workers,
+                'started': self._executor is not None,
+                'queue_length': self._queue.qsize(),
+                'in_flight': self._in_flight,
+                'completed': self._completed,
+                'timeouts': self._timeouts,
+                'errors': self._errors,
+                'restarts': self._restarts,
+                'batches': self._batches,
+                'avg_batch_size': round(self._batched_items / self._batches, 2) if self._batches else 0,
+            }
+        stats['latency_ms'] = {
+            'p50': _percentile(latencies, 0.50),
+            'p95': _percentile(latencies, 0.95),
+            'p99': _percentile(latencies, 0.99),
+            'max': round(latencies[-1] * 1000, 2) if latencies else None,
+        }
+        return stats
+    
+    # -------------------------------------------------------------- internal
+    
+    def _wait(self, future, timeout):
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except TimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise MLTimeout('AI scoring timed out')
+        except BrokenExecutor:
+            # Caller computes inline while the replacement pool starts
+            raise
+        except Exception as e:
+            raise MLUnavailable(f'AI scoring failed: {e}') from e
+    
+    def _submit(self, executor, fn, *args):
+        """Submit to ``executor``, replacing it when its workers have died."""
+        try:
+            future = executor.submit(fn, *args)
+        except Exception as e:
+            future = Future()
+            future.set_exception(e)
+        future.add_done_callback(lambda f: self._replace_if_broken(executor, f))
+        return future
+    
+    def _replace_if_broken(self, executor, future):
+        if not isinstance(future.exception(), BrokenExecutor):
+            return
+        with self._start_lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        with self._stats_lock:
+            self._restarts += 1
+        executor.shutdown(wait=False)
+    
+    def _record(self, started, future):
+        with self._stats_lock:
+            self._in_flight -= 1
+            if future.exception() is not None:
+                self._errors += 1
+            else:
+                self._completed += 1
+                self._latencies.append(time.perf_counter() - started)
+    
+    def _batch_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch):
+        with self._stats_lock:
+            self._batches += 1
+            self._batched_items += len(batch)
+        self._run_batch(batch)
+    
+    def _run_batch(self, batch):
+        pairs = [item[0] for item in batch]
+        result = self._submit(self.start(), ai.ats_scores, pairs)
+        
+        def fan_out(done):
+            error = done.exception()
+            if error is not None and len(batch) > 1 and not isinstance(error, BrokenExecutor):
+                # Score each pair alone so only the caller with the bad
+                # input gets the error
+                for item in batch:
+                    self._run_batch([item])
+                return
+            scores = None if error else done.result()
+            for i, (_, waiter, started) in enumerate(batch):
+                if error:
+                    waiter.set_exception(error)
+                else:
+                    waiter.set_result(scores[i])
+                self._record(started, waiter)
+        
+        result.add_done_callback(fan_out)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 2)
@@ -0,0 +1,189 @@
+# backend/partitions.py
+"""Monthly partition maintenance for the notifications table.
+
+    python partitions.py ensure                  # create upcoming partitions
+    python partitions.py archive --dry-run       # list partitions past retention
+    python partitions.py archive --archive-dir /var/backups/placemate
+
+``ensure`` should run at least monthly (cron) so rows never land in the
+default partition.  If some already have, they are moved into the new
+month's partition before it is attached.
+
+``archive`` detaches every partition older than the retention window and
+commits straight away.  The detach takes ACCESS EXCLUSIVE on
+notifications, so the lock is held only for the detach itself and not for
+the export.  (``DETACH ... CONCURRENTLY`` is not allowed while a default
+partition exists.)  Each detached table is then written to
+``<archive-dir>/<partition>.csv.gz`` and dropped.  A table left detached
+by a failed run is picked up by the next one.
+"""
+import argparse
+import gzip
+import os
+import re
+from datetime import date
+
+NOTIFICATION_RETENTION_MONTHS = int(os.environ.get('NOTIFICATION_RETENTION_MONTHS', 12))
+MONTHS_AHEAD = 3
+DEFAULT_PARTITION = 'notifications_default'
+# Give up on the detach rather than queue behind a long transaction while
+# every other notifications query queues behind us
+DETACH_LOCK_TIMEOUT = os.environ.get('PARTITION_LOCK_TIMEOUT', '5s')
+
+_PARTITION_RE = re.compile(r'^notifications_p(\d{4})_(\d{2})$')
+
+
+def _add_months(day, months):
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def retention_cutoff(today=None):
+    """First day of the oldest month still kept (and still queried)."""
+    today = today or date.today()
+    return _add_months(today.replace(day=1), -(NOTIFICATION_RETENTION_MONTHS - 1))
+
+
+def partition_name(month):
+    return f"notifications_p{month.year:04d}_{month.month:02d}"
+
+
+def list_partitions(cur):
+    """Monthly partitions of notifications as (name, first day of month)."""
+    cur.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = 'notifications'
+    """)
+    partitions = []
+    for (name,) in cur.fetchall():
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def list_detached(cur):
+    """Monthly tables no longer attached to notifications (failed archive runs)."""
+    cur.execute("""
+        SELECT c.relname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind = 'r' AND n.nspname = current_schema()
+          AND c.relname LIKE 'notifications\\_p%'
+          AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid)
+    """)
+    return sorted(name for (name,) in cur.fetchall() if _PARTITION_RE.match(name))
+
+
+def ensure_partitions(conn, months_ahead=MONTHS_AHEAD, today=None):
+    """Create the partitions for this month and the next ``months_ahead``."""
+    today = today or date.today()
+    cur = conn.cursor()
+    existing = {name for name, _ in list_partitions(cur)}
+    created = []
+    
+    for offset in range(months_ahead + 1):
+        month = _add_months(today.replace(day=1), offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        bounds = (month, _add_months(month, 1))
+        # Block new rows for the default partition so none slip in between
+        # the move and the attach
+        cur.execute(f"LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE")
+        cur.execute(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= %s AND created_at < %s)",
+                    bounds)
+        if not cur.fetchone()[0]:
+            cur.execute(f"CREATE TABLE {name} PARTITION OF notifications FOR VALUES FROM (%s) TO (%s)", bounds)
+        else:
+            # Attaching fails while the default partition holds rows for the
+            # new range, so move them across first
+            cur.execute(f"CREATE TABLE {name} (LIKE notifications INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            cur.execute(f"""
+                WITH moved AS (
+                    DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= %s AND created_at < %s
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """, bounds)
+            cur.execute(f"ALTER TABLE notifications ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+                        bounds)
+        created.append(name)
+    
+    conn.commit()
+    cur.close()
+    return created
+
+
+def archive_partitions(conn, archive_dir, dry_run=False, today=None):
+    """Detach, export (gzip CSV) and drop partitions older than retention."""
+    cutoff = retention_cutoff(today)
+    cur = conn.cursor()
+    expired = [name for name, month in list_partitions(cur) if month < cutoff]
+    leftovers = list_detached(cur)
+    
+    if dry_run:
+        cur.close()
+        return leftovers + expired
+    
+    os.makedirs(archive_dir, exist_ok=True)
+    for name in leftovers + expired:
+        if name not in leftovers:
+            try:
+                cur.execute("SET LOCAL lock_timeout = %s", (DETACH_LOCK_TIMEOUT,))
+                cur.execute(f"ALTER TABLE notifications DETACH PARTITION {name}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        
+        # The table is detached now, so exporting it blocks nobody
+        path = os.path.join(archive_dir, f"{name}.csv.gz")
+        try:
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                cur.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", f)
+            cur.execute(f"DROP TABLE {name}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+    
+    cur.close()
+    return leftovers + expired
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain notification partitions')
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    ensure = sub.add_parser('ensure', help='create upcoming monthly partitions')
+    ensure.add_argument('--months-ahead', type=int, default=MONTHS_AHEAD)
+    
+    archive = sub.add_parser('archive', help='archive partitions past retention')
+    archive.add_argument('--archive-dir', default='archive')
+    archive.add_argument('--dry-run', action='store_true')
+    
+    args = parser.parse_args()
+    
+    import psycopg2
+    from db import DB_CONFIG
+    conn = psycopg2.connect(**DB_CONFIG)
+    
+    try:
+        if args.command == 'ensure':
+            for name in ensure_partitions(conn, args.months_ahead):
+                print(f"created   {name}")
+        else:
+            for name in archive_partitions(conn, args.archive_dir, args.dry_run):
+                print(f"{'expired' if args.dry_run else 'archived'}  {name}")
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
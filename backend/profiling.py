@@ -0,0 +1,304 @@
+# backend/profiling.py
+"""On-demand sampling profiler for slow routes.
+
+Admins switch it on at runtime (``PUT /api/admin/profiler``) and pick a
+sample rate, either for every route or per endpoint.  A chosen request is
+registered under its thread id.  While any request is registered, a
+background thread reads ``sys._current_frames()`` every ``interval_ms``
+and counts each registered thread's stack under its endpoint.  Requests
+that were not chosen cost a random draw; with profiling off they cost a
+single attribute check.
+
+Each sample is tagged with the phase the request is in:
+
+* ``db``: waiting for a pooled connection or inside a cursor call (db.py)
+* ``serialize``: JSON encoding in FastJSONProvider
+* ``python``: everything else, the handler's own code
+
+``folded()`` returns the stacks in the folded format read by
+flamegraph.pl, speedscope and similar tools, with the endpoint and phase
+as the two root frames:
+    
+    get_all_companies;[db];wsgi_app (flask/app.py);...;execute (backend/db.py) 42
+
+Phases are also timed exactly around the tagged calls, which gives a
+per-endpoint split that does not depend on the sampling rate.  The exact
+split is the one to trust for serialization: orjson encodes while holding
+the GIL, so the sampler rarely runs during it.
+
+Work a request hands to other threads (the dashboard sections) is only
+attributed to it when the callable is wrapped with ``propagate()`` before
+it is submitted.  That time is reported separately as
+``worker_phase_avg_ms``, since it overlaps the request's own wall time.
+Sections still running when the request ends are not counted.  State is
+kept per process: with several workers, each worker profiles its own
+share of the traffic.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+from flask import request
+
+DEFAULT_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+MAX_STACK_DEPTH = 128
+MAX_STACKS = 50000
+PHASES = ('python', 'db', 'serialize')
+
+# thread id -> _Trace for requests currently being profiled
+_active = {}
+# Guards _Trace.worker_times, which worker threads add to concurrently
+_worker_lock = threading.Lock()
+
+
+class _Trace:
+    __slots__ = ('endpoint', 'phase', 'started', 'phase_times', 'worker_times')
+    
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.phase = 'python'
+        self.started = time.perf_counter()
+        self.phase_times = Counter()
+        self.worker_times = Counter()
+
+
+class _Phase:
+    __slots__ = ('trace', 'name', 'previous', 'started')
+    
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+    
+    def __enter__(self):
+        self.previous = self.trace.phase
+        self.trace.phase = self.name
+        self.started = time.perf_counter()
+    
+    def __exit__(self, *exc):
+        self.trace.phase = self.previous
+        if self.previous != self.name:
+            self.trace.phase_times[self.name] += time.perf_counter() - self.started
+
+
+class _NoPhase:
+    def __enter__(self):
+        pass
+    
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name):
+    """Context manager tagging the current request's samples with ``name``."""
+    trace = _active.get(threading.get_ident())
+    if trace is None:
+        return _NO_PHASE
+    return _Phase(trace, name)
+
+
+def propagate(fn):
+    """``fn`` wrapped so that, run on another thread, its samples and phase
+    times count towards the calling request.  Returns ``fn`` itself when
+    the request is not being profiled."""
+    parent = _active.get(threading.get_ident())
+    if parent is None:
+        return fn
+    
+    def run(*args, **kwargs):
+        ident = threading.get_ident()
+        trace = _active[ident] = _Trace(parent.endpoint)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _active.pop(ident, None)
+            wall = time.perf_counter() - trace.started
+            times = Counter(trace.phase_times)
+            times['python'] += max(wall - times['db'] - times['serialize'], 0.0)
+            with _worker_lock:
+                parent.worker_times.update(times)
+    
+    return run
+
+
+_labels = {}
+
+
+def _label(code):
+    label = _labels.get(code)
+    if label is None:
+        # Parent directory disambiguates flask/app.py from backend/app.py
+        path = code.co_filename.replace(os.sep, '/').rsplit('/', 2)
+        label = f"{code.co_name} ({'/'.join(path[-2:])})"
+        _labels[code] = label
+    return label
+
+
+def _fold(frame):
+    """Root-first frame labels, starting at Flask's ``wsgi_app``."""
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        stack.append(_label(frame.f_code))
+        if frame.f_code.co_name == 'wsgi_app':
+            break
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class Profiler:
+    def __init__(self, interval_ms=DEFAULT_INTERVAL_MS):
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.routes = {}
+        self.interval = interval_ms / 1000
+        self._stacks = Counter()
+        self._requests = Counter()
+        self._wall = Counter()
+        self._phase_times = defaultdict(Counter)
+        self._worker_times = defaultdict(Counter)
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+    
+    @classmethod
+    def from_env(cls):
+        profiler = cls()
+        if os.environ.get('PROFILE_ENABLED') == '1':
+            profiler.configure(enabled=True, sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0.01)))
+        return profiler
+    
+    def configure(self, enabled=None, sample_rate=None, routes=None, interval_ms=None):
+        """Change settings at runtime; ``routes`` maps endpoint -> sample rate."""
+        if sample_rate is not None:
+            self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        if routes is not None:
+            self.routes = {endpoint: min(max(float(rate), 0.0), 1.0) for endpoint, rate in routes.items()}
+        if interval_ms is not None:
+            self.interval = max(float(interval_ms), 1.0) / 1000
+        if enabled is not None:
+            self.enabled = bool(enabled)
+            if self.enabled:
+                self._start()
+            else:
+                self._halt()
+    
+    def _start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                        name='request-profiler', daemon=True)
+        self._thread.start()
+    
+    def _halt(self):
+        if self._stop is not None:
+            self._stop.set()
+        self._thread = None
+        _active.clear()
+    
+    def _run(self, stop):
+        while not stop.wait(self.interval):
+            if not _active:
+                continue
+            frames = sys._current_frames()
+            samples = []
+            for thread_id, trace in list(_active.items()):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    samples.append((trace.endpoint, trace.phase, _fold(frame)))
+            del frames
+            with self._lock:
+                for key in samples:
+                    if key in self._stacks or len(self._stacks) < MAX_STACKS:
+                        self._stacks[key] += 1
+                    else:
+                        self._dropped += 1
+    
+    def begin(self, endpoint):
+        """Request hook: register this thread if the request is sampled."""
+        if not self.enabled or endpoint is None:
+            return
+        rate = self.routes.get(endpoint, self.sample_rate)
+        if rate > 0 and random.random() < rate:
+            _active[threading.get_ident()] = _Trace(endpoint)
+    
+    def end(self, exc=None):
+        """Teardown hook: unregister this thread and record its timings."""
+        trace = _active.pop(threading.get_ident(), None)
+        if trace is None:
+            return
+        wall = time.perf_counter() - trace.started
+        with _worker_lock:
+            worker_times = Counter(trace.worker_times)
+        with self._lock:
+            self._requests[trace.endpoint] += 1
+            self._wall[trace.endpoint] += wall
+            self._phase_times[trace.endpoint].update(trace.phase_times)
+            self._worker_times[trace.endpoint].update(worker_times)
+    
+    def reset(self):
+        with self._lock:
+            self._stacks.clear()
+            self._requests.clear()
+            self._wall.clear()
+            self._phase_times.clear()
+            self._worker_times.clear()
+            self._dropped = 0
+    
+    def summary(self):
+        with self._lock:
+            samples = Counter()
+            for (endpoint, phase_name, _), count in self._stacks.items():
+                samples[endpoint, phase_name] += count
+            endpoints = {}
+            for endpoint, requests in self._requests.items():
+                wall = self._wall[endpoint]
+                timed = self._phase_times[endpoint]
+                phase_ms = {
+                    'db': timed['db'] * 1000,
+                    'serialize': timed['serialize'] * 1000,
+                    'python': max(wall - timed['db'] - timed['serialize'], 0.0) * 1000,
+                }
+                endpoints[endpoint] = {
+                    'requests': requests,
+                    'avg_ms': round(wall * 1000 / requests, 2),
+                    'phase_avg_ms': {name: round(phase_ms[name] / requests, 2) for name in PHASES},
+                    'samples': {name: samples[endpoint, name] for name in PHASES},
+                }
+                worker = self._worker_times.get(endpoint)
+                if worker:
+                    endpoints[endpoint]['worker_phase_avg_ms'] = {
+                        name: round(worker[name] * 1000 / requests, 2) for name in PHASES}
+            return {
+                'enabled': self.enabled,
+                'sample_rate': self.sample_rate,
+                'routes': self.routes,
+                'interval_ms': self.interval * 1000,
+                'distinct_stacks': len(self._stacks),
+                'dropped_samples': self._dropped,
+                'endpoints': endpoints,
+            }
+    
+    def folded(self, endpoint=None):
+        """Collapsed stacks, one ``frame;frame;... count`` line each."""
+        with self._lock:
+            items = sorted(self._stacks.items(), key=lambda item: item[1], reverse=True)
+        lines = []
+        for (stack_endpoint, phase_name, stack), count in items:
+            if endpoint is not None and stack_endpoint != endpoint:
+                continue
+            frames = ';'.join((stack_endpoint, f'[{phase_name}]') + stack)
+            lines.append(f'{frames} {count}')
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def init_app(app, profiler):
+    app.before_request(lambda: profiler.begin(request.endpoint))
+    app.teardown_request(profiler.end)
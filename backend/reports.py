@@ -0,0 +1,360 @@
+# backend/reports.py
+"""Placement trend reports served from precomputed cubes.
+
+``placement_cube`` (migration 007) aggregates every offer by graduation
+year x department x company x package band with ``GROUP BY CUBE``, so any
+slice -- year-over-year totals, department x company, band distribution
+for one year -- is an index lookup on one grouping level instead of a join
+over applications.  ``placement_cohort_cube`` holds cohort sizes by year x
+department for placement rates.
+
+The cubes are materialized views.  They are kept current by a periodic
+refresh, either from a web process (``REPORTS_REFRESH_INTERVAL`` seconds)
+or as a standalone daemon:
+    
+    python reports.py refresh                          # once
+    python reports.py refresh --daemon --interval 900  # keep refreshing
+
+A session advisory lock makes overlapping refreshes from several workers
+or daemons skip rather than queue.
+
+Offer-level exports read the live tables through a server-side cursor and
+are streamed chunk by chunk as CSV or, when ``pyarrow`` is installed,
+Parquet.
+"""
+import argparse
+import csv
+import io
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Public dimension name -> cube column, in the cube's GROUPING() order
+CUBE_DIMENSIONS = {
+    'year': 'graduation_year',
+    'department': 'department',
+    'company': 'company_id',
+    'package_band': 'package_band',
+}
+COHORT_DIMENSIONS = ('year', 'department')
+PACKAGE_BANDS = ('0-5L', '5-10L', '10-20L', '20L+', 'Undisclosed')
+
+EXPORT_CHUNK_ROWS = 5000
+DEFAULT_REFRESH_INTERVAL = 900
+# pg advisory lock key shared by every refresher
+REFRESH_LOCK_KEY = 704001
+
+# Same banding as the placement_cube view
+PACKAGE_BAND_SQL = """CASE
+            WHEN j.salary_min IS NULL THEN 'Undisclosed'
+            WHEN (j.salary_min + COALESCE(j.salary_max, j.salary_min)) / 2 < 500000 THEN '0-5L'
+            WHEN (j.salary_min + COALESCE(j.salary_max, j.salary_min)) / 2 < 1000000 THEN '5-10L'
+            WHEN (j.salary_min + COALESCE(j.salary_max, j.salary_min)) / 2 < 2000000 THEN '10-20L'
+            ELSE '20L+'
+        END"""
+
+EXPORT_COLUMNS = ('graduation_year', 'department', 'roll_number', 'student_name', 'company_name',
+                  'job_title', 'status', 'package', 'package_band', 'applied_at')
+
+
+def grouping_id(grouped, dimensions=tuple(CUBE_DIMENSIONS)):
+    """GROUPING() value for a cube level: bit set = dimension rolled up."""
+    value = 0
+    for dimension in dimensions:
+        value = (value << 1) | (0 if dimension in grouped else 1)
+    return value
+
+
+def refresh_cubes(conn, concurrently=True):
+    """Rebuild both cubes; CONCURRENTLY keeps them readable meanwhile."""
+    mode = 'CONCURRENTLY ' if concurrently else ''
+    cur = conn.cursor()
+    # CONCURRENTLY cannot run inside a transaction block
+    conn.autocommit = True
+    try:
+        cur.execute(f"REFRESH MATERIALIZED VIEW {mode}placement_cube")
+        cur.execute(f"REFRESH MATERIALIZED VIEW {mode}placement_cohort_cube")
+    finally:
+        conn.autocommit = False
+        cur.close()
+
+
+def refresh_if_idle(conn, concurrently=True):
+    """``refresh_cubes`` unless another session is already refreshing.
+    
+    ``conn`` is a dedicated, tuple-cursor connection.  Returns False when the
+    refresh was skipped.
+    """
+    conn.autocommit = True
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (REFRESH_LOCK_KEY,))
+        if not cur.fetchone()[0]:
+            return False
+        try:
+            refresh_cubes(conn, concurrently)
+        finally:
+            conn.autocommit = True
+            cur.execute("SELECT pg_advisory_unlock(%s)", (REFRESH_LOCK_KEY,))
+        return True
+    finally:
+        conn.autocommit = False
+        cur.close()
+
+
+def run_forever(connect, interval=DEFAULT_REFRESH_INTERVAL, stop=None):
+    """Refresh the cubes every ``interval`` seconds until ``stop`` is set."""
+    stop = stop or threading.Event()
+    while not stop.wait(interval):
+        conn = None
+        try:
+            conn = connect()
+            if refresh_if_idle(conn):
+                logger.info('placement cubes refreshed')
+        except Exception:
+            logger.exception('placement cube refresh failed')
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def start_scheduler(connect, interval=DEFAULT_REFRESH_INTERVAL):
+    """Run the refresher on a daemon thread; returns the stop event."""
+    stop = threading.Event()
+    threading.Thread(target=run_forever, args=(connect, interval, stop),
+                     name='placement-cube-refresh', daemon=True).start()
+    return stop
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def _str_list(value):
+    return [v.strip() for v in value.split(',') if v.strip()]
+
+
+def parse_slice(args):
+    """Validate ?group_by=&year=&department=&company=&package_band= args.
+    
+    Returns (group_by, filters); raises ValueError with a client message.
+    Filtered dimensions join the grouping, since averages and distinct
+    student counts cannot be re-summed across rolled-up cells.
+    """
+    group_by = _str_list(args.get('group_by', 'year'))
+    unknown = [d for d in group_by if d not in CUBE_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown dimensions: {', '.join(unknown)}")
+    
+    filters = {}
+    try:
+        if args.get('year'):
+            filters['year'] = _int_list(args['year'])
+        if args.get('company'):
+            filters['company'] = _int_list(args['company'])
+    except ValueError:
+        raise ValueError('year and company must be comma-separated integers')
+    if args.get('department'):
+        filters['department'] = _str_list(args['department'])
+    if args.get('package_band'):
+        filters['package_band'] = _str_list(args['package_band'])
+        bad = [b for b in filters['package_band'] if b not in PACKAGE_BANDS]
+        if bad:
+            raise ValueError(f"Unknown package bands: {', '.join(bad)}")
+    
+    group_by = [d for d in CUBE_DIMENSIONS if d in group_by or d in filters]
+    return group_by, filters
+
+
+def slice_cube(cur, group_by, filters):
+    """Rows of one cube level, optionally filtered, with placement rates
+    when the level is also a cohort level (year and/or department)."""
+    where = ["pc.grouping_id = %s"]
+    params = [grouping_id(group_by)]
+    for dimension, values in filters.items():
+        where.append(f"pc.{CUBE_DIMENSIONS[dimension]} = ANY(%s)")
+        params.append(values)
+    
+    columns = [f"pc.{CUBE_DIMENSIONS[d]}" for d in group_by]
+    if 'company' in group_by:
+        columns.append('c.company_name')
+    columns += ['pc.offers', 'pc.placed_students', 'pc.avg_package',
+                'pc.highest_package', 'pc.lowest_package']
+    
+    cohort_join = ''
+    if set(group_by) <= set(COHORT_DIMENSIONS):
+        columns += ['cc.total_students',
+                    'ROUND(pc.placed_students * 100.0 / NULLIF(cc.total_students, 0), 2) as placement_rate']
+        cohort_join = """LEFT JOIN placement_cohort_cube cc
+            ON cc.grouping_id = %s
+            AND cc.graduation_year IS NOT DISTINCT FROM pc.graduation_year
+            AND cc.department IS NOT DISTINCT FROM pc.department"""
+        params.insert(0, grouping_id(group_by, COHORT_DIMENSIONS))
+    
+    order = ', '.join(f"pc.{CUBE_DIMENSIONS[d]}" for d in group_by) or 'pc.offers DESC'
+    cur.execute(f"""
+        SELECT {', '.join(columns)}
+        FROM placement_cube pc
+        LEFT JOIN companies c ON c.id = pc.company_id
+        {cohort_join}
+        WHERE {' AND '.join(where)}
+        ORDER BY {order}
+    """, params)
+    return cur.fetchall()
+
+
+def export_query(filters):
+    """Offer-level rows for an export, filtered by year / department / company."""
+    where = ["a.status IN ('offered', 'accepted')"]
+    params = []
+    if filters.get('year'):
+        where.append("s.graduation_year = ANY(%s)")
+        params.append(filters['year'])
+    if filters.get('department'):
+        where.append("s.department = ANY(%s)")
+        params.append(filters['department'])
+    if filters.get('company'):
+        where.append("j.company_id = ANY(%s)")
+        params.append(filters['company'])
+    
+    return f"""
+        SELECT
+            s.graduation_year,
+            s.department,
+            s.roll_number,
+            CONCAT_WS(' ', s.first_name, s.last_name) as student_name,
+            c.company_name,
+            j.job_title,
+            a.status,
+            ((j.salary_min + COALESCE(j.salary_max, j.salary_min)) / 2)::float8 as package,
+            {PACKAGE_BAND_SQL} as package_band,
+            a.applied_at
+        FROM applications a
+        JOIN students s ON a.student_id = s.id
+        JOIN jobs j ON a.job_id = j.id
+        JOIN companies c ON j.company_id = c.id
+        WHERE {' AND '.join(where)}
+        ORDER BY s.graduation_year, s.department, c.company_name
+    """, params
+
+
+def stream_csv(cur):
+    """Yield CSV text for a server-side cursor, one chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    while True:
+        rows = cur.fetchmany(EXPORT_CHUNK_ROWS)
+        if not rows:
+            break
+        writer.writerows([row[col] for col in EXPORT_COLUMNS] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last take.
+    
+    ``tell()`` keeps counting across takes; the Parquet writer uses it for
+    the column chunk offsets in the footer.
+    """
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_parquet(cur):
+    """Yield a Parquet file for a server-side cursor, one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([
+        ('graduation_year', pa.int32()),
+        ('department', pa.string()),
+        ('roll_number', pa.string()),
+        ('student_name', pa.string()),
+        ('company_name', pa.string()),
+        ('job_title', pa.string()),
+        ('status', pa.string()),
+        ('package', pa.float64()),
+        ('package_band', pa.string()),
+        ('applied_at', pa.timestamp('us')),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    while True:
+        rows = cur.fetchmany(EXPORT_CHUNK_ROWS)
+        if not rows:
+            break
+        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain placement report cubes')
+    sub = parser.add_subparsers(dest='command', required=True)
+    refresh = sub.add_parser('refresh', help='rebuild the placement cubes')
+    refresh.add_argument('--blocking', action='store_true',
+                         help='plain REFRESH (needed the first time the views are populated)')
+    refresh.add_argument('--daemon', action='store_true', help='keep refreshing every --interval seconds')
+    refresh.add_argument('--interval', type=int, default=DEFAULT_REFRESH_INTERVAL)
+    args = parser.parse_args()
+    
+    import psycopg2
+    from db import DB_CONFIG
+    
+    def connect():
+        return psycopg2.connect(**DB_CONFIG)
+    
+    if args.daemon:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+        try:
+            run_forever(connect, args.interval)
+        except KeyboardInterrupt:
+            pass
+        return
+    
+    conn = connect()
+    try:
+        if refresh_if_idle(conn, concurrently=not args.blocking):
+            print('placement cubes refreshed')
+        else:
+            print('another refresh is running; skipped')
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+# backend/scheduling.py
+"""Interview slot assignment.
+
+Conflicts are checked twice.  In memory, ``auto_assign`` keeps every
+candidate's availability and existing interviews as sorted, merged
+interval lists.  It also keeps the job's free slots in start order, so
+each check is a binary search rather than a scan.  In Postgres, exclusion
+constraints on ``tstzrange`` columns (migration 010) reject overlapping
+slots on one panel and double-booked students.  A concurrent booking
+that slips past the in-memory check is caught there.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+
+class IntervalSet:
+    """Sorted, merged half-open [start, end) intervals."""
+    
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+    
+    def __bool__(self):
+        return bool(self.starts)
+    
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+    
+    def overlaps(self, start, end):
+        # First interval ending after ``start`` overlaps if it begins before ``end``
+        i = bisect_right(self.ends, start)
+        return i < len(self.starts) and self.starts[i] < end
+    
+    def covers(self, start, end):
+        i = bisect_right(self.starts, start) - 1
+        return i >= 0 and self.ends[i] >= end
+
+
+def parse_time(value):
+    """ISO 8601 timestamp; naive values are taken as UTC."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def generate_slots(start, end, duration_minutes, break_minutes=0, panels=('Panel 1',)):
+    """Back-to-back (panel, start, end) slots between ``start`` and ``end``."""
+    duration = timedelta(minutes=duration_minutes)
+    step = duration + timedelta(minutes=break_minutes)
+    slots = []
+    for panel in panels:
+        slot_start = start
+        while slot_start + duration <= end:
+            slots.append((panel, slot_start, slot_start + duration))
+            slot_start += step
+    return slots
+
+
+def auto_assign(slots, candidates):
+    """Give each candidate at most one free slot.
+    
+    ``slots`` are (slot_id, start, end) tuples.  ``candidates`` are dicts
+    with ``application_id``, ``availability`` (an IntervalSet; empty means
+    no constraint) and ``busy`` (IntervalSet of interviews already booked).
+    Returns (assignments, unassigned application ids), where assignments
+    are (application_id, slot_id) pairs.
+    
+    Candidates with the fewest slots inside their availability go first.
+    Each takes the earliest free slot that fits.  Taken slots are skipped
+    through a next-free pointer array, so a candidate never rescans slots
+    already handed out.
+    """
+    slots = sorted(slots, key=lambda s: (s[1], s[2]))
+    starts = [s[1] for s in slots]
+    latest = max((s[2] for s in slots), default=None)
+    next_free = list(range(len(slots) + 1))
+    
+    def find(i):
+        root = i
+        while next_free[root] != root:
+            root = next_free[root]
+        while next_free[i] != root:
+            next_free[i], i = root, next_free[i]
+        return root
+    
+    def windows(candidate):
+        if candidate['availability']:
+            return list(candidate['availability'])
+        return [(starts[0], latest)] if slots else []
+    
+    def capacity(candidate):
+        return sum(bisect_left(starts, end) - bisect_left(starts, start)
+                   for start, end in windows(candidate))
+    
+    assignments, unassigned = [], []
+    for candidate in sorted(candidates, key=capacity):
+        busy = candidate['busy']
+        chosen = None
+        for window_start, window_end in windows(candidate):
+            i = find(bisect_left(starts, window_start))
+            while i < len(slots) and starts[i] < window_end:
+                slot_id, slot_start, slot_end = slots[i]
+                if slot_end <= window_end and not busy.overlaps(slot_start, slot_end):
+                    chosen = i
+                    break
+                i = find(i + 1)
+            if chosen is not None:
+                break
+        
+        if chosen is None:
+            unassigned.append(candidate['application_id'])
+            continue
+        next_free[chosen] = chosen + 1
+        assignments.append((candidate['application_id'], slots[chosen][0]))
+    
+    return assignments, unassigned
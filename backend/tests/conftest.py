@@ -0,0 +1,24 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def pg_conn():
+    """Autocommit connection to the local Postgres from db.py (migrations applied).
+    
+    Tests using it are skipped when no server is reachable.
+    """
+    import psycopg2
+    from db import DB_CONFIG
+    try:
+        conn = psycopg2.connect(**DB_CONFIG, connect_timeout=2)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f'local Postgres not available: {e}')
+    conn.autocommit = True
+    yield conn
+    conn.close()
@@ -0,0 +1,144 @@
+# backend/tests/test_admission.py
+import time
+
+import pytest
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager
+
+import admission
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(admission.time, 'monotonic', clock)
+    return clock
+
+
+def make_client(controller, proxy_hops=0):
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'test-secret'
+    JWTManager(app)
+    admission.init_app(app, controller, proxy_hops=proxy_hops)
+    
+    @app.route('/analyze')
+    def analyze_resume():
+        return jsonify({'ok': True})
+    
+    @app.route('/login')
+    def login():
+        return jsonify({'ok': True})
+    
+    return app.test_client()
+
+
+def test_parse_limits():
+    assert admission.parse_limits('auth=10/60, ai=30/60,,bulk=5') == {
+        'auth': (10, 60.0), 'ai': (30, 60.0), 'bulk': (5, 1.0)}
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    buckets = admission.MemoryBuckets()
+    assert all(buckets.take('ai:1', capacity=3, rate=1.0)[0] for _ in range(3))
+    allowed, retry_after = buckets.take('ai:1', capacity=3, rate=1.0)
+    assert not allowed and retry_after == pytest.approx(1.0)
+    # Other callers have their own bucket
+    assert buckets.take('ai:2', capacity=3, rate=1.0)[0]
+    
+    clock.now += 1.5
+    assert buckets.take('ai:1', capacity=3, rate=1.0)[0]
+    assert not buckets.take('ai:1', capacity=3, rate=1.0)[0]
+
+
+def test_bucket_never_exceeds_capacity(clock):
+    buckets = admission.MemoryBuckets()
+    buckets.take('k', capacity=2, rate=1.0)
+    clock.now += 3600
+    assert [buckets.take('k', capacity=2, rate=1.0)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_shedding_by_priority():
+    controller = admission.AdmissionController(queue_target_ms=100)
+    controller.queue_delay = 0.15
+    assert controller.should_shed('ai')
+    assert not controller.should_shed('default')
+    assert not controller.should_shed('auth')
+    
+    controller.queue_delay = 0.25
+    assert controller.should_shed('default')
+    assert not controller.should_shed('admin')
+
+
+NOW = 1760000000.0
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('t=1759999999.5', 0.5),
+    ('1759999999500', 0.5),       # milliseconds
+    ('1759999999500000', 0.5),    # microseconds
+    ('t=1760000000.5', None),     # in the future
+    ('t=-5', None),
+    ('t=1759999900', None),       # beyond MAX_HEADER_DELAY
+    ('garbage', None),
+])
+def test_header_queue_delay_bounds(header, expected):
+    delay = admission.header_queue_delay(header, now=NOW)
+    assert delay == (pytest.approx(expected) if expected is not None else None)
+
+
+def test_untrusted_header_is_ignored(clock):
+    controller = admission.AdmissionController()
+    received = clock.now - 0.01
+    assert controller.queue_delay_of(received, 't=1', now=1e9) == pytest.approx(0.01)
+
+
+def test_trusted_header_falls_back_when_implausible(clock):
+    controller = admission.AdmissionController(trust_queue_header=True)
+    assert controller.queue_delay_of(clock.now, 't=1759999999.7', now=NOW) == pytest.approx(0.3)
+    assert controller.queue_delay_of(clock.now - 0.02, 't=1', now=NOW) == pytest.approx(0.02)
+    assert controller.metrics()['ignored_queue_headers'] == 1
+
+
+def test_forged_header_does_not_shed():
+    controller = admission.AdmissionController(queue_target_ms=100)
+    client = make_client(controller)
+    for _ in range(5):
+        response = client.get('/analyze', headers={'X-Request-Start': f't={time.time() - 60}'})
+        assert response.status_code == 200
+    assert controller.queue_delay < 0.1
+    assert controller.metrics()['shed'] == {}
+
+
+def test_shed_and_rate_limited_responses():
+    controller = admission.AdmissionController(limits={'ai': (2, 60)}, queue_target_ms=100)
+    client = make_client(controller)
+    assert [client.get('/analyze').status_code for _ in range(3)] == [200, 200, 429]
+    assert int(client.get('/analyze').headers['Retry-After']) >= 1
+    
+    controller.queue_target = 0.0
+    controller.queue_delay = 1.0
+    controller.observe_queue_delay = lambda delay: None
+    response = client.get('/analyze')
+    assert response.status_code == 503 and response.headers['Retry-After'] == '1'
+    assert client.get('/login').status_code == 200
+    assert controller.metrics()['shed'] == {'ai': 1}
+
+
+def test_proxy_hops_key_buckets_by_forwarded_client():
+    controller = admission.AdmissionController(limits={'ai': (1, 60)})
+    client = make_client(controller, proxy_hops=1)
+    
+    def get(ip):
+        return client.get('/analyze', headers={'X-Forwarded-For': ip}).status_code
+    
+    assert get('203.0.113.1') == 200
+    assert get('203.0.113.2') == 200
+    assert get('203.0.113.1') == 429
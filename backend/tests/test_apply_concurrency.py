@@ -0,0 +1,105 @@
+# backend/tests/test_apply_concurrency.py
+"""Thousands of simultaneous applies at one capped job, against local Postgres."""
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import app
+from benchmarks.apply_surge import setup, teardown
+
+STUDENTS = 1200
+CAP = 400
+THREADS = 100
+
+
+@pytest.fixture
+def surge_job(pg_conn):
+    marker = f'surge-test-{uuid.uuid4().hex[:8]}'
+    cur = pg_conn.cursor()
+    recruiter_id, job_id, user_ids = setup(cur, marker, STUDENTS, CAP)
+    yield job_id, user_ids
+    teardown(cur, marker, recruiter_id, job_id, user_ids)
+    cur.close()
+
+
+def test_concurrent_applies_respect_cap_and_idempotency(pg_conn, surge_job):
+    job_id, user_ids = surge_job
+    with app.app_context():
+        tokens = {uid: create_access_token(identity=str(uid)) for uid in user_ids}
+    
+    # Each student applies with a key and retries with the same key; every
+    # other student also sends a duplicate without one
+    calls = []
+    for uid in user_ids:
+        key = uuid.uuid4().hex
+        calls += [(uid, key), (uid, key)]
+        if uid % 2:
+            calls.append((uid, None))
+    
+    def apply(call):
+        uid, key = call
+        headers = {'Authorization': f'Bearer {tokens[uid]}'}
+        if key:
+            headers['Idempotency-Key'] = key
+        with app.test_client() as client:
+            response = client.post('/api/applications/apply', json={'job_id': job_id}, headers=headers)
+        return uid, key, response.status_code, (response.get_json() or {}).get('application_id')
+    
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(apply, calls))
+    
+    statuses = Counter(status for _, _, status, _ in results)
+    assert 500 not in statuses
+    assert statuses[201] == CAP
+    
+    replayed = {}
+    for uid, key, status, application_id in results:
+        if key and application_id is not None:
+            assert replayed.setdefault((uid, key), application_id) == application_id
+    
+    cur = pg_conn.cursor()
+    cur.execute("SELECT COUNT(*), COUNT(DISTINCT student_id) FROM applications WHERE job_id = %s", (job_id,))
+    rows, students = cur.fetchone()
+    cur.execute("SELECT application_count FROM jobs WHERE id = %s", (job_id,))
+    counter = cur.fetchone()[0]
+    cur.close()
+    
+    assert rows == students == counter == CAP
+
+
+def test_cap_set_through_create_job_rejects_extra_applies(pg_conn):
+    marker = f'cap-test-{uuid.uuid4().hex[:8]}'
+    cur = pg_conn.cursor()
+    recruiter_id, surge_job_id, user_ids = setup(cur, marker, 3, None)
+    with app.app_context():
+        recruiter = {'Authorization': f'Bearer {create_access_token(identity=str(recruiter_id))}'}
+        students = [{'Authorization': f'Bearer {create_access_token(identity=str(uid))}'} for uid in user_ids]
+    job = {'job_title': f'{marker} capped', 'job_description': 'cap test posting'}
+    
+    job_id = None
+    try:
+        with app.test_client() as client:
+            for bad in (0, -1, 'ten', True, 2.5):
+                response = client.post('/api/recruiter/jobs', json={**job, 'max_applications': bad},
+                                       headers=recruiter)
+                assert response.status_code == 400
+            
+            response = client.post('/api/recruiter/jobs', json={**job, 'max_applications': 2},
+                                   headers=recruiter)
+            assert response.status_code == 201
+            job_id = response.get_json()['job_id']
+            
+            statuses = [client.post('/api/applications/apply', json={'job_id': job_id}, headers=h).status_code
+                        for h in students]
+        assert statuses == [201, 201, 409]
+        cur.execute("SELECT max_applications, application_count FROM jobs WHERE id = %s", (job_id,))
+        assert cur.fetchone() == (2, 2)
+    finally:
+        if job_id is not None:
+            cur.execute("DELETE FROM applications WHERE job_id = %s", (job_id,))
+            cur.execute("DELETE FROM jobs WHERE id = %s", (job_id,))
+        teardown(cur, marker, recruiter_id, surge_job_id, user_ids)
+        cur.close()
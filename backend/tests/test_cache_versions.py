@@ -0,0 +1,44 @@
+# backend/tests/test_cache_versions.py
+"""The 'jobs' cache version trigger (migration 011), against local Postgres."""
+
+
+def jobs_version(cur):
+    cur.execute("SELECT version FROM cache_versions WHERE name = 'jobs'")
+    return cur.fetchone()[0]
+
+
+def test_version_bumps_only_when_listed_columns_change(pg_conn):
+    cur = pg_conn.cursor()
+    cur.execute("BEGIN")
+    try:
+        cur.execute("""
+            INSERT INTO users (email, password_hash, user_type)
+            VALUES ('cache-version-test@example.com', 'x', 'recruiter') RETURNING id
+        """)
+        cur.execute("INSERT INTO companies (user_id, company_name) VALUES (%s, 'cache-version-test') RETURNING id",
+                    (cur.fetchone()[0],))
+        company_id = cur.fetchone()[0]
+        
+        before = jobs_version(cur)
+        cur.execute("""
+            INSERT INTO jobs (company_id, job_title, job_description, status)
+            VALUES (%s, 'cache version test', 'x', 'active') RETURNING id
+        """, (company_id,))
+        job_id = cur.fetchone()[0]
+        assert jobs_version(cur) == before + 1
+        
+        # No rows, unlisted columns, or values that did not change: no bump
+        cur.execute("UPDATE jobs SET status = 'closed' WHERE id = -1")
+        cur.execute("UPDATE jobs SET application_count = application_count + 1 WHERE id = %s", (job_id,))
+        cur.execute("UPDATE jobs SET status = 'active' WHERE id = %s", (job_id,))
+        cur.execute("DELETE FROM jobs WHERE id = -1")
+        cur.execute("UPDATE companies SET company_name = company_name WHERE id = %s", (company_id,))
+        assert jobs_version(cur) == before + 1
+        
+        cur.execute("UPDATE jobs SET status = 'closed' WHERE id = %s", (job_id,))
+        assert jobs_version(cur) == before + 2
+        cur.execute("UPDATE companies SET company_name = 'cache-version-renamed' WHERE id = %s", (company_id,))
+        assert jobs_version(cur) == before + 3
+    finally:
+        cur.execute("ROLLBACK")
+        cur.close()
@@ -0,0 +1,42 @@
+# backend/tests/test_compression.py
+import gzip
+
+import pytest
+from flask import Flask, jsonify
+
+import compression
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    compression.init_app(app)
+    
+    @app.route('/big')
+    def big():
+        return jsonify({'rows': ['placement'] * 1000})
+    
+    return app.test_client()
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', 'gzip'),
+    ('br;q=0, gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('*, gzip;q=0', 'br' if compression.brotli is not None else None),
+    ('identity', None),
+    ('', None),
+])
+def test_encoding_follows_q_values(client, header, expected):
+    response = client.get('/big', headers={'Accept-Encoding': header})
+    assert response.headers.get('Content-Encoding') == expected
+    if expected == 'gzip':
+        assert gzip.decompress(response.data).startswith(b'{"rows"')
+
+
+def test_small_responses_are_left_alone():
+    app = Flask(__name__)
+    compression.init_app(app)
+    app.add_url_rule('/small', 'small', lambda: jsonify({'ok': True}))
+    response = app.test_client().get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
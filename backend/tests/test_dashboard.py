@@ -0,0 +1,61 @@
+# backend/tests/test_dashboard.py
+import threading
+import time
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def sections(monkeypatch):
+    release = threading.Event()
+    
+    def slow(student_id, user_id):
+        release.wait(5)
+        return 'late'
+    
+    def broken(student_id, user_id):
+        raise RuntimeError('query failed')
+    
+    monkeypatch.setattr(app_module, 'DASHBOARD_SECTIONS', {
+        'fast': lambda student_id, user_id: {'student': student_id},
+        'slow': slow,
+        'broken': broken,
+    })
+    monkeypatch.setattr(app_module, '_dashboard_section',
+                        lambda fn, readonly, student_id, user_id: fn(student_id, user_id))
+    monkeypatch.setattr(app_module, 'DASHBOARD_SECTION_TIMEOUT', 0.1)
+    monkeypatch.setattr(app_module, 'dashboard_slots', threading.BoundedSemaphore(1))
+    yield release
+    release.set()
+
+
+def test_timeout_returns_partial_results(sections):
+    results, errors = app_module._dashboard_sections(7, '1', readonly=True)
+    assert results == {'fast': {'student': 7}}
+    assert errors == {'slow': 'timeout', 'broken': 'unavailable'}
+
+
+def test_slot_is_held_until_abandoned_sections_finish(sections):
+    app_module._dashboard_sections(7, '1', readonly=True)
+    assert not app_module.dashboard_slots.acquire(blocking=False)
+    
+    sections.set()
+    deadline = time.monotonic() + 5
+    while not app_module.dashboard_slots.acquire(blocking=False):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    app_module.dashboard_slots.release()
+
+
+def test_runs_inline_when_every_slot_is_busy(sections, monkeypatch):
+    assert app_module.dashboard_slots.acquire(blocking=False)
+    sections.set()
+    submitted = []
+    monkeypatch.setattr(app_module.dashboard_executor, 'submit', lambda *args: submitted.append(args))
+    
+    results, errors = app_module._dashboard_sections(7, '1', readonly=True)
+    assert submitted == []
+    assert results == {'fast': {'student': 7}, 'slow': 'late'}
+    assert errors == {'broken': 'unavailable'}
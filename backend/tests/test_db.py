@@ -0,0 +1,80 @@
+# backend/tests/test_db.py
+import time
+
+import pytest
+from flask import Flask
+from psycopg2.pool import PoolError
+
+import db
+
+
+@pytest.fixture
+def routed(monkeypatch):
+    """A replica is configured, fresh, and the caller is user '1'."""
+    monkeypatch.setattr(db, 'REPLICA_DB_CONFIG', {**db.DB_CONFIG, 'host': 'replica'})
+    monkeypatch.setattr(db, 'replica_lag', lambda: 0.1)
+    monkeypatch.setattr(db, '_current_user', lambda: '1')
+    monkeypatch.setattr(db, '_last_write', {})
+    app = Flask(__name__)
+    
+    @app.route('/jobs')
+    def search_jobs():
+        return ''
+    
+    @app.route('/apply')
+    def apply_for_job():
+        return ''
+    
+    return app
+
+
+def test_only_replica_routes_use_the_replica(routed):
+    with routed.test_request_context('/jobs'):
+        assert db._use_replica()
+    with routed.test_request_context('/apply'):
+        assert not db._use_replica()
+    assert not db._use_replica()  # no request context
+
+
+def test_read_your_writes_window(routed, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(db.time, 'monotonic', lambda: now[0])
+    with routed.test_request_context('/jobs'):
+        db._mark_write()
+        assert not db._use_replica()
+        now[0] += db.REPLICA_STICKY_SECONDS - 0.5
+        assert not db._use_replica()
+        now[0] += 1
+        assert db._use_replica()
+        assert '1' not in db._last_write
+
+
+@pytest.mark.parametrize('lag, expected', [(0.0, True), (db.REPLICA_MAX_LAG_SECONDS + 1, False), (None, False)])
+def test_lagging_or_unreachable_replica_falls_back(routed, monkeypatch, lag, expected):
+    monkeypatch.setattr(db, 'replica_lag', lambda: lag)
+    with routed.test_request_context('/jobs'):
+        assert db._use_replica() is expected
+
+
+class SlowPool:
+    def getconn(self):
+        time.sleep(0.5)
+        raise PoolError('replica unreachable')
+
+
+def test_lag_probe_never_blocks_the_caller(monkeypatch):
+    monkeypatch.setattr(db, '_replica_state', {'lag': 0.2, 'checked_at': 0.0, 'healthy': True, 'probing': False})
+    monkeypatch.setattr(db, '_get_pool', lambda role: SlowPool())
+    
+    started = time.monotonic()
+    assert db.replica_lag() == 0.2
+    assert db.replica_lag() == 0.2  # probe already running; no second one
+    assert time.monotonic() - started < 0.1
+    
+    deadline = time.monotonic() + 5
+    while db._replica_state['probing']:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert db._replica_state['lag'] is None
+    assert not db._replica_state['healthy']
+    assert db.replica_lag() is None
@@ -0,0 +1,155 @@
+# backend/tests/test_dedupe.py
+import psycopg2.extras
+
+import dedupe
+
+DESCRIPTION = ("We are hiring a backend engineer to build and operate our placement "
+               "platform. You will design REST APIs in Python and Flask, model data in "
+               "PostgreSQL, write tests, review code and mentor two junior developers. "
+               "Experience with caching, queues and observability is a plus.")
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.params = None
+    
+    def execute(self, query, params=None):
+        self.params = params
+    
+    def fetchall(self):
+        return self.rows
+
+
+def test_signature_is_deterministic_and_empty_is_none():
+    a = dedupe.signature('Backend Engineer', DESCRIPTION)
+    b = dedupe.signature('Backend Engineer', DESCRIPTION)
+    assert len(a) == dedupe.NUM_PERM
+    assert (a == b).all()
+    assert dedupe.signature('', '') is None
+    assert dedupe.shingles('Python', 'dev') == {'python dev'}
+
+
+def test_near_duplicate_passes_threshold_and_unrelated_does_not():
+    original = dedupe.signature('Backend Engineer', DESCRIPTION)
+    repost = dedupe.signature('Backend Engineer', DESCRIPTION.replace('two junior', 'three junior'))
+    unrelated = dedupe.signature('Graphic Designer', 'Create brand assets, illustrations and '
+                                 'marketing layouts in Figma for our campus outreach team.')
+    
+    assert dedupe.similarity(original, original) == 1.0
+    assert dedupe.similarity(original, repost) >= dedupe.DUPLICATE_THRESHOLD
+    assert dedupe.similarity(original, unrelated) < 0.2
+
+
+def test_near_duplicates_share_a_band_bucket():
+    original = dedupe.signature('Backend Engineer', DESCRIPTION)
+    repost = dedupe.signature('Backend Engineer', DESCRIPTION.replace('two junior', 'three junior'))
+    
+    keys = dedupe.band_keys(original)
+    assert [band for band, _ in keys] == list(range(dedupe.BANDS))
+    assert keys == dedupe.band_keys(original.copy())
+    assert set(keys) & set(dedupe.band_keys(repost))
+
+
+def test_find_duplicates_reports_roots_best_first():
+    sig = dedupe.signature('Backend Engineer', DESCRIPTION)
+    close = dedupe.signature('Backend Engineer', DESCRIPTION.replace('two junior', 'three junior'))
+    other = dedupe.signature('Graphic Designer', 'Create brand assets in Figma.')
+    # Job 5 reposts root 3, so both rows resolve to 3; 9 is below threshold
+    cur = FakeCursor([
+        {'id': 3, 'signature': close.tobytes()},
+        {'id': 3, 'signature': sig.tobytes()},
+        {'id': 9, 'signature': other.tobytes()},
+    ])
+    
+    assert dedupe.find_duplicates(cur, sig, company_id=1) == [(3, 1.0)]
+    # A posting is never reported as a duplicate of itself via its root
+    assert dedupe.find_duplicates(cur, sig, company_id=1, exclude_id=3) == []
+
+
+class ChunkedConnection:
+    """Serves ``total`` jobs through a named cursor and records the order in
+    which chunks are read and stored."""
+    
+    def __init__(self, total):
+        self.total = total
+        self.events = []
+        self.next_id = 0
+    
+    def cursor(self, name=None, withhold=False):
+        return self
+    
+    def execute(self, query, params=None):
+        pass
+    
+    def fetchmany(self, size):
+        rows = [(i, 'Backend Engineer', f'{DESCRIPTION} {i}')
+                for i in range(self.next_id, min(self.next_id + size, self.total))]
+        self.next_id += len(rows)
+        if rows:
+            self.events.append('read')
+        return rows
+    
+    def commit(self):
+        self.events.append('stored')
+    
+    def close(self):
+        pass
+
+
+def test_backfill_keeps_a_bounded_window(monkeypatch):
+    monkeypatch.setattr(dedupe, 'store_signatures', lambda cur, rows: None)
+    conn = ChunkedConnection(total=50)
+    
+    assert dedupe.backfill(conn, workers=2, chunk_size=5) == 50
+    
+    in_flight = peak = 0
+    for event in conn.events:
+        in_flight += 1 if event == 'read' else -1
+        peak = max(peak, in_flight)
+    assert conn.events.count('stored') == 10
+    assert peak <= 2 * 2
+
+
+def test_signature_bytes_round_trip_without_numpy():
+    sig = dedupe.signature('Backend Engineer', DESCRIPTION)
+    values = dedupe.from_bytes(dedupe.signature_bytes('Backend Engineer', DESCRIPTION))
+    assert list(values) == sig.tolist()
+    assert dedupe.band_keys(values) == dedupe.band_keys(sig)
+    assert dedupe.similarity(values, sig) == 1.0
+    assert dedupe.signature_bytes('', '') is None
+
+
+class FlagConnection:
+    """Answers flag_existing's two queries and records what it writes."""
+    
+    def __init__(self, existing, candidates):
+        self.results = [existing, candidates]
+        self.params = []
+    
+    def cursor(self):
+        return self
+    
+    def execute(self, query, params=None):
+        self.params.append(params)
+    
+    def fetchall(self):
+        return self.results.pop(0)
+    
+    def commit(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+def test_flag_existing_follows_stored_links_and_caps_buckets(monkeypatch):
+    written = []
+    monkeypatch.setattr(psycopg2.extras, 'execute_values', lambda cur, query, rows: written.extend(rows))
+    sig = dedupe.signature_bytes('Backend Engineer', DESCRIPTION)
+    # 5 already duplicates 2; 9 now matches 5, so it must point at root 2
+    conn = FlagConnection(existing=[(5, 2)], candidates=[(9, 5, sig, sig)])
+    
+    assert dedupe.flag_existing(conn) == 1
+    assert written == [(2, 9)]
+    assert conn.params[1] == (dedupe.MAX_BUCKET_SIZE,)
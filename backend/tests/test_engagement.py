@@ -0,0 +1,48 @@
+# backend/tests/test_engagement.py
+import pytest
+
+from engagement import EngagementBuffer
+
+
+def make_buffer(capacity=5, flush_batch=3):
+    buffer = EngagementBuffer(connect=None, capacity=capacity, flush_batch=flush_batch)
+    buffer.start = lambda: None  # no background flusher in tests
+    return buffer
+
+
+def test_failed_flush_drops_oldest_when_full():
+    buffer = make_buffer()
+    for job_id in range(5):
+        buffer.record('view', job_id)
+    
+    def failing_write(batch):
+        # Newer events arrive while the write is failing
+        for job_id in range(5, 8):
+            buffer.record('view', job_id)
+        raise RuntimeError('database down')
+    
+    buffer._write = failing_write
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    
+    assert [event[0] for event in buffer._events] == [3, 4, 5, 6, 7]
+    metrics = buffer.metrics()
+    assert metrics['dropped'] == 3
+    assert metrics['failed_flushes'] == 1
+
+
+def test_flush_writes_in_batches_in_order():
+    buffer = make_buffer(capacity=100, flush_batch=3)
+    for job_id in range(7):
+        buffer.record('apply' if job_id % 2 else 'view', job_id)
+    written = []
+    buffer._write = lambda batch: written.append([event[0] for event in batch])
+    
+    assert buffer.flush() == 7
+    assert written == [[0, 1, 2], [3, 4, 5], [6]]
+    assert buffer.metrics()['dropped'] == 0
+
+
+def test_unknown_event_type_rejected():
+    with pytest.raises(ValueError):
+        make_buffer().record('click', 1)
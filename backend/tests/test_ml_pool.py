@@ -0,0 +1,38 @@
+# backend/tests/test_ml_pool.py
+from concurrent.futures import ThreadPoolExecutor
+
+import ai
+from ml_pool import MLService, MLUnavailable
+
+
+def test_bad_pair_only_fails_its_own_caller():
+    service = MLService(workers=0, batch_window=0.2)
+    pairs = [('python flask developer', 'python developer'),
+             (['not', 'a', 'string'], 'python developer'),
+             ('java spring', 'java backend engineer')]
+    
+    def score(pair):
+        try:
+            return service.score(*pair)
+        except MLUnavailable:
+            return 'error'
+    
+    with ThreadPoolExecutor(max_workers=len(pairs)) as pool:
+        results = list(pool.map(score, pairs))
+    
+    assert results[1] == 'error'
+    assert results[0] == ai.ats_score(*pairs[0])
+    assert results[2] == ai.ats_score(*pairs[2])
+    # The three calls were coalesced, then retried one by one
+    assert service.metrics()['batches'] == 1
+    assert service.metrics()['errors'] == 1
+
+
+def test_pool_workers_are_not_forked_from_the_web_process():
+    service = MLService(workers=1)
+    try:
+        executor = service.start()
+        assert executor._mp_context.get_start_method() in ('forkserver', 'spawn')
+        assert service.match_scores(['python'], ['Python, SQL', 'Java']) == [1, 0]
+    finally:
+        service.shutdown()
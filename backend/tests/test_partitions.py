@@ -0,0 +1,37 @@
+# backend/tests/test_partitions.py
+from datetime import date
+
+import pytest
+
+import partitions
+
+
+@pytest.mark.parametrize('day, months, expected', [
+    (date(2026, 1, 31), 0, date(2026, 1, 1)),
+    (date(2026, 11, 15), 1, date(2026, 12, 1)),
+    (date(2026, 12, 1), 1, date(2027, 1, 1)),
+    (date(2026, 12, 31), 13, date(2028, 1, 1)),
+    (date(2026, 1, 1), -1, date(2025, 12, 1)),
+    (date(2026, 3, 31), -14, date(2025, 1, 1)),
+    (date(2026, 1, 10), -12, date(2025, 1, 1)),
+])
+def test_add_months_crosses_year_boundaries(day, months, expected):
+    assert partitions._add_months(day, months) == expected
+
+
+@pytest.mark.parametrize('today, retention, expected', [
+    (date(2026, 10, 19), 12, date(2025, 11, 1)),
+    (date(2026, 1, 1), 12, date(2025, 2, 1)),
+    (date(2026, 12, 31), 12, date(2026, 1, 1)),
+    (date(2026, 1, 31), 1, date(2026, 1, 1)),
+    (date(2026, 2, 28), 3, date(2025, 12, 1)),
+])
+def test_retention_cutoff_keeps_whole_months(monkeypatch, today, retention, expected):
+    monkeypatch.setattr(partitions, 'NOTIFICATION_RETENTION_MONTHS', retention)
+    assert partitions.retention_cutoff(today) == expected
+
+
+def test_partition_name_round_trips():
+    name = partitions.partition_name(date(2027, 1, 1))
+    assert name == 'notifications_p2027_01'
+    assert partitions._PARTITION_RE.match(name).groups() == ('2027', '01')
@@ -0,0 +1,88 @@
+# backend/tests/test_profiling.py
+import threading
+import time
+
+import pytest
+
+import profiling
+
+
+@pytest.fixture
+def profiler():
+    profiler = profiling.Profiler(interval_ms=1)
+    # Every request sampled, without starting the sampler thread
+    profiler.enabled = True
+    profiler.sample_rate = 1.0
+    yield profiler
+    profiler.configure(enabled=False)
+
+
+def test_phase_is_a_no_op_outside_a_profiled_request():
+    with profiling.phase('db'):
+        pass
+    assert profiling.propagate(len) is len
+
+
+def test_phase_totals(profiler):
+    profiler.begin('get_things')
+    with profiling.phase('db'):
+        time.sleep(0.03)
+        # Nested calls in the same phase are not counted twice
+        with profiling.phase('db'):
+            time.sleep(0.01)
+    with profiling.phase('serialize'):
+        time.sleep(0.02)
+    time.sleep(0.01)
+    profiler.end()
+    
+    stats = profiler.summary()['endpoints']['get_things']
+    assert stats['requests'] == 1
+    phases = stats['phase_avg_ms']
+    assert 38 <= phases['db'] < 60
+    assert 18 <= phases['serialize'] < 35
+    assert 8 <= phases['python'] < 30
+    assert stats['avg_ms'] == pytest.approx(sum(phases.values()), abs=0.1)
+    assert 'worker_phase_avg_ms' not in stats
+
+
+def test_worker_thread_time_counts_towards_the_request(profiler):
+    def section():
+        with profiling.phase('db'):
+            time.sleep(0.03)
+    
+    profiler.begin('get_student_dashboard')
+    wrapped = profiling.propagate(section)
+    workers = [threading.Thread(target=wrapped) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    profiler.end()
+    
+    stats = profiler.summary()['endpoints']['get_student_dashboard']
+    assert 58 <= stats['worker_phase_avg_ms']['db'] < 100
+    # The request thread itself only waited
+    assert stats['phase_avg_ms']['db'] == 0
+
+
+def busy_handler(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampler_records_stacks_by_endpoint_and_phase():
+    profiler = profiling.Profiler(interval_ms=1)
+    profiler.configure(enabled=True, sample_rate=1.0)
+    try:
+        profiler.begin('slow_route')
+        with profiling.phase('db'):
+            busy_handler(0.1)
+        profiler.end()
+    finally:
+        profiler.configure(enabled=False)
+    
+    folded = profiler.folded('slow_route')
+    assert folded.startswith('slow_route;[db];')
+    assert 'busy_handler (tests/test_profiling.py)' in folded
+    assert profiler.summary()['endpoints']['slow_route']['samples']['db'] > 0
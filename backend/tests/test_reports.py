@@ -0,0 +1,83 @@
+# backend/tests/test_reports.py
+import pytest
+
+import reports
+
+
+def test_grouping_id_sets_a_bit_per_rolled_up_dimension():
+    # Dimension order: year, department, company, package_band
+    assert reports.grouping_id(['year', 'department', 'company', 'package_band']) == 0
+    assert reports.grouping_id([]) == 0b1111
+    assert reports.grouping_id(['year']) == 0b0111
+    assert reports.grouping_id(['department', 'company']) == 0b1001
+    assert reports.grouping_id(['year'], reports.COHORT_DIMENSIONS) == 0b01
+
+
+def test_parse_slice_defaults_to_year():
+    assert reports.parse_slice({}) == (['year'], {})
+
+
+def test_parse_slice_filters_join_grouping_in_cube_order():
+    group_by, filters = reports.parse_slice({
+        'group_by': 'company, year',
+        'department': 'CSE,ECE',
+        'package_band': '10-20L',
+    })
+    assert group_by == ['year', 'department', 'company', 'package_band']
+    assert filters == {'department': ['CSE', 'ECE'], 'package_band': ['10-20L']}
+
+
+def test_parse_slice_parses_integer_lists():
+    group_by, filters = reports.parse_slice({'group_by': 'department', 'year': '2024,2025,', 'company': '7'})
+    assert group_by == ['year', 'department', 'company']
+    assert filters == {'year': [2024, 2025], 'company': [7]}
+
+
+@pytest.mark.parametrize('args, message', [
+    ({'group_by': 'year,salary'}, 'Unknown dimensions: salary'),
+    ({'year': '2024,abc'}, 'year and company must be comma-separated integers'),
+    ({'company': '1.5'}, 'year and company must be comma-separated integers'),
+    ({'package_band': '5-10L,100L'}, 'Unknown package bands: 100L'),
+])
+def test_parse_slice_rejects_bad_input(args, message):
+    with pytest.raises(ValueError, match=message):
+        reports.parse_slice(args)
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+    
+    def execute(self, sql, params=None):
+        self.conn.statements.append(sql)
+        self.last = sql
+    
+    def fetchone(self):
+        return (self.conn.lock_free,)
+    
+    def close(self):
+        pass
+
+
+class _FakeConnection:
+    def __init__(self, lock_free):
+        self.lock_free = lock_free
+        self.autocommit = False
+        self.statements = []
+    
+    def cursor(self):
+        return _FakeCursor(self)
+
+
+def test_refresh_if_idle_refreshes_and_unlocks():
+    conn = _FakeConnection(lock_free=True)
+    assert reports.refresh_if_idle(conn) is True
+    assert any('REFRESH MATERIALIZED VIEW CONCURRENTLY placement_cube' in sql for sql in conn.statements)
+    assert 'pg_advisory_unlock' in conn.statements[-1]
+    assert conn.autocommit is False
+
+
+def test_refresh_if_idle_skips_when_another_refresh_holds_the_lock():
+    conn = _FakeConnection(lock_free=False)
+    assert reports.refresh_if_idle(conn) is False
+    assert not any('REFRESH' in sql for sql in conn.statements)
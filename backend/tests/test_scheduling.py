@@ -0,0 +1,99 @@
+# backend/tests/test_scheduling.py
+import random
+from datetime import datetime, timedelta, timezone
+
+from scheduling import IntervalSet, auto_assign, generate_slots, parse_time
+
+DAY = datetime(2026, 3, 2, 9, tzinfo=timezone.utc)
+
+
+def at(hours):
+    return DAY + timedelta(hours=hours)
+
+
+def test_interval_set_merges_touching_and_overlapping():
+    intervals = IntervalSet([(3, 5), (1, 2), (2, 3), (8, 9), (4, 6)])
+    assert list(intervals) == [(1, 6), (8, 9)]
+    assert not IntervalSet()
+
+
+def test_overlaps_is_half_open():
+    intervals = IntervalSet([(1, 3), (5, 7)])
+    assert intervals.overlaps(2, 4)
+    assert intervals.overlaps(0, 10)
+    assert not intervals.overlaps(3, 5)
+    assert not intervals.overlaps(0, 1)
+    assert not intervals.overlaps(7, 9)
+
+
+def test_covers():
+    intervals = IntervalSet([(1, 3), (5, 7)])
+    assert intervals.covers(1, 3)
+    assert intervals.covers(5, 6)
+    assert not intervals.covers(2, 6)
+    assert not intervals.covers(0, 2)
+
+
+def test_parse_time_defaults_to_utc():
+    assert parse_time('2026-03-02T09:00:00') == DAY
+    assert parse_time('2026-03-02T14:30:00+05:30') == DAY
+
+
+def test_generate_slots_per_panel_with_breaks():
+    slots = generate_slots(at(0), at(2) + timedelta(minutes=10), 30, break_minutes=15, panels=('A', 'B'))
+    assert [(p, s.strftime('%H:%M')) for p, s, _ in slots] == [
+        ('A', '09:00'), ('A', '09:45'), ('A', '10:30'),
+        ('B', '09:00'), ('B', '09:45'), ('B', '10:30')]
+    # A slot that would run past the end is not generated
+    assert all(end <= at(2) for _, _, end in slots)
+
+
+def test_auto_assign_serves_most_constrained_first():
+    slots = [(1, at(0), at(1)), (2, at(1), at(2))]
+    candidates = [
+        {'application_id': 10, 'availability': IntervalSet(), 'busy': IntervalSet()},
+        {'application_id': 20, 'availability': IntervalSet([(at(0), at(1))]), 'busy': IntervalSet()},
+    ]
+    assignments, unassigned = auto_assign(slots, candidates)
+    assert sorted(assignments) == [(10, 2), (20, 1)]
+    assert unassigned == []
+
+
+def test_auto_assign_skips_busy_and_reports_unassigned():
+    slots = [(1, at(0), at(1)), (2, at(1), at(2))]
+    candidates = [
+        {'application_id': 10, 'availability': IntervalSet(),
+         'busy': IntervalSet([(at(0) + timedelta(minutes=30), at(1) + timedelta(minutes=30))])},
+        {'application_id': 20, 'availability': IntervalSet([(at(5), at(6))]), 'busy': IntervalSet()},
+    ]
+    assignments, unassigned = auto_assign(slots, candidates)
+    assert assignments == []
+    assert sorted(unassigned) == [10, 20]
+
+
+def test_auto_assign_random_schedules_are_valid():
+    rng = random.Random(7)
+    for _ in range(50):
+        slots = [(i, at(h), at(h) + timedelta(minutes=45))
+                 for i, h in enumerate(sorted(rng.sample(range(12), 8)))]
+        candidates = []
+        for application_id in range(rng.randint(1, 12)):
+            window = rng.randint(0, 10)
+            busy_at = rng.randint(0, 11)
+            candidates.append({
+                'application_id': application_id,
+                'availability': IntervalSet([(at(window), at(window + 3))] if rng.random() < 0.6 else []),
+                'busy': IntervalSet([(at(busy_at), at(busy_at + 1))]),
+            })
+        
+        assignments, unassigned = auto_assign(slots, candidates)
+        by_id = {slot_id: (start, end) for slot_id, start, end in slots}
+        assigned_slots = [slot_id for _, slot_id in assignments]
+        assert len(assigned_slots) == len(set(assigned_slots))
+        assert sorted([a for a, _ in assignments] + unassigned) == list(range(len(candidates)))
+        for application_id, slot_id in assignments:
+            candidate = candidates[application_id]
+            start, end = by_id[slot_id]
+            assert not candidate['busy'].overlaps(start, end)
+            if candidate['availability']:
+                assert candidate['availability'].covers(start, end)
@@ -3,25 +3,56 @@ import React, { useState, useEffect } from "react";
 import { getAllStudents } from "../../utils/api";
 import "./ManageStudents.css";
 
+const PAGE_SIZE = 50;
+
 function ManageStudents() {
   const [students, setStudents] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [page, setPage] = useState(1);
   const [loading, setLoading] = useState(true);
   const [search, setSearch] = useState("");
   const [department, setDepartment] = useState("");
 
+  // Filter changes reset the page in the same update, so each change
+  // triggers exactly one fetch; responses for superseded filters are ignored
   useEffect(() => {
+    let cancelled = false;
+
+    const fetchStudents = async () => {
+      try {
+        const data = await getAllStudents({
+          search,
+          department,
+          page,
+          limit: PAGE_SIZE,
+        });
+        if (!cancelled) {
+          setStudents(data.students || []);
+          setTotal(data.total || 0);
+        }
+      } catch (error) {
+        console.error("Error fetching students:", error);
+      } finally {
+        if (!cancelled) {
+          setLoading(false);
+        }
+      }
+    };
+
     fetchStudents();
-  }, [search, department]);
+    return () => {
+      cancelled = true;
+    };
+  }, [search, department, page]);
+
+  const handleSearchChange = (e) => {
+    setSearch(e.target.value);
+    setPage(1);
+  };
 
-  const fetchStudents = async () => {
-    try {
-      const data = await getAllStudents({ search, department });
-      setStudents(data.students || []);
-    } catch (error) {
-      console.error("Error fetching students:", error);
-    } finally {
-      setLoading(false);
-    }
+  const handleDepartmentChange = (e) => {
+    setDepartment(e.target.value);
+    setPage(1);
   };
 
   if (loading) {
@@ -37,14 +68,14 @@ function ManageStudents() {
           type="text"
           placeholder="Search by name or roll number..."
           value={search}
-          onChange={(e) => setSearch(e.target.value)}
+          onChange={handleSearchChange}
           className="search-input"
         />
         <input
           type="text"
           placeholder="Filter by department..."
           value={department}
-          onChange={(e) => setDepartment(e.target.value)}
+          onChange={handleDepartmentChange}
           className="filter-input"
         />
       </div>
@@ -79,6 +110,24 @@ function ManageStudents() {
               ))}
             </tbody>
           </table>
+          <div className="pagination">
+            <button
+              onClick={() => setPage(page - 1)}
+              disabled={page === 1}
+            >
+              Previous
+            </button>
+            <span>
+              Page {page} of {Math.max(1, Math.ceil(total / PAGE_SIZE))} ({total}{" "}
+              students)
+            </span>
+            <button
+              onClick={() => setPage(page + 1)}
+              disabled={page * PAGE_SIZE >= total}
+            >
+              Next
+            </button>
+          </div>
         </div>
       ) : (
         <div className="empty-state">
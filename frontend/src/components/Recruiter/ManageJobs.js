@@ -79,6 +79,21 @@ function ManageJobs() {
                   <span className="stat-value">{job.application_count || 0}</span>
                   <span className="stat-label">Applications</span>
                 </div>
+                <div className="stat">
+                  <span className="stat-value">{job.views || 0}</span>
+                  <span className="stat-label">Views</span>
+                </div>
+                <div
+                  className="stat"
+                  title="Applications per view since view tracking began"
+                >
+                  <span className="stat-value">
+                    {job.conversion_rate != null
+                      ? `${(job.conversion_rate * 100).toFixed(1)}%`
+                      : "—"}
+                  </span>
+                  <span className="stat-label">Conversion</span>
+                </div>
               </div>
               <div className="job-actions">
                 <span className={`status-badge ${job.status}`}>{job.status}</span>
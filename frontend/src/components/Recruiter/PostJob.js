@@ -23,6 +23,7 @@ function PostJob() {
     benefits: "",
     application_deadline: "",
     vacancies: 1,
+    max_applications: "",
     status: "active",
   });
   const [loading, setLoading] = useState(false);
@@ -43,7 +44,13 @@ function PostJob() {
     setMessage({ type: "", text: "" });
 
     try {
-      await createJob(formData);
+      await createJob({
+        ...formData,
+        max_applications:
+          formData.max_applications === ""
+            ? null
+            : Number(formData.max_applications),
+      });
       setMessage({ type: "success", text: "Job posted successfully!" });
       setTimeout(() => {
         navigate("/recruiter/jobs");
@@ -295,6 +302,18 @@ function PostJob() {
               />
             </div>
 
+            <div className="form-group">
+              <label>Maximum Applications</label>
+              <input
+                type="number"
+                name="max_applications"
+                value={formData.max_applications}
+                onChange={handleChange}
+                min="1"
+                placeholder="No limit"
+              />
+            </div>
+
             <div className="form-group">
               <label>Job Status</label>
               <select
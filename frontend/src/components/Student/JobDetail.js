@@ -24,6 +24,7 @@ function JobDetail() {
     try {
       const data = await getJobDetail(id);
       setJob(data.job);
+      setIsSaved(Boolean(data.job?.is_saved));
     } catch (error) {
       console.error("Error fetching job detail:", error);
     } finally {
@@ -132,12 +133,18 @@ function JobDetail() {
           </div>
 
           <div className="job-actions-bar">
-            <button
-              onClick={() => setShowApplyModal(true)}
-              className="btn btn-primary apply-btn"
-            >
-              Apply Now
-            </button>
+            {job.is_applied ? (
+              <button className="btn btn-primary apply-btn" disabled>
+                Applied ({job.application_status})
+              </button>
+            ) : (
+              <button
+                onClick={() => setShowApplyModal(true)}
+                className="btn btn-primary apply-btn"
+              >
+                Apply Now
+              </button>
+            )}
             <button
               onClick={handleSaveJob}
               className={`btn save-job-btn ${isSaved ? "saved" : ""}`}
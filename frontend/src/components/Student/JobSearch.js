@@ -23,7 +23,11 @@ function JobSearch() {
     setLoading(true);
     try {
       const data = await searchJobs(filters);
-      setJobs(data.jobs || []);
+      const results = data.jobs || [];
+      setJobs(results);
+      setSavedJobIds(
+        new Set(results.filter((job) => job.is_saved).map((job) => job.id))
+      );
     } catch (error) {
       console.error("Error searching jobs:", error);
     } finally {
@@ -153,6 +157,11 @@ function JobSearch() {
                           <span className="meta-item remote">🏠 Remote</span>
                         )}
                         <span className="meta-item">💼 {job.job_type}</span>
+                        {job.is_applied && (
+                          <span className="meta-item applied">
+                            ✅ Applied ({job.application_status})
+                          </span>
+                        )}
                       </div>
                     </div>
                   </div>
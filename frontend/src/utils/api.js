@@ -51,6 +51,7 @@ export const register = async (userData) => {
 
 // Student APIs
 export const getStudentProfile = () => apiCall("/student/profile");
+export const getStudentDashboard = () => apiCall("/student/dashboard");
 export const updateStudentProfile = (data) =>
   apiCall("/student/profile", "PUT", data);
 export const addSkill = (skill) => apiCall("/student/skills", "POST", skill);
@@ -63,6 +64,12 @@ export const applyForJob = (jobId, coverLetter, resumeUrl) =>
     cover_letter: coverLetter,
     resume_url: resumeUrl,
   });
+export const acceptOffer = (applicationId) =>
+  apiCall(`/applications/${applicationId}/accept`, "PUT");
+export const getAvailability = () => apiCall("/student/availability");
+export const updateAvailability = (windows) =>
+  apiCall("/student/availability", "PUT", { windows });
+export const getMyInterviews = () => apiCall("/student/interviews");
 
 // Job APIs
 export const searchJobs = (params) => {
@@ -71,6 +78,8 @@ export const searchJobs = (params) => {
 };
 export const getJobDetail = (jobId) => apiCall(`/jobs/${jobId}`);
 export const getJobRecommendations = () => apiCall("/ai/job-recommendations");
+export const getSemanticRecommendations = (limit = 10) =>
+  apiCall(`/ai/semantic-recommendations?limit=${limit}`);
 export const saveJob = (jobId) => apiCall(`/jobs/${jobId}/save`, "POST");
 export const unsaveJob = (jobId) => apiCall(`/jobs/${jobId}/unsave`, "DELETE");
 export const getSavedJobs = () => apiCall("/jobs/saved");
@@ -96,6 +105,16 @@ export const getJobApplications = (jobId, status = "") =>
   );
 export const updateApplicationStatus = (applicationId, status) =>
   apiCall(`/recruiter/applications/${applicationId}/status`, "PUT", { status });
+export const createInterviewSlots = (jobId, slotData) =>
+  apiCall(`/recruiter/jobs/${jobId}/interview-slots`, "POST", slotData);
+export const getInterviewSlots = (jobId) =>
+  apiCall(`/recruiter/jobs/${jobId}/interview-slots`);
+export const autoAssignInterviews = (jobId, applicationIds) =>
+  apiCall(`/recruiter/jobs/${jobId}/interviews/auto-assign`, "POST", {
+    application_ids: applicationIds,
+  });
+export const cancelInterview = (interviewId) =>
+  apiCall(`/recruiter/interviews/${interviewId}`, "DELETE");
 
 // Admin APIs
 export const getAdminDashboardStats = () => apiCall("/admin/dashboard-stats");
@@ -110,6 +129,16 @@ export const verifyCompany = (companyId, isVerified) =>
   });
 export const getPlacementReport = (year) =>
   apiCall(`/admin/reports/placement?year=${year}`);
+export const getPlacementTrend = (params) => {
+  const queryString = new URLSearchParams(params).toString();
+  return apiCall(`/admin/reports/placement-trend?${queryString}`);
+};
+export const getPlacementCube = (params) => {
+  const queryString = new URLSearchParams(params).toString();
+  return apiCall(`/admin/reports/placement-cube?${queryString}`);
+};
+export const refreshPlacementCubes = () =>
+  apiCall("/admin/reports/refresh", "POST");
 
 // Notification APIs
 export const getNotifications = (limit = 20) =>
@@ -123,14 +152,20 @@ export default {
   login,
   register,
   getStudentProfile,
+  getStudentDashboard,
   updateStudentProfile,
   addSkill,
   deleteSkill,
   searchJobs,
   getJobDetail,
   getJobRecommendations,
+  getSemanticRecommendations,
   applyForJob,
   getMyApplications,
+  acceptOffer,
+  getAvailability,
+  updateAvailability,
+  getMyInterviews,
   saveJob,
   unsaveJob,
   getSavedJobs,
@@ -141,11 +176,18 @@ export default {
   getRecruiterJobs,
   getJobApplications,
   updateApplicationStatus,
+  createInterviewSlots,
+  getInterviewSlots,
+  autoAssignInterviews,
+  cancelInterview,
   getAdminDashboardStats,
   getAllStudents,
   getAllCompanies,
   verifyCompany,
   getPlacementReport,
+  getPlacementTrend,
+  getPlacementCube,
+  refreshPlacementCubes,
   getNotifications,
   markNotificationRead,
   markAllNotificationsRead,